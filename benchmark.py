@@ -0,0 +1,556 @@
+# benchmark.py
+# Performans ölçüm paketi; ekran sunucusu gerekmez (grafikler Agg canvas'ta çizilir).
+# Kapsam: boost / buck / flyback tekil ve toplu hesap, calc_timer_from_inputs ve PSC/ARR
+# aramaları, triangle_wave (scipy ile / olmadan), küçük sinyal cevabı ve kompanzatör
+# tasarımı, uzun iz min/maks piramidi ve yakınlaştırma, tasarım deposu (ekleme / yeniden açma),
+# hesapla + yeniden çiz döngüsü ve soğuk açılış (yeni süreçte import; DISPLAY varsa GUI'nin "interactive" süresi).
+#
+# Her ölçüm timeit gibi kendi döngü sayısını ayarlar (bir tekrar >= MIN_TIME) ve
+# REPEATS tekrar yapar. Sonuçlar sürüm başına JSON olarak yazılır (benchmarks/<sürüm>.json)
+# ve temel sürümle en iyi tekrar (min; gürültü sadece yavaşlatır) üzerinden karşılaştırılır:
+# eşikten fazla yavaşlama regresyon olarak listelenir ve çıkış kodu 1 olur.
+#
+#   python benchmark.py                          # ölç, kaydet, önceki sürümle karşılaştır
+#   python benchmark.py --baseline benchmarks/1.0.0.json --threshold 0.15
+#   python benchmark.py -k "timer.*" --no-save   # sadece timer ölçümleri
+#
+# Eşikler: --threshold (varsayılan DEFAULT_THRESHOLD) ve isteğe bağlı JSON dosyası
+# (varsayılan benchmarks/thresholds.json): {"default": 0.25, "startup.*": 0.5}.
+
+import argparse
+import fnmatch
+import glob
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "benchmarks")
+DEFAULT_THRESHOLD = 0.25   # en iyi tekrar %25'ten fazla yavaşlarsa regresyon
+MIN_TIME = 0.05            # s; bir tekrarın en kısa süresi (döngü sayısı buna göre seçilir)
+REPEATS = 7
+PROCESSES = 3              # her ölçüm bu kadar ayrı süreçte tekrarlanır
+STARTUP_REPEATS = 5
+BATCH_N = 100_000
+F_CLK = 72e6
+
+# GUI varsayılanları (SI)
+BOOST = dict(Vin=28.0, Vout=82.0, freq=8e3, L=33e-6, C=470e-6, Iout=10.0, ripI_pct=0.2, ripV_pct=0.01)
+BUCK = dict(Vin=12.0, Vout=5.0, freq=50e3, L=100e-6, C=100e-6, Iout=10.0, ripI_val=0.1, ripV_val=0.1)
+FLYBACK = dict(Vin=28.0, Vout=82.0, freq=50e3, Lm=100e-6, nsnp=1.0, Iout=10.0, ripI_pct=0.3,
+               ripV_pct=0.05, C=470e-6)
+NOMINAL = {"boost": BOOST, "buck": BUCK, "flyback": FLYBACK}
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """setup() -> parametresiz fonksiyon; ölçülen o fonksiyonun bir çağrısıdır.
+
+    items: çağrı başına işlenen öğe (ör. toplu hesapta nokta sayısı); öğe/s raporlanır.
+    repeats / autorange=False: pahalı ölçümler (açılış) için tek çağrılık tekrarlar.
+    """
+    name: str
+    setup: object
+    items: int = 1
+    repeats: int = REPEATS
+    autorange: bool = True
+
+
+# ---------- Ölçümler ----------
+def _scalar(topology):
+    def setup():
+        from calc_cache import CALC_FUNCS
+        func, kw = CALC_FUNCS[topology], NOMINAL[topology]
+        return lambda: func(**kw)
+    return setup
+
+
+def _batch(topology):
+    def setup():
+        from calc_core import BATCH_FUNCS
+        rng = np.random.default_rng(0)
+        kw = dict(NOMINAL[topology])
+        for k in ("Vin", "Iout", "L", "Lm"):
+            if k in kw:
+                kw[k] = kw[k] * rng.uniform(0.8, 1.2, BATCH_N)
+        func = BATCH_FUNCS[topology]
+        return lambda: func(**kw)
+    return setup
+
+
+def _timer_inputs(psc_fix, arr_fix):
+    def setup():
+        from timer_solver import calc_timer_from_inputs, timer_table
+        timer_table(F_CLK)  # tablo kurulumu ayrı ölçülür
+        freqs = itertools.cycle(np.linspace(5e3, 200e3, 997).tolist())  # önbelleğe takılmasın
+        return lambda: calc_timer_from_inputs(F_CLK, next(freqs), psc_fix, arr_fix, "3", "999")
+    return setup
+
+
+def _solve_batch():
+    from timer_solver import solve_batch, timer_table
+    timer_table(F_CLK)
+    f = np.random.default_rng(0).uniform(1e3, 500e3, 10_000)
+    return lambda: solve_batch(F_CLK, f)
+
+
+def _table_build():
+    from timer_solver import TimerTable
+    return lambda: TimerTable(F_CLK)
+
+
+def _scan():
+    from timer_solver import scan_options
+    return lambda: scan_options(F_CLK, 123_457.0)
+
+
+def _triangle(use_scipy):
+    def setup():
+        from calc_core import _scipy_signal, triangle_wave
+        if use_scipy and _scipy_signal() is None:
+            return None  # scipy yok: atlanır
+        t = np.linspace(0.0, 4e-3, BATCH_N)
+        return lambda: triangle_wave(1e3, t, use_scipy)
+    return setup
+
+
+def _plant_grid():
+    from smallsignal import freq_grid, plant_response
+    kw = dict(BUCK, Vin=np.linspace(8.0, 16.0, 25)[:, None], Iout=np.linspace(0.05, 15.0, 40)[None, :])
+    f = freq_grid(BUCK["freq"])
+    return lambda: plant_response("buck", kw, f, 0.01, 0.03)
+
+
+def _design(topology, kind):
+    def setup():
+        from smallsignal import design
+        return lambda: design(topology, NOMINAL[topology], kind, DCR=0.01, ESR=0.03)
+    return setup
+
+
+def _pm_map():
+    from smallsignal import design, pm_map
+    comp = design("buck", BUCK, "III", DCR=0.01, ESR=0.03).best_comp
+    Vin, Iout = np.linspace(8.0, 16.0, 30), np.linspace(0.5, 15.0, 30)
+    return lambda: pm_map("buck", BUCK, comp, Vin, Iout, 0.01, 0.03)
+
+
+WAVE_N = 2_000_000
+
+
+def _trace():
+    t = np.linspace(0.0, 0.5, WAVE_N)
+    return t, 10.0 + np.sin(2 * np.pi * 50e3 * t) + 0.1 * np.sin(2 * np.pi * 60 * t)
+
+
+def _pyramid_build():
+    from waveview import MinMaxPyramid
+    t, y = _trace()
+    return lambda: MinMaxPyramid(t, y)
+
+
+def _envelope():
+    from waveview import MinMaxPyramid
+    pyr = MinMaxPyramid(*_trace())
+    state = {"i": 0}
+
+    def query():
+        # kayan 10 ms pencere, 800 piksel
+        state["i"] += 1
+        t0 = 0.4 * (state["i"] % 100) / 100
+        return pyr.envelope(t0, t0 + 0.01, 800)
+    return query
+
+
+def _zoom_redraw():
+    """Agg canvas'ta PyramidPlot: görünür aralık değişir, zarf alınır ve tam çizim yapılır."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from plotting import PyramidPlot
+    from waveview import MinMaxPyramid
+    fig = Figure(figsize=(8, 6), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    plot = PyramidPlot(fig, canvas, MinMaxPyramid(*_trace()), [("IL", "A", [(0, "IL", "tab:red")])])
+    state = {"i": 0}
+
+    def zoom():
+        state["i"] += 1
+        t0 = 0.4 * (state["i"] % 100) / 100
+        plot.view(t0, t0 + 0.01 * (1 + state["i"] % 3))
+    zoom()
+    return zoom
+
+
+STORE_N = 10_000
+
+
+def _store_rows(n):
+    from calc_core import boost_batch
+    Vin = np.linspace(20.0, 30.0, n)
+    kw = dict(BOOST, Vin=Vin)
+    res = boost_batch(**kw)
+    cols = {k: np.broadcast_to(v, (n,)) for k, v in kw.items()}
+    cols.update({name: getattr(res, name) for name in ("D", "delta_IL", "delta_Vout", "IL_avg", "Ipk")},
+                valid=res.valid, mode=res.mode())
+    return cols
+
+
+def _store_append():
+    from design_store import DesignStore
+    store = DesignStore(tempfile.mkdtemp(prefix="bench_store_"))
+    cols = _store_rows(1000)
+    return lambda: store.add_columns(cols, "boost")
+
+
+def _store_reload():
+    """Kayıtlı STORE_N tasarımlı depoyu yeniden aç, filtrele ve son 2000 satırı tabloya al."""
+    from design_store import DesignStore
+    path = tempfile.mkdtemp(prefix="bench_store_")
+    DesignStore(path).add_columns(_store_rows(STORE_N), "boost")
+
+    def reload():
+        store = DesignStore(path, create=False)
+        idx = store.select("boost", {"D": (0.6, 0.7)})
+        return store.table(idx[::-1][:2000])
+    return reload
+
+
+def _replot(full):
+    """Agg canvas'ta GUI döngüsü: girişten hesap, dalga formu ve WaveformPlot.update."""
+    def setup():
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from calc_core import boost_calc, ideal_waveforms
+        from plotting import WaveformPlot
+        fig = Figure(figsize=(8, 6), dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        plot = WaveformPlot(fig, canvas, "IL", "Vout", "tab:red")
+        state = {"i": 0}
+
+        def cycle():
+            # slider sürükleme: Iout küçük adımlarla değişir (blit yolu); full ise her seferinde
+            # eksen başlığı değişir ve tam çizim yapılır
+            state["i"] += 1
+            r = boost_calc(**dict(BOOST, Iout=9.0 + 0.01 * (state["i"] % 100)), f_clk=F_CLK)
+            t, il, v = ideal_waveforms(r)
+            title = f"IL #{state['i']}" if full else "IL"
+            plot.update(t * 1e6, [il], v, title, "Vout", "Zaman (µs)")
+        cycle()
+        return cycle
+    return setup
+
+
+def _startup(code):
+    def setup():
+        cmd = [sys.executable, "-c", code]
+        env = dict(os.environ, MPLBACKEND="Agg", PYTHONDONTWRITEBYTECODE="1")
+        return lambda: subprocess.run(cmd, cwd=HERE, env=env, check=True,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return setup
+
+
+_BACKEND_IMPORT = ("import calc_cache, plotting, montecarlo, losses, matplotlib.figure, "
+                   "matplotlib.backends.backend_agg, calc_core; calc_core._scipy_signal(); "
+                   "from timer_solver import timer_table; timer_table(72e6)")
+
+
+def _gui_startup():
+    """DISPLAY varsa hesap_defteri'ni aç, ilk etkileşime hazır olunca kapat; süre = interactive."""
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        return None
+    log = os.path.join(tempfile.mkdtemp(prefix="hesap_bench_"), "startup.jsonl")
+    env = dict(os.environ, HESAP_STARTUP_LOG=log, HESAP_EXIT_AFTER_STARTUP="1",
+               HESAP_UPDATE_URL="http://127.0.0.1:9/")  # güncelleme kontrolü ağa çıkmasın
+
+    def run():
+        subprocess.run([sys.executable, os.path.join(HERE, "hesap_defteri.py")], cwd=HERE, env=env,
+                       check=True, timeout=120, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(log, encoding="utf-8") as f:
+            return json.loads(f.readlines()[-1])["interactive"]
+    return run
+
+
+BENCHMARKS = [
+    Benchmark("calc.boost", _scalar("boost")),
+    Benchmark("calc.buck", _scalar("buck")),
+    Benchmark("calc.flyback", _scalar("flyback")),
+    Benchmark("batch.boost", _batch("boost"), BATCH_N),
+    Benchmark("batch.buck", _batch("buck"), BATCH_N),
+    Benchmark("batch.flyback", _batch("flyback"), BATCH_N),
+    Benchmark("timer.from_inputs_best", _timer_inputs(False, False)),
+    Benchmark("timer.from_inputs_psc", _timer_inputs(True, False)),
+    Benchmark("timer.from_inputs_arr", _timer_inputs(False, True)),
+    Benchmark("timer.solve_batch", _solve_batch, 10_000),
+    Benchmark("timer.table_build", _table_build, repeats=5),
+    Benchmark("timer.scan_options", _scan),
+    Benchmark("wave.triangle_scipy", _triangle(True), BATCH_N),
+    Benchmark("wave.triangle_numpy", _triangle(False), BATCH_N),
+    Benchmark("bode.plant_grid", _plant_grid, 1000),
+    Benchmark("bode.design_buck", _design("buck", "III")),
+    Benchmark("bode.design_flyback", _design("flyback", "III")),
+    Benchmark("bode.pm_map", _pm_map, 900),
+    Benchmark("wave.pyramid_build", _pyramid_build, WAVE_N, repeats=3),
+    Benchmark("wave.envelope", _envelope),
+    Benchmark("wave.zoom_redraw", _zoom_redraw),
+    Benchmark("store.append", _store_append, 1000),
+    Benchmark("store.reload", _store_reload, STORE_N),
+    Benchmark("plot.calc_replot_blit", _replot(False)),
+    Benchmark("plot.calc_replot_full", _replot(True)),
+    Benchmark("startup.python", _startup("pass"), repeats=STARTUP_REPEATS, autorange=False),
+    Benchmark("startup.calc_core", _startup("import calc_core"), repeats=STARTUP_REPEATS,
+              autorange=False),
+    Benchmark("startup.backend", _startup(_BACKEND_IMPORT), repeats=STARTUP_REPEATS, autorange=False),
+    Benchmark("startup.gui_interactive", _gui_startup, repeats=STARTUP_REPEATS, autorange=False),
+]
+
+
+# ---------- Ölçüm ----------
+def _autorange(fn):
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= MIN_TIME:
+            return loops
+        loops *= 2 if dt * 10 >= MIN_TIME else 10
+
+
+def _summarize(times, loops, items):
+    med = statistics.median(times)
+    res = {"median": med, "min": min(times), "mean": statistics.fmean(times),
+           "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+           "loops": loops, "repeats": len(times), "unit": "s", "times": times}
+    if items > 1:
+        res["items"] = items
+        res["items_per_s"] = items / med
+    return res
+
+
+def measure(bench):
+    """Bu süreçte tek ölçüm: {"median", "min", "mean", "stdev", "loops", "repeats", "times",
+    ...} (s / çağrı) veya setup None döndürürse {"skipped": True}."""
+    fn = bench.setup()
+    if fn is None:
+        return {"skipped": True}
+    times, reported = [], []
+    loops = _autorange(fn) if bench.autorange else 1
+    for _ in range(bench.repeats):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            out = fn()
+        times.append((time.perf_counter() - t0) / loops)
+        if not bench.autorange and isinstance(out, float):
+            reported.append(out)  # süreç kendi süresini bildirdi (GUI açılışı)
+    return _summarize(reported or times, loops, bench.items)
+
+
+def measure_isolated(bench, processes=PROCESSES):
+    """Ölçümü processes ayrı süreçte tekrarla ve tekrarları birleştir.
+
+    Aynı makinede süreçten sürece (bellek yerleşimi, frekans) µs'lik çağrılar %30-40
+    oynayabilir; tek süreçlik min bu farkı görmez. Açılış ölçümleri zaten yeni süreç
+    başlattığından bu süreçte çalışır.
+    """
+    if processes <= 1 or not bench.autorange:
+        return measure(bench)
+    runs = []
+    for _ in range(processes):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--measure", bench.name],
+                             cwd=HERE, check=True, capture_output=True, text=True)
+        runs.append(json.loads(out.stdout))
+    if any(r.get("skipped") for r in runs):
+        return {"skipped": True}
+    return _summarize([t for r in runs for t in r["times"]], max(r["loops"] for r in runs),
+                      bench.items)
+
+
+def machine_info():
+    info = {"python": platform.python_version(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpu_count": os.cpu_count(), "numpy": np.__version__}
+    for mod in ("scipy", "matplotlib"):
+        try:
+            info[mod] = __import__(mod).__version__
+        except ImportError:
+            info[mod] = None
+    return info
+
+
+def run_benchmarks(pattern="*", progress=None, processes=PROCESSES):
+    """Eşleşen ölçümleri çalıştır; {ad: sonuç}."""
+    results = {}
+    for bench in BENCHMARKS:
+        if not fnmatch.fnmatch(bench.name, pattern):
+            continue
+        results[bench.name] = measure_isolated(bench, processes)
+        if progress:
+            progress(bench.name, results[bench.name])
+    return results
+
+
+# ---------- Kayıt ve karşılaştırma ----------
+def current_version():
+    try:
+        with open(os.path.join(HERE, "version.txt"), encoding="utf-8") as f:
+            return f.read().strip() or "dev"
+    except OSError:
+        return "dev"
+
+
+def _version_key(v):
+    return tuple(int(p) if p.isdigit() else 0 for p in v.replace("-", ".").split("."))
+
+
+def result_path(version, directory=RESULTS_DIR):
+    return os.path.join(directory, f"{version}.json")
+
+
+def save_results(version, results, directory=RESULTS_DIR):
+    os.makedirs(directory, exist_ok=True)
+    doc = {"version": version, "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+           "machine": machine_info(), "results": results}
+    path = result_path(version, directory)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+    return path
+
+
+def find_baseline(version, directory=RESULTS_DIR):
+    """Dizindeki en yeni, version'dan eski sonuç dosyası (yoksa None)."""
+    older = []
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        v = os.path.splitext(os.path.basename(path))[0]
+        if v != "thresholds" and _version_key(v) < _version_key(version):
+            older.append((_version_key(v), path))
+    return max(older)[1] if older else None
+
+
+def load_thresholds(path=None, default=None):
+    """{desen: bağıl eşik}; default verilirse dosyadaki "default"u ezer."""
+    th = {"default": DEFAULT_THRESHOLD}
+    path = path or os.path.join(RESULTS_DIR, "thresholds.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            th.update(json.load(f))
+    if default is not None:
+        th["default"] = default
+    return th
+
+
+def threshold_for(name, thresholds):
+    # en uzun (en özgül) eşleşen desen kazanır
+    hits = [p for p in thresholds if p != "default" and fnmatch.fnmatch(name, p)]
+    return thresholds[max(hits, key=len)] if hits else thresholds["default"]
+
+
+def compare(results, baseline, thresholds):
+    """[(ad, temel süre, yeni süre, oran, eşik, durum)]; süre = en iyi tekrar (min),
+    durum: ok / regression / faster / new / skipped."""
+    rows = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        th = threshold_for(name, thresholds)
+        if r.get("skipped"):
+            rows.append((name, None, None, None, th, "skipped"))
+        elif b is None or b.get("skipped"):
+            rows.append((name, None, r["min"], None, th, "new"))
+        else:
+            ratio = r["min"] / b["min"]
+            status = ("regression" if ratio > 1.0 + th
+                      else "faster" if ratio < 1.0 / (1.0 + th) else "ok")
+            rows.append((name, b["min"], r["min"], ratio, th, status))
+    return rows
+
+
+def _fmt_time(s):
+    if s is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if s >= scale:
+            return f"{s / scale:.3g} {unit}"
+    return f"{s / 1e-9:.3g} ns"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Hesap defteri performans ölçümleri")
+    ap.add_argument("-k", "--filter", default="*", help="ölçüm adı deseni (ör. 'batch.*')")
+    ap.add_argument("--version", dest="version_tag", default=None,
+                    help="sonuç dosyası sürümü (varsayılan: version.txt)")
+    ap.add_argument("--baseline", help="karşılaştırılacak sonuç JSON'u (varsayılan: önceki sürüm)")
+    ap.add_argument("--threshold", type=float, default=None,
+                    help=f"izin verilen bağıl yavaşlama (varsayılan {DEFAULT_THRESHOLD} = %%25)")
+    ap.add_argument("--thresholds", help="desen başına eşik JSON'u")
+    ap.add_argument("--dir", default=RESULTS_DIR, help="sonuç dizini")
+    ap.add_argument("--no-save", action="store_true", help="sonucu dosyaya yazma")
+    ap.add_argument("--processes", type=int, default=PROCESSES,
+                    help="ölçüm başına süreç sayısı (1 = hepsi bu süreçte, hızlı ama gürültülü)")
+    ap.add_argument("--list", action="store_true", help="ölçüm adlarını listele")
+    ap.add_argument("--measure", help=argparse.SUPPRESS)  # alt süreç: tek ölçüm, JSON stdout
+    args = ap.parse_args(argv)
+
+    if args.measure:
+        bench = {b.name: b for b in BENCHMARKS}[args.measure]
+        print(json.dumps(measure(bench)))
+        return 0
+
+    if args.list:
+        print("\n".join(b.name for b in BENCHMARKS))
+        return 0
+    version = args.version_tag or current_version()
+
+    def progress(name, r):
+        if r.get("skipped"):
+            print(f"{name:28s} atlandı", file=sys.stderr)
+        else:
+            rate = f"  ({r['items_per_s']:,.0f} öğe/s)" if "items_per_s" in r else ""
+            print(f"{name:28s} {_fmt_time(r['median']):>10s}  ±{_fmt_time(r['stdev'])}{rate}",
+                  file=sys.stderr)
+
+    results = run_benchmarks(args.filter, progress, args.processes)
+    if not results:
+        print(f"Eşleşen ölçüm yok: {args.filter}", file=sys.stderr)
+        return 2
+    if not args.no_save:
+        print(f"Kaydedildi: {save_results(version, results, args.dir)}", file=sys.stderr)
+
+    base_path = args.baseline or find_baseline(version, args.dir)
+    if base_path is None:
+        print("Temel sonuç yok; karşılaştırma atlandı.", file=sys.stderr)
+        return 0
+    try:
+        with open(base_path, encoding="utf-8") as f:
+            base = json.load(f)
+        thresholds = load_thresholds(args.thresholds or os.path.join(args.dir, "thresholds.json"),
+                                     args.threshold)
+    except (OSError, ValueError) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 2
+    rows = compare(results, base.get("results", {}), thresholds)
+    print(f"\nKarşılaştırma: {base.get('version', base_path)} -> {version}")
+    for name, b, r, ratio, th, status in rows:
+        ratio_s = f"x{ratio:.2f}" if ratio is not None else "-"
+        mark = {"regression": "REGRESYON", "faster": "daha hızlı", "new": "yeni",
+                "skipped": "atlandı"}.get(status, "")
+        print(f"{name:28s} {_fmt_time(b):>10s} -> {_fmt_time(r):>10s}  {ratio_s:>6s}  "
+              f"(eşik +{th:.0%})  {mark}")
+    bad = [row for row in rows if row[5] == "regression"]
+    if bad:
+        print(f"\n{len(bad)} ölçümde eşik aşıldı: " + ", ".join(row[0] for row in bad), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
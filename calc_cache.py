@@ -0,0 +1,163 @@
+# calc_cache.py
+# Hesap katmanı için sınırlı LRU önbellek.
+# Anahtarlar topoloji + normalize edilmiş giriş demetleridir (8.0*1e3 ile 8000.0
+# aynı anahtarı üretir). Skaler sonuçlar, dalga formu dizileri, simülasyonlar ve
+# toplu (batch) sorgular aynı önbellekte tutulur; giriş sayısı ve bellek (bayt)
+# sınırına göre en eski kullanılan kayıt atılır.
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from calc_core import boost_calc, buck_calc, flyback_calc, ideal_waveforms, BATCH_FUNCS
+from switching_sim import simulate
+
+CALC_FUNCS = {"boost": boost_calc, "buck": buck_calc, "flyback": flyback_calc}
+
+
+def _norm(v):
+    """Float'ları 12 anlamlı basamağa yuvarla; diğer tipleri olduğu gibi bırak."""
+    if isinstance(v, (bool, type(None), str)):
+        return v
+    if isinstance(v, (int, float, np.floating, np.integer)):
+        return float(f"{float(v):.12g}")
+    if isinstance(v, (tuple, list)):
+        return tuple(_norm(x) for x in v)
+    return v
+
+
+def make_key(kind, topology, inputs):
+    return (kind, topology) + tuple(sorted((k, _norm(v)) for k, v in inputs.items()))
+
+
+def _array_key(a):
+    a = np.ascontiguousarray(a)
+    return (a.dtype.str, a.shape, hashlib.blake2b(a.tobytes(), digest_size=16).hexdigest())
+
+
+def _nbytes(value):
+    """Kaydın yaklaşık bellek boyutu (bayt)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value) + 64
+    if hasattr(value, "__dict__"):
+        return sum(_nbytes(v) for v in vars(value).values()) + 64
+    return 32
+
+
+def _freeze(value):
+    """Önbellekteki dizilerin yanlışlıkla değiştirilmesini engelle."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for v in value:
+            _freeze(v)
+    elif hasattr(value, "__dict__"):
+        for v in vars(value).values():
+            if isinstance(v, np.ndarray):
+                v.flags.writeable = False
+    return value
+
+
+class LRUCache:
+    """Giriş sayısı ve bayt sınırlı LRU önbellek; thread-safe."""
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes=None):
+        nbytes = _nbytes(value) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._data.pop(key)[1]
+            if nbytes > self.max_bytes:
+                return value  # tek başına sınırı aşıyor; saklama
+            self._data[key] = (value, nbytes)
+            self.nbytes += nbytes
+            while len(self._data) > self.max_entries or self.nbytes > self.max_bytes:
+                _, (_, nb) = self._data.popitem(last=False)
+                self.nbytes -= nb
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, fn):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, _freeze(fn()))
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"entries": len(self._data), "bytes": self.nbytes,
+                "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0}
+
+
+_MISSING = object()
+CACHE = LRUCache()
+
+
+# ---------- Önbellekli hesap girişleri ----------
+def cached_calc(topology, cache=CACHE, **inputs):
+    """boost_calc / buck_calc / flyback_calc sonucunu önbellekten ver."""
+    return cache.get_or_compute(make_key("calc", topology, inputs),
+                                lambda: CALC_FUNCS[topology](**inputs))
+
+
+def cached_waveforms(topology, result, periods=4, n=800, cache=CACHE, **inputs):
+    """ideal_waveforms(result) dizilerini (salt-okunur) önbellekten ver.
+
+    inputs, sonucu üreten girişlerdir (anahtar için); verilmezse sonucun kendisi kullanılır.
+    """
+    key_inputs = inputs or {k: v for k, v in vars(result).items() if k != "timer"}
+    key = make_key("wave", topology, dict(key_inputs, _periods=periods, _n=n))
+    return cache.get_or_compute(key, lambda: ideal_waveforms(result, periods, n))
+
+
+def cached_simulate(topology, cache=CACHE, **kwargs):
+    """switching_sim.simulate sonucunu önbellekten ver."""
+    return cache.get_or_compute(make_key("sim", topology, kwargs),
+                                lambda: simulate(topology, **kwargs))
+
+
+def cached_batch(topology, cache=CACHE, **inputs):
+    """*_batch sonucunu önbellekten ver; dizi girişleri içerik özetiyle anahtarlanır."""
+    norm = {k: _array_key(v) if isinstance(v, np.ndarray) else v for k, v in inputs.items()}
+    return cache.get_or_compute(make_key("batch", topology, norm),
+                                lambda: BATCH_FUNCS[topology](**inputs))
+
+
+def cache_stats(cache=CACHE):
+    return cache.stats()
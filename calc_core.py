@@ -0,0 +1,348 @@
+# calc_core.py
+# Boost / Buck / Flyback hesap çekirdeği (GUI'siz).
+# Not: Bu modül tkinter / matplotlib import etmez; script, test veya worker
+# süreçlerinden pencere açmadan çağrılabilir. Tüm birimler SI (V, A, Hz, H, F).
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# PSC/ARR hesabı timer_solver'da (GUI girişleri için calc_timer_from_inputs oradan alınır)
+from timer_solver import TimerResult, calc_timer
+
+# scipy.signal import'u pahalı; sadece triangle_wave ilk kez çağrılınca yüklenir
+_signal = None
+
+
+def _scipy_signal():
+    global _signal
+    if _signal is None:
+        try:
+            from scipy import signal as _sig
+            _signal = _sig
+        except Exception:
+            _signal = False
+    return _signal or None
+
+
+def triangle_wave(freq, t, use_scipy=True):
+    """Return triangle wave in range [-1,1] for frequency freq (Hz) at times t (seconds)."""
+    signal = _scipy_signal() if use_scipy else None
+    if signal is not None:
+        return signal.sawtooth(2 * np.pi * freq * t, 0.5)
+    # fallback
+    period = 1.0 / freq
+    phase = (t % period) / period  # 0..1
+    tri = np.where(phase < 0.5, 4 * phase - 1, 3 - 4 * phase)
+    return tri
+
+
+# ---------- Sonuç tipleri ----------
+@dataclass(frozen=True)
+class BoostResult:
+    Vin: float
+    Vout: float
+    freq: float
+    L: float
+    C: float
+    Iout: float
+    D: float
+    delta_IL: float
+    delta_Vout: float
+    IL_avg: float
+    IL_min: float
+    Ipk: float
+    mode: str
+    L_min: float
+    C_min: float
+    timer: Optional[TimerResult] = None
+    eff: float = 1.0
+
+
+@dataclass(frozen=True)
+class BuckResult:
+    Vin: float
+    Vout: float
+    freq: float
+    L: float
+    C: float
+    Iout: float
+    D: float
+    delta_IL: float
+    delta_Vout: float
+    IL_avg: float
+    IL_min: float
+    Ipk: float
+    mode: str
+    L_min: float
+    C_min: float
+    timer: Optional[TimerResult] = None
+    eff: float = 1.0
+
+
+@dataclass(frozen=True)
+class FlybackResult:
+    Vin: float
+    Vout: float
+    freq: float
+    Lm: float
+    nsnp: float
+    Iout: float
+    D: float
+    nsnp_req: float
+    Ipk: float
+    delta_I_m: float
+    IL_avg: float  # ortalama primer akım
+    IL_min: float
+    mode: str
+    L_min: float
+    C_min: float
+    eff: float
+    delta_Vout: float = float('nan')  # C verilmezse hesaplanmaz
+    C: Optional[float] = None
+    timer: Optional[TimerResult] = None
+
+    @property
+    def delta_IL(self):
+        return self.delta_I_m
+
+
+# ---------- Dönüştürücü hesapları ----------
+def boost_calc(Vin, Vout, freq, L, C, Iout, ripI_pct, ripV_pct, eff=1.0, f_clk=None, psc=None, arr=None):
+    """Boost hesapları. ripI_pct / ripV_pct oran olarak (0.2 = %20) verilir.
+
+    eff: verim (losses.efficiency); kayıplar duty'yi ve giriş akımını büyütür (1.0 = ideal).
+    """
+    if Vout <= Vin:
+        raise ValueError("Boost için Vout > Vin olmalı.")
+    D = 1.0 - eff * Vin / Vout
+    if D <= 0:
+        raise ValueError("Hesaplanan duty negatif veya sıfır; parametreleri kontrol edin.")
+
+    delta_IL = (Vin * D) / (L * freq)
+    # daha gerçekçi ΔV ~ ΔIL/(8 f C) varsayımı kullanıldı (yaklaşık)
+    delta_Vout = delta_IL / (8.0 * freq * C) if C > 0 else float('inf')
+    IL_avg = Iout / (1.0 - D) if (1.0 - D) != 0 else float('inf')
+    IL_min = IL_avg - delta_IL / 2.0
+    mode = "CCM" if IL_min > 0 else "DCM"
+
+    # önerilen min L,C (toleranslara göre)
+    delta_IL_max = ripI_pct * Iout
+    delta_V_max = ripV_pct * Vout
+    L_min = (Vin * D) / (delta_IL_max * freq) if delta_IL_max > 0 else float('inf')
+    C_min = delta_IL_max / (8.0 * freq * delta_V_max) if delta_V_max > 0 else float('inf')
+
+    timer = calc_timer(f_clk, freq, psc, arr) if f_clk is not None else None
+    return BoostResult(Vin, Vout, freq, L, C, Iout, D, delta_IL, delta_Vout, IL_avg, IL_min,
+                       IL_avg + delta_IL / 2.0, mode, L_min, C_min, timer, eff)
+
+
+def buck_calc(Vin, Vout, freq, L, C, Iout, ripI_val, ripV_val, eff=1.0, f_clk=None, psc=None, arr=None):
+    """Buck hesapları. ripI_val (A) / ripV_val (V) mutlak toleranslardır.
+
+    eff: verim; duty = Vout / (eff * Vin) (1.0 = ideal).
+    """
+    if Vout >= Vin:
+        raise ValueError("Buck için Vout < Vin olmalı.")
+    D = Vout / (eff * Vin)
+    if D <= 0:
+        raise ValueError("Hesaplanan duty negatif veya sıfır; parametreleri kontrol edin.")
+    if D >= 1:
+        raise ValueError("Kayıplarla gereken duty >= 1; Vin çok düşük veya verim çok kötü.")
+
+    delta_IL = (Vin - Vout) * D / (L * freq)
+    delta_Vout = delta_IL / (8.0 * freq * C) if C > 0 else float('inf')
+    IL_avg = Iout
+    IL_min = IL_avg - delta_IL / 2.0
+    mode = "CCM" if IL_min > 0 else "DCM"
+
+    delta_IL_max = ripI_val
+    delta_V_max = ripV_val
+    L_min = (Vin - Vout) * D / (delta_IL_max * freq) if delta_IL_max > 0 else float('inf')
+    C_min = delta_IL_max / (8.0 * freq * delta_V_max) if delta_V_max > 0 else float('inf')
+
+    timer = calc_timer(f_clk, freq, psc, arr) if f_clk is not None else None
+    return BuckResult(Vin, Vout, freq, L, C, Iout, D, delta_IL, delta_Vout, IL_avg, IL_min,
+                      IL_avg + delta_IL / 2.0, mode, L_min, C_min, timer, eff)
+
+
+def flyback_calc(Vin, Vout, freq, Lm, nsnp, Iout, ripI_pct, ripV_pct, C=None, eff=0.9,
+                 f_clk=None, psc=None, arr=None):
+    """Flyback hesapları. ripI_pct / ripV_pct oran olarak verilir.
+
+    eff: verim (losses.efficiency); duty, Ipk ve giriş akımı Pin = Pout / eff ile hesaplanır.
+    """
+    if nsnp == 0:
+        raise ValueError("Ns/Np sıfır olamaz.")
+    denom = Vout + (eff * Vin * (1.0 / nsnp))
+    if denom == 0:
+        raise ValueError("Geçersiz Ns/Np veya gerilim değerleri.")
+
+    D = Vout / denom
+    D = max(1e-6, min(0.999999, D))
+    Pout = Vout * Iout
+    Fs = freq
+    if Lm <= 0:
+        Ipk = float('inf')
+        delta_I_m = float('inf')
+    else:
+        # basit approx
+        Ipk = math.sqrt(max(0.0, 2.0 * Pout / (eff * Lm * Fs)))
+        delta_I_m = (Vin * D) / (Lm * Fs)
+
+    Iin = Pout / (Vin * eff) if Vin > 0 else 0.0
+    Iavg = Iin
+    IL_min = Iavg - delta_I_m / 2.0
+    mode = "CCM" if IL_min > 0 else "DCM"
+    nsnp_req = (Vout * (1.0 - D)) / (Vin * D) if D != 0 else float('inf')
+
+    # önerilen min Lm (primer ΔI, ortalama primer akımın yüzdesi) ve C (sekonder ΔV)
+    delta_I_max = ripI_pct * Iavg
+    delta_V_max = ripV_pct * Vout
+    L_min = (Vin * D) / (delta_I_max * Fs) if delta_I_max > 0 else float('inf')
+    C_min = Iout * D / (Fs * delta_V_max) if delta_V_max > 0 else float('inf')
+    if C is None:
+        delta_Vout = float('nan')
+    else:
+        delta_Vout = Iout * D / (Fs * C) if C > 0 else float('inf')
+
+    timer = calc_timer(f_clk, freq, psc, arr) if f_clk is not None else None
+    return FlybackResult(Vin, Vout, freq, Lm, nsnp, Iout, D, nsnp_req, Ipk, delta_I_m, Iavg,
+                         IL_min, mode, L_min, C_min, eff, delta_Vout, C, timer)
+
+
+def spec_limits(topology, nominal):
+    """Tolerans girişlerinden (ΔI_max, ΔV_max); L_min / C_min hesabındaki tanımlarla aynı."""
+    Vout, Iout = nominal["Vout"], nominal["Iout"]
+    if topology == "boost":
+        return nominal["ripI_pct"] * Iout, nominal["ripV_pct"] * Vout
+    if topology == "buck":
+        return nominal["ripI_val"], nominal["ripV_val"]
+    if topology == "flyback":
+        IL_avg = Vout * Iout / (nominal["Vin"] * nominal.get("eff", 0.9))
+        return nominal["ripI_pct"] * IL_avg, nominal["ripV_pct"] * Vout
+    raise ValueError(f"Bilinmeyen topoloji: {topology}")
+
+
+def ideal_waveforms(res, periods=4, n=800):
+    """Sonuç için (t, akım, gerilim) dalga formlarını döndür (4 periyot, ideal üçgen)."""
+    t = np.linspace(0, periods / res.freq, n)  # seconds
+    tri = triangle_wave(res.freq, t)
+    IL_wave = res.IL_avg + (res.delta_IL / 2.0) * tri
+    if isinstance(res, FlybackResult):
+        V_wave = res.Vout * np.ones_like(t)
+    else:
+        V_wave = res.Vout + (res.delta_Vout / 2.0) * tri
+    return t, IL_wave, V_wave
+
+
+# ---------- Toplu (vektörel) hesaplar ----------
+# Tüm girişler NumPy yayınlama (broadcast) kurallarına uyan dizi veya skaler olabilir.
+# Geçersiz noktalar hata fırlatmaz; valid maskesinde False, sayısal alanlarda NaN döner.
+BATCH_FIELDS = ("D", "delta_IL", "delta_Vout", "IL_avg", "IL_min", "Ipk", "L_min", "C_min")
+
+
+@dataclass
+class BatchResult:
+    D: np.ndarray
+    delta_IL: np.ndarray
+    delta_Vout: np.ndarray
+    IL_avg: np.ndarray
+    IL_min: np.ndarray
+    Ipk: np.ndarray
+    L_min: np.ndarray
+    C_min: np.ndarray
+    ccm: np.ndarray    # bool, True = CCM
+    valid: np.ndarray  # bool, False = geçersiz giriş (ör. boost'ta Vout <= Vin)
+    nsnp_req: Optional[np.ndarray] = None  # sadece flyback
+
+    @property
+    def shape(self):
+        return self.valid.shape
+
+    def mode(self):
+        """CCM/DCM etiket dizisi (geçersiz noktalar '')."""
+        return np.where(self.valid, np.where(self.ccm, "CCM", "DCM"), "")
+
+
+def _div(a, b):
+    """b == 0 iken inf (a > 0) döndüren bölme; uyarı basmaz."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return a / b
+
+
+def _finish(valid, **arrays):
+    for k, v in arrays.items():
+        if v is not None and v.dtype.kind == "f":
+            arrays[k] = np.where(valid, v, np.nan)
+    ccm = valid & (arrays["IL_min"] > 0)
+    return BatchResult(ccm=ccm, valid=valid, **arrays)
+
+
+def boost_batch(Vin, Vout, freq, L, C, Iout, ripI_pct, ripV_pct, eff=1.0):
+    """boost_calc'ın vektörel karşılığı."""
+    Vin, Vout, freq, L, C, Iout, ripI_pct, ripV_pct, eff = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (Vin, Vout, freq, L, C, Iout, ripI_pct, ripV_pct, eff)))
+    valid = Vout > Vin
+    D = 1.0 - _div(eff * Vin, Vout)
+    valid &= D > 0
+    VinD = Vin * D
+    delta_IL = _div(VinD, L * freq)
+    delta_Vout = np.where(C > 0, _div(delta_IL, 8.0 * freq * C), np.inf)
+    IL_avg = _div(Iout, 1.0 - D)
+    half = delta_IL / 2.0
+    delta_IL_max = ripI_pct * Iout
+    delta_V_max = ripV_pct * Vout
+    L_min = np.where(delta_IL_max > 0, _div(VinD, delta_IL_max * freq), np.inf)
+    C_min = np.where(delta_V_max > 0, _div(delta_IL_max, 8.0 * freq * delta_V_max), np.inf)
+    return _finish(valid, D=D, delta_IL=delta_IL, delta_Vout=delta_Vout, IL_avg=IL_avg,
+                   IL_min=IL_avg - half, Ipk=IL_avg + half, L_min=L_min, C_min=C_min)
+
+
+def buck_batch(Vin, Vout, freq, L, C, Iout, ripI_val, ripV_val, eff=1.0):
+    """buck_calc'ın vektörel karşılığı."""
+    Vin, Vout, freq, L, C, Iout, ripI_val, ripV_val, eff = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (Vin, Vout, freq, L, C, Iout, ripI_val, ripV_val, eff)))
+    valid = Vout < Vin
+    D = _div(Vout, eff * Vin)
+    valid &= (D > 0) & (D < 1)
+    vd = (Vin - Vout) * D
+    delta_IL = _div(vd, L * freq)
+    delta_Vout = np.where(C > 0, _div(delta_IL, 8.0 * freq * C), np.inf)
+    half = delta_IL / 2.0
+    L_min = np.where(ripI_val > 0, _div(vd, ripI_val * freq), np.inf)
+    C_min = np.where(ripV_val > 0, _div(ripI_val, 8.0 * freq * ripV_val), np.inf)
+    IL_avg = Iout.copy()
+    return _finish(valid, D=D, delta_IL=delta_IL, delta_Vout=delta_Vout, IL_avg=IL_avg,
+                   IL_min=IL_avg - half, Ipk=IL_avg + half, L_min=L_min, C_min=C_min)
+
+
+def flyback_batch(Vin, Vout, freq, Lm, nsnp, Iout, ripI_pct, ripV_pct, C=np.nan, eff=0.9):
+    """flyback_calc'ın vektörel karşılığı. C = NaN ise delta_Vout NaN döner."""
+    Vin, Vout, freq, Lm, nsnp, Iout, ripI_pct, ripV_pct, C, eff = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (Vin, Vout, freq, Lm, nsnp, Iout, ripI_pct, ripV_pct, C, eff)))
+    valid = nsnp != 0
+    denom = Vout + _div(eff * Vin, nsnp)
+    valid &= denom != 0
+    D = np.clip(_div(Vout, denom), 1e-6, 0.999999)
+    Pout = Vout * Iout
+    pos = Lm > 0
+    Ipk = np.where(pos, np.sqrt(np.maximum(0.0, _div(2.0 * Pout, eff * Lm * freq))), np.inf)
+    VinD = Vin * D
+    delta_I_m = np.where(pos, _div(VinD, Lm * freq), np.inf)
+    IL_avg = np.where(Vin > 0, _div(Pout, Vin * eff), 0.0)
+    nsnp_req = _div(Vout * (1.0 - D), VinD)
+    delta_I_max = ripI_pct * IL_avg
+    delta_V_max = ripV_pct * Vout
+    L_min = np.where(delta_I_max > 0, _div(VinD, delta_I_max * freq), np.inf)
+    IoD = Iout * D
+    C_min = np.where(delta_V_max > 0, _div(IoD, freq * delta_V_max), np.inf)
+    delta_Vout = np.where(C > 0, _div(IoD, freq * C), np.where(np.isnan(C), np.nan, np.inf))
+    return _finish(valid, D=D, delta_IL=delta_I_m, delta_Vout=delta_Vout, IL_avg=IL_avg,
+                   IL_min=IL_avg - delta_I_m / 2.0, Ipk=Ipk, L_min=L_min, C_min=C_min,
+                   nsnp_req=nsnp_req)
+
+
+BATCH_FUNCS = {"boost": boost_batch, "buck": buck_batch, "flyback": flyback_batch}
@@ -0,0 +1,242 @@
+# catalog.py
+# Endüktör / kondansatör katalog araması (L_min / C_min sonuçlarına göre parça seçimi).
+# CSV bir kez okunur, sütun başına NumPy dizisi olarak tutulur (kolonsal depo) ve
+# yanına .npz önbelleği yazılır; CSV değişmedikçe sonraki açılışlar bu dosyadan yüklenir.
+# Her sayısal sütun için sıralı indeks (argsort + sıralı değerler) kurulur; aralık
+# koşulları searchsorted ile çözülür, en seçici koşulun aday kümesi diğer koşullarla
+# süzülür, sonuç argpartition ile ilk N'e indirilir (on binlerce satırda ~ms).
+#
+# CSV başlıkları "ad_birim" biçimindedir; birim SI'ya çevrilir (L_uH -> L [H]):
+#   endüktör:    part, L_uH, Isat_A, Irms_A, DCR_mOhm, volume_mm3 (veya len_mm, W_mm, H_mm), price
+#   kondansatör: part, C_uF, V_V, ESR_mOhm, Irms_A, volume_mm3 (veya D_mm, H_mm), price
+# Sayısal olmayan sütunlar (part, mfr, paket...) metin olarak saklanır.
+
+import csv
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from calc_core import spec_limits
+
+UNITS = {"H": 1.0, "mH": 1e-3, "uH": 1e-6, "µH": 1e-6, "nH": 1e-9,
+         "F": 1.0, "mF": 1e-3, "uF": 1e-6, "µF": 1e-6, "nF": 1e-9,
+         "Ohm": 1.0, "mOhm": 1e-3, "A": 1.0, "mA": 1e-3, "V": 1.0,
+         "mm": 1.0, "mm3": 1.0}
+DEFAULT_TOP_N = 5
+V_DERATING = 1.25   # kondansatör gerilim değeri >= 1.25 * Vout
+
+
+def _column_name(header):
+    """'L_uH' -> ('L', 1e-6); birimsiz başlık ölçeklenmez."""
+    header = header.strip()
+    name, _, unit = header.rpartition("_")
+    if name and unit in UNITS:
+        return name, UNITS[unit]
+    return header, None
+
+
+class Catalog:
+    """Kolonsal parça kataloğu: {sütun: dizi}. Sayısal sütunlar float64, diğerleri str."""
+
+    def __init__(self, columns, source=None):
+        self.columns = columns
+        self.source = source
+        self.size = len(next(iter(columns.values()))) if columns else 0
+        self._index = {}
+        self._add_volume()
+
+    # --- yükleme ---
+    @classmethod
+    def from_csv(cls, path, use_cache=True):
+        """CSV'yi yükle; geçerli .npz önbelleği varsa onu kullan, yoksa oluştur."""
+        cache = os.path.splitext(path)[0] + ".npz"
+        st = os.stat(path)
+        stamp = np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+        if use_cache and os.path.exists(cache):
+            try:
+                with np.load(cache, allow_pickle=False) as z:
+                    if np.array_equal(z["__stamp__"], stamp):
+                        return cls({k: z[k] for k in z.files if k != "__stamp__"}, path)
+            except (OSError, ValueError, KeyError):
+                pass
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f, delimiter=_sniff_delimiter(f))
+            headers = next(reader)
+            raw = list(zip(*reader)) or [()] * len(headers)
+        columns = {}
+        for h, values in zip(headers, raw):
+            name, scale = _column_name(h)
+            try:
+                arr = np.array([float(v) if v.strip() else math.nan for v in values], dtype=float)
+                columns[name] = arr * scale if scale else arr
+            except ValueError:
+                columns[name] = np.array([v.strip() for v in values], dtype=str)
+        if use_cache:
+            try:
+                np.savez(cache, __stamp__=stamp, **columns)
+            except OSError:
+                pass  # salt-okunur dizin: önbelleksiz devam
+        return cls(columns, path)
+
+    def _add_volume(self):
+        c = self.columns
+        if "volume" in c or not self.size:
+            return
+        if all(k in c for k in ("D", "H")):
+            c["volume"] = math.pi / 4.0 * c["D"] ** 2 * c["H"]
+        elif all(k in c for k in ("len", "W", "H")):
+            c["volume"] = c["len"] * c["W"] * c["H"]
+
+    # --- indeks / sorgu ---
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def index(self, name):
+        """(sıra, sıralı değerler); NaN'lar sona düşer ve aralık sorgularına girmez."""
+        if name not in self._index:
+            v = self.columns[name]
+            order = np.argsort(v, kind="stable")
+            self._index[name] = (order, v[order])
+        return self._index[name]
+
+    def build_indexes(self):
+        for name, v in self.columns.items():
+            if v.dtype.kind == "f":
+                self.index(name)
+        return self
+
+    def _range(self, name, lo, hi):
+        order, sv = self.index(name)
+        a = 0 if lo is None else int(np.searchsorted(sv, lo, "left"))
+        b = int(np.searchsorted(sv, np.inf, "right")) if hi is None else int(np.searchsorted(sv, hi, "right"))
+        return order[a:max(a, b)]
+
+    def query(self, where=None, order_by=None, limit=None, descending=False, filter=None):
+        """Satır indeksleri.
+
+        where: {sütun: (alt, üst)} kapalı aralıklar (None = sınırsız).
+        filter: filter(idx) -> bool maskesi; aday satırlarda hesaplanan ek koşul.
+        order_by sütununda NaN olan satırlar sona düşer.
+        """
+        where = dict(where or {})
+        if where:
+            # en dar aralığın aday kümesinden başla, diğer koşulları vektörel uygula
+            ranges = sorted((self._range(k, lo, hi) for k, (lo, hi) in where.items()), key=len)
+            idx = ranges[0]
+            for k, (lo, hi) in where.items():
+                v = self.columns[k][idx]
+                keep = np.isfinite(v)
+                if lo is not None:
+                    keep &= v >= lo
+                if hi is not None:
+                    keep &= v <= hi
+                idx = idx[keep]
+        else:
+            idx = np.arange(self.size)
+        if filter is not None and len(idx):
+            idx = idx[filter(idx)]
+        if order_by is None or not len(idx):
+            return idx[:limit] if limit else idx
+        key = self.columns[order_by][idx]
+        key = np.where(np.isnan(key), np.inf, -key if descending else key)
+        if limit and len(idx) > limit:
+            # sınırdaki eşitleri de al ki sonuç satır sırasından bağımsız olsun
+            kth = np.partition(key, limit - 1)[limit - 1]
+            sel = key <= kth
+            idx, key = idx[sel], key[sel]
+        order = np.lexsort((idx, key))  # eşitlikte satır sırası
+        return idx[order[:limit]] if limit else idx[order]
+
+    def rows(self, idx):
+        return [{k: (v[i].item() if v.dtype.kind == "f" else str(v[i])) for k, v in self.columns.items()}
+                for i in idx]
+
+
+def _sniff_delimiter(f):
+    head = f.readline()
+    f.seek(0)
+    return ";" if head.count(";") > head.count(",") else ","
+
+
+# ---------- Sonuçlara göre parça eşleme ----------
+@dataclass(frozen=True)
+class PartHit:
+    part: str
+    values: dict      # katalog satırı (SI birimleri)
+    peak: float       # endüktör: bu L ile tepe akım (A); kondansatör: kondansatör akım basamağı
+    delta_Vout: float = math.nan   # kondansatör: ESR dahil ΔVout (V)
+
+
+def inductor_peak(topology, res, L):
+    """Parçanın kendi L değeriyle tepe akım (calc_core'daki Ipk tanımları)."""
+    L = np.asarray(L, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if topology == "boost":
+            return res.IL_avg + res.Vin * res.D / (2.0 * L * res.freq)
+        if topology == "buck":
+            return res.IL_avg + (res.Vin - res.Vout) * res.D / (2.0 * L * res.freq)
+        # Ipk ∝ 1/√Lm (Pout / eff enerji aktarımı): sonucun Ipk'sinden ölçekle, tanım kaymasın
+        return res.Ipk * np.sqrt(res.Lm / L)
+
+
+def cap_ripple_current(topology, res):
+    """(kondansatör RMS akımı, ESR'ye uygulanan tepe-tepe akım basamağı)."""
+    D = res.D
+    if topology == "buck":
+        return res.delta_IL / (2.0 * math.sqrt(3.0)), res.delta_IL
+    rms = res.Iout * math.sqrt(D / (1.0 - D))
+    if topology == "boost":
+        return rms, res.Ipk
+    # sekonder tepe akımı = primer tepe * Np/Ns; oran nsnp kuralından bağımsız olarak
+    # D'den ve yük dengesinden: primer Iin/D iletimde, sekonder Iout/(1 − D) kesimde akar
+    ratio = res.Iout * D / ((1.0 - D) * res.IL_avg)
+    return rms, res.Ipk * ratio
+
+
+def cap_delta_v(topology, res, C, esr):
+    """ESR dahil ΔVout: kapasitif bileşen (calc_core formülleri) + ESR * akım basamağı."""
+    C = np.asarray(C, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if topology == "flyback":
+            dv_c = res.Iout * res.D / (res.freq * C)
+        else:
+            dv_c = res.delta_IL / (8.0 * res.freq * C)
+    _, step = cap_ripple_current(topology, res)
+    return dv_c + np.nan_to_num(esr, nan=0.0) * step
+
+
+def match_inductors(cat, topology, res, top_n=DEFAULT_TOP_N, order_by="volume"):
+    """L >= L_min ve Isat >= Ipk(L) (ve Irms >= IL_avg) olan parçalar, order_by artan."""
+    L_min = res.L_min if math.isfinite(res.L_min) else None
+    where = {"L": (L_min, None)}
+    if "Irms" in cat.columns:
+        where["Irms"] = (res.IL_avg, None)
+    L, Isat = cat["L"], cat.columns.get("Isat")
+    flt = (lambda idx: Isat[idx] >= inductor_peak(topology, res, L[idx])) if Isat is not None else None
+    idx = cat.query(where, order_by if order_by in cat.columns else None, top_n, filter=flt)
+    return [PartHit(str(row.get("part", i)), row, float(inductor_peak(topology, res, row["L"])))
+            for i, row in zip(idx, cat.rows(idx))]
+
+
+def match_capacitors(cat, topology, res, inputs, top_n=DEFAULT_TOP_N, order_by="volume"):
+    """C >= C_min, V >= V_DERATING*Vout, Irms yeterli ve ESR dahil ΔVout <= ΔV_max."""
+    C_min = res.C_min if math.isfinite(res.C_min) else None
+    where = {"C": (C_min, None)}
+    if "V" in cat.columns:
+        where["V"] = (V_DERATING * res.Vout, None)
+    rms, _ = cap_ripple_current(topology, res)
+    if "Irms" in cat.columns:
+        where["Irms"] = (rms, None)
+    _, dV_max = spec_limits(topology, inputs)
+    C = cat["C"]
+    esr = cat.columns.get("ESR", np.full(len(cat), np.nan))
+    idx = cat.query(where, order_by if order_by in cat.columns else None, top_n,
+                    filter=lambda idx: cap_delta_v(topology, res, C[idx], esr[idx]) <= dV_max)
+    return [PartHit(str(row.get("part", i)), row, float(cap_ripple_current(topology, res)[1]),
+                    float(cap_delta_v(topology, res, row["C"], row.get("ESR", math.nan))))
+            for i, row in zip(idx, cat.rows(idx))]
@@ -0,0 +1,170 @@
+# delta.py
+# İkili fark (delta) yamaları: eski EXE + yama -> yeni EXE.
+# Yeni dosya, eski dosyadan kopyalanan aralıklar (COPY) ve yeni baytlar (ADD) dizisi
+# olarak kodlanır; işlem akışı lzma ile sıkıştırılır. Eşleşmeler eski dosyanın
+# BLOCK hizalı bloklarının indeksi üzerinden bulunur, sonra iki yöne uzatılır;
+# böylece kayan (insert/delete ile ötelenen) içerik de kopya olarak yakalanır.
+# Yama eski ve yeni dosyanın SHA-256 değerlerini taşır; apply_patch çıktıyı doğrular.
+# Sadece standart kütüphane kullanır (istemci tarafında ek bağımlılık yok).
+
+import hashlib
+import lzma
+import os
+
+MAGIC = b"HDLT1"
+BLOCK = 64
+_COPY, _ADD, _END = 0, 1, 2
+_IO_BLOCK = 1 << 20
+
+
+class DeltaError(ValueError):
+    """Yama bozuk, bu dosyaya ait değil veya çıktı doğrulanamadı."""
+
+
+def _put_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _match_len(a, ai, b, bi):
+    """a[ai:] ile b[bi:] ortak önekinin uzunluğu (büyük adımlardan küçüğe)."""
+    n = min(len(a) - ai, len(b) - bi)
+    k = 0
+    for step in (1 << 16, 4096, 256, 16, 1):
+        while k + step <= n and a[ai + k:ai + k + step] == b[bi + k:bi + k + step]:
+            k += step
+    return k
+
+
+def diff(old, new, block=BLOCK):
+    """old -> new yaması (bytes). Süre, eşleşmeyen bayt sayısıyla orantılıdır."""
+    old, new = bytes(old), bytes(new)
+    index = {}
+    for o in range(0, len(old) - block + 1, block):
+        index.setdefault(old[o:o + block], o)
+
+    body = bytearray()
+    _put_varint(body, len(old))
+    _put_varint(body, len(new))
+    body += hashlib.sha256(old).digest() + hashlib.sha256(new).digest()
+
+    def add(lo, hi):
+        if hi > lo:
+            body.append(_ADD)
+            _put_varint(body, hi - lo)
+            body.extend(new[lo:hi])
+
+    i = pending = 0  # pending: henüz yazılmamış (ADD olacak) bölgenin başı
+    n = len(new)
+    guess = None     # son kopyanın devamı; tek bayt değişikliklerinde indekse gerek kalmaz
+    while i + block <= n:
+        key = new[i:i + block]
+        o = guess if guess is not None and old[guess:guess + block] == key else index.get(key)
+        if o is None:
+            i += 1
+            if guess is not None:
+                guess += 1
+                if guess + block > len(old):
+                    guess = None
+            continue
+        s, os_ = i, o
+        while s > pending and os_ > 0 and new[s - 1] == old[os_ - 1]:
+            s -= 1
+            os_ -= 1
+        length = (i - s) + block + _match_len(old, o + block, new, i + block)
+        add(pending, s)
+        body.append(_COPY)
+        _put_varint(body, os_)
+        _put_varint(body, length)
+        i = pending = s + length
+        guess = os_ + length if os_ + length + block <= len(old) else None
+    add(pending, n)
+    body.append(_END)
+    return MAGIC + lzma.compress(bytes(body))
+
+
+def _parse(patch):
+    if not patch.startswith(MAGIC):
+        raise DeltaError("Yama biçimi tanınmadı")
+    try:
+        body = lzma.decompress(patch[len(MAGIC):])
+        old_size, pos = _get_varint(body, 0)
+        new_size, pos = _get_varint(body, pos)
+    except (lzma.LZMAError, IndexError) as e:
+        raise DeltaError(f"Yama bozuk: {e}") from e
+    info = {"old_size": old_size, "new_size": new_size,
+            "old_sha256": body[pos:pos + 32].hex(), "new_sha256": body[pos + 32:pos + 64].hex()}
+    return info, body, pos + 64
+
+
+def patch_info(patch):
+    """{"old_size", "new_size", "old_sha256", "new_sha256"}."""
+    return _parse(patch)[0]
+
+
+def apply_patch(old_path, patch, out_path):
+    """Yamayı old_path'e uygula, out_path'e yaz; çıktının SHA-256'sını doğrula."""
+    info, body, pos = _parse(patch)
+    if os.path.getsize(old_path) != info["old_size"]:
+        raise DeltaError("Yama bu dosyaya ait değil (boyut farklı)")
+    h = hashlib.sha256()
+    try:
+        with open(old_path, "rb") as old, open(out_path, "wb") as out:
+            while True:
+                op = body[pos]
+                pos += 1
+                if op == _END:
+                    break
+                if op == _COPY:
+                    off, pos = _get_varint(body, pos)
+                    length, pos = _get_varint(body, pos)
+                    if off + length > info["old_size"]:
+                        raise DeltaError("Yama bozuk: kopya aralığı dosya dışında")
+                    old.seek(off)
+                    while length:
+                        data = old.read(min(length, _IO_BLOCK))
+                        out.write(data)
+                        h.update(data)
+                        length -= len(data)
+                elif op == _ADD:
+                    length, pos = _get_varint(body, pos)
+                    data = body[pos:pos + length]
+                    pos += length
+                    out.write(data)
+                    h.update(data)
+                else:
+                    raise DeltaError(f"Yama bozuk: bilinmeyen işlem {op}")
+    except (IndexError, DeltaError) as e:
+        os.remove(out_path)
+        if isinstance(e, DeltaError):
+            raise
+        raise DeltaError("Yama bozuk: beklenmeyen son") from e
+    if h.hexdigest() != info["new_sha256"]:
+        os.remove(out_path)
+        raise DeltaError("Yama sonrası dosyanın SHA-256 değeri uyuşmuyor")
+    return info
+
+
+def make_patch(old_path, new_path, out_path, block=BLOCK):
+    """Dosyalardan yama üret (yayın tarafı); yama boyutunu döndür."""
+    with open(old_path, "rb") as f:
+        old = f.read()
+    with open(new_path, "rb") as f:
+        new = f.read()
+    patch = diff(old, new, block)
+    with open(out_path, "wb") as f:
+        f.write(patch)
+    return len(patch)
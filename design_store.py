@@ -0,0 +1,362 @@
+# design_store.py
+# Kalıcı tasarım deposu (boost / buck / flyback): girişler, skaler sonuçlar, dalga formları
+# ve tarama (sweep) küpleri. GUI'siz; hesap_defteri, hesap_cli ve scriptler ortak kullanır.
+#
+# Dizin tabanlı, sonuna eklenen kolonsal depo:
+#   store.json          şema sürümü, satır sayısı, sonraki id, dalga havuzu uzunluğu
+#   cols/<sütun>.bin    sütun başına ham dizi (float64 / int64 / int8 / sabit genişlikli str)
+#   waves.bin           float32 dalga formu havuzu; tasarım başına [t, iL, v] blokları
+#   sweeps/<id>.npy     sweep.run_sweep çıktı küpü; yanında <id>.json (eksenler, sabitler)
+# Açılışta sadece store.json okunur; sütunlar ilk erişimde np.memmap ile eşlenir (metin
+# ayrıştırma yok, on binlerce tasarım ~ms). Ekleme her sütun dosyasına satır sayısı
+# konumundan yazar, en son store.json'u atomik günceller: yarıda kalan bir ekleme satır
+# sayısına girmediği için görünmez ve sonraki eklemede üzerine yazılır.
+# Silme yerinde "deleted" bayrağıdır (satırlar ve id'ler kaymaz).
+#
+# Giriş sütunları topolojiden bağımsız adlandırılır: flyback Lm -> L; ripI / ripV boost
+# ve flyback'te oran (ripI_pct), buck'ta değerdir (ripI_val). Uygulanmayan alanlar NaN.
+# Parquet dışa aktarım için pyarrow gerekir (isteğe bağlı).
+
+import inspect
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from calc_core import BATCH_FIELDS, BATCH_FUNCS, boost_calc, buck_calc, flyback_calc
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet dışa aktarım isteğe bağlı
+    pa = pq = None
+
+SCHEMA_VERSION = 1
+TOPOLOGIES = ("boost", "buck", "flyback")
+NAME_LEN = 48
+INPUT_FIELDS = ("Vin", "Vout", "freq", "L", "C", "Iout", "ripI", "ripV", "nsnp", "eff", "f_clk", "psc", "arr")
+RESULT_FIELDS = BATCH_FIELDS + ("nsnp_req", "P_loss", "ccm", "valid")
+COLUMNS = (("id", "<i8"), ("created", "<f8"), ("topology", "i1"), ("deleted", "i1"),
+           ("name", f"<U{NAME_LEN}"),
+           *((f, "<f8") for f in INPUT_FIELDS + RESULT_FIELDS),
+           ("wave_off", "<i8"), ("wave_n", "<i8"))
+WAVE_CHANNELS = ("t", "iL", "v")
+COMPARE_FIELDS = ("Vin", "Vout", "freq", "L", "C", "Iout", "nsnp", "D", "delta_IL", "delta_Vout",
+                  "IL_avg", "Ipk", "L_min", "C_min", "nsnp_req", "eff", "P_loss")
+_DTYPES = dict(COLUMNS)
+_CALC_PARAMS = {t: set(inspect.signature(f).parameters)
+                for t, f in zip(TOPOLOGIES, (boost_calc, buck_calc, flyback_calc))}
+# sütun eksikse *_batch'in kullandığı varsayılan (ör. eff: flyback 0.9, boost/buck 1.0)
+_BATCH_DEFAULTS = {t: {p: par.default
+                       for p, par in inspect.signature(BATCH_FUNCS[t]).parameters.items()
+                       if par.default is not inspect.Parameter.empty}
+                   for t in TOPOLOGIES}
+
+
+def calc_name(topology, field):
+    """Depo giriş alanının *_calc / *_batch argüman adı (L -> Lm, ripI -> ripI_val ...)."""
+    if field == "L" and topology == "flyback":
+        return "Lm"
+    if field in ("ripI", "ripV"):
+        return field + ("_val" if topology == "buck" else "_pct")
+    return field
+
+
+def parquet_available():
+    return pq is not None
+
+
+class DesignStore:
+    """Dizin tabanlı tasarım deposu; bkz. modül başlığı. Yazma işlemleri thread-safe'tir."""
+
+    def __init__(self, path, create=True):
+        self.path = path
+        self._lock = threading.RLock()
+        self._maps = {}
+        meta_path = os.path.join(path, "store.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self._meta = json.load(f)
+            if self._meta.get("version") != SCHEMA_VERSION:
+                raise ValueError(f"Desteklenmeyen depo sürümü: {self._meta.get('version')}")
+        elif create:
+            os.makedirs(os.path.join(path, "cols"), exist_ok=True)
+            os.makedirs(os.path.join(path, "sweeps"), exist_ok=True)
+            self._meta = {"version": SCHEMA_VERSION, "rows": 0, "next_id": 1, "wave_len": 0,
+                          "next_sweep": 1}
+            self._save_meta()
+        else:
+            raise FileNotFoundError(f"Tasarım deposu yok: {path}")
+
+    @staticmethod
+    def exists(path):
+        return os.path.isfile(os.path.join(path, "store.json"))
+
+    # --- dosya düzeyi ---
+    def _col_path(self, name):
+        return os.path.join(self.path, "cols", name + ".bin")
+
+    def _save_meta(self):
+        tmp = os.path.join(self.path, "store.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._meta, f)
+        os.replace(tmp, os.path.join(self.path, "store.json"))
+
+    @staticmethod
+    def _write_at(path, offset, data):
+        # sonraki yazma yarım kalmış kuyruğun üzerine yazar; kısaltma yok (Windows'ta
+        # eşlenmiş dosya kısaltılamaz)
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    def _map(self, path, dtype, count):
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    # --- okuma ---
+    def __len__(self):
+        return self._meta["rows"]
+
+    def column(self, name):
+        """Sütunun salt-okunur görünümü (memmap; silinmiş satırlar dahil)."""
+        with self._lock:
+            m = self._maps.get(name)
+            if m is None:
+                m = self._maps[name] = self._map(self._col_path(name), _DTYPES[name], len(self))
+            return m
+
+    def __getitem__(self, name):
+        return self.column(name)
+
+    def topology(self, i):
+        return TOPOLOGIES[int(self.column("topology")[i])]
+
+    def index_of(self, design_id):
+        """id -> satır indeksi (id'ler artan yazılır)."""
+        ids = self.column("id")
+        i = int(np.searchsorted(ids, design_id))
+        if i >= len(ids) or ids[i] != design_id:
+            raise KeyError(f"Tasarım yok: {design_id}")
+        return i
+
+    def select(self, topology=None, where=None, include_deleted=False):
+        """Satır indeksleri. where: {sütun: (alt, üst)} kapalı aralıklar (None = sınırsız)."""
+        n = len(self)
+        keep = np.ones(n, dtype=bool)
+        if not include_deleted:
+            keep &= self.column("deleted") == 0
+        if topology is not None:
+            keep &= self.column("topology") == TOPOLOGIES.index(topology)
+        for name, (lo, hi) in (where or {}).items():
+            v = self.column(name)
+            if lo is not None:
+                keep &= v >= lo
+            if hi is not None:
+                keep &= v <= hi
+        return np.flatnonzero(keep)
+
+    def latest(self, topology, where=None):
+        """Topolojinin silinmemiş son tasarımının satır indeksi (yoksa None)."""
+        idx = self.select(topology, where)
+        return int(idx[-1]) if len(idx) else None
+
+    def record(self, i):
+        """Tek satır: {sütun: değer}; topology metin olarak."""
+        out = {name: self.column(name)[i].item() for name, _ in COLUMNS}
+        out["topology"] = TOPOLOGIES[out["topology"]]
+        return out
+
+    def table(self, idx=None):
+        """{sütun: dizi} (bellekte kopya); topology metin dizisi."""
+        idx = self.select() if idx is None else np.asarray(idx)
+        out = {name: np.asarray(self.column(name)[idx]) for name, _ in COLUMNS}
+        out["topology"] = np.asarray(TOPOLOGIES)[out["topology"]]
+        return out
+
+    def calc_inputs(self, i):
+        """Satırın *_calc argümanları (NaN alanlar atlanır; psc / arr tamsayı)."""
+        topo = self.topology(i)
+        inp = {}
+        for f in INPUT_FIELDS:
+            v = float(self.column(f)[i])
+            if v == v and calc_name(topo, f) in _CALC_PARAMS[topo]:
+                inp[calc_name(topo, f)] = int(v) if f in ("psc", "arr") else v
+        return inp
+
+    def waveform(self, i):
+        """(t, iL, v) float32 görünümleri veya None."""
+        off, n = int(self.column("wave_off")[i]), int(self.column("wave_n")[i])
+        if n <= 0:
+            return None
+        pool = self._maps.get("__waves__")
+        if pool is None or len(pool) < off + 3 * n:
+            pool = self._maps["__waves__"] = self._map(os.path.join(self.path, "waves.bin"),
+                                                       np.float32, self._meta["wave_len"])
+        return tuple(pool[off:off + 3 * n].reshape(3, n))
+
+    # --- yazma ---
+    def append(self, columns, waves=None):
+        """Sütun sözlüğünü ekle (eksik sütunlar NaN / 0); eklenen id dizisini döndür.
+
+        waves: satır başına (t, iL, v) veya None listesi."""
+        m = len(next(iter(columns.values())))
+        if waves is not None and len(waves) != m:
+            raise ValueError("Dalga formu sayısı satır sayısıyla eşit olmalı.")
+        with self._lock:
+            n = len(self)
+            ids = np.arange(self._meta["next_id"], self._meta["next_id"] + m, dtype=np.int64)
+            cols = {"id": ids, "created": np.full(m, time.time()), "deleted": np.zeros(m, np.int8),
+                    "wave_off": np.zeros(m, np.int64), "wave_n": np.zeros(m, np.int64)}
+            wave_len = self._meta["wave_len"]
+            if waves is not None:
+                blocks = []
+                for k, w in enumerate(waves):
+                    if w is None:
+                        continue
+                    block = np.vstack([np.asarray(c, dtype=np.float32) for c in w])
+                    cols["wave_off"][k], cols["wave_n"][k] = wave_len, block.shape[1]
+                    wave_len += block.size
+                    blocks.append(block.ravel())
+                if blocks:
+                    self._write_at(os.path.join(self.path, "waves.bin"), self._meta["wave_len"] * 4,
+                                   np.concatenate(blocks).tobytes())
+            for name, dtype in COLUMNS:
+                if name in cols:
+                    a = cols[name]
+                elif name in columns:
+                    a = np.broadcast_to(np.asarray(columns[name]), (m,))
+                else:
+                    a = np.full(m, "" if dtype[1] == "U" else np.nan)
+                a = np.ascontiguousarray(a, dtype=dtype)
+                self._write_at(self._col_path(name), n * a.itemsize, a.tobytes())
+            self._meta.update(rows=n + m, next_id=int(ids[-1]) + 1 if m else self._meta["next_id"],
+                              wave_len=wave_len)
+            self._save_meta()
+            self._maps = {}
+        return ids
+
+    def add(self, topology, inputs, result=None, waves=None, name="", P_loss=float("nan")):
+        """Tek tasarım: calc girişleri (SI), *_calc sonucu ve isteğe bağlı (t, iL, v)."""
+        cols = {"topology": TOPOLOGIES.index(topology), "name": name[:NAME_LEN], "P_loss": P_loss}
+        for f in INPUT_FIELDS:
+            v = inputs.get(calc_name(topology, f))
+            cols[f] = np.nan if v is None else float(v)
+        if result is not None:
+            for f in BATCH_FIELDS + ("nsnp_req",):
+                cols[f] = getattr(result, f, np.nan)
+            if result.C is not None:
+                cols["C"] = result.C
+            cols["eff"] = result.eff
+            cols["ccm"], cols["valid"] = float(result.mode == "CCM"), 1.0
+            if result.timer is not None:
+                cols["psc"], cols["arr"] = result.timer.psc, result.timer.arr
+        cols = {k: np.atleast_1d(np.asarray(v, dtype=_DTYPES[k])) for k, v in cols.items()}
+        return int(self.append(cols, None if waves is None else [waves])[0])
+
+    def add_columns(self, columns, topology=None, name="", f_clk=None):
+        """hesap_cli.process_chunk çıktısı (veya *_batch argümanları + sonuç alanları) ekle.
+
+        topology verilmezse "topology" sütunu kullanılır; bilinmeyen topolojili satırlar atlanır.
+        Eksik isteğe bağlı girişler (eff) hesapta kullanılan *_batch varsayılanıyla,
+        "f_clk" sütunu yoksa f_clk argümanıyla (hesap_cli --f-clk) doldurulur."""
+        n = len(next(iter(columns.values())))
+        topo = np.full(n, topology) if topology else np.asarray(columns["topology"], dtype=str)
+        code = np.full(n, -1, dtype=np.int8)
+        for k, t in enumerate(TOPOLOGIES):
+            code[topo == t] = k
+        keep = code >= 0
+        cols = {"topology": code[keep], "name": np.full(int(keep.sum()), name[:NAME_LEN])}
+        for f in INPUT_FIELDS + RESULT_FIELDS:
+            v = np.full(n, np.nan)
+            for k, t in enumerate(TOPOLOGIES):
+                if f in INPUT_FIELDS and calc_name(t, f) not in _CALC_PARAMS[t]:
+                    continue  # ör. karışık dosyada boost satırlarının nsnp sütunu
+                src = columns.get(calc_name(t, f), columns.get(f))
+                sel = code == k
+                if src is not None:
+                    v[sel] = np.asarray(src, dtype=float)[sel]
+                elif calc_name(t, f) in _BATCH_DEFAULTS[t]:
+                    v[sel] = _BATCH_DEFAULTS[t][calc_name(t, f)]
+            cols[f] = v[keep]
+        if "f_clk" not in columns and f_clk is not None:
+            cols["f_clk"][:] = float(f_clk)
+        if "mode" in columns:
+            cols["ccm"] = (np.asarray(columns["mode"]) == "CCM")[keep].astype(float)
+        for f in ("psc", "arr"):
+            cols[f][cols[f] < 0] = np.nan   # hesap_cli: -1 = timer çözümü yok
+        return self.append(cols)
+
+    def delete(self, idx):
+        """Satırları silinmiş işaretle (yerinde; satır sayısı değişmez)."""
+        with self._lock:
+            for i in np.atleast_1d(idx):
+                self._write_at(self._col_path("deleted"), int(i), b"\x01")
+            self._maps.pop("deleted", None)
+
+    # --- taramalar ---
+    def add_sweep(self, result, name=""):
+        """sweep.SweepResult küpünü depoya kopyala; tarama id'sini döndür."""
+        if result.path is None:
+            raise ValueError("Taramanın çıktı dizisi yok (fields boş).")
+        if result.array is not None:
+            result.array.flush()
+        sw = result.sweep
+        with self._lock:
+            sid = self._meta["next_sweep"]
+            base = os.path.join(self.path, "sweeps", str(sid))
+            shutil.copyfile(result.path, base + ".npy")
+            info = {"id": sid, "name": name, "created": time.time(), "topology": sw.topology,
+                    "fields": list(result.fields), "axes": {k: v.tolist() for k, v in sw.axes.items()},
+                    "fixed": {k: float(v) for k, v in sw.fixed.items()}, "done": int(result.done),
+                    "cancelled": bool(result.cancelled)}
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump(info, f)
+            self._meta["next_sweep"] = sid + 1
+            self._save_meta()
+        return sid
+
+    def sweeps(self):
+        """Kayıtlı taramaların bilgi sözlükleri (id sırasıyla)."""
+        d = os.path.join(self.path, "sweeps")
+        out = []
+        for fn in os.listdir(d) if os.path.isdir(d) else ():
+            if fn.endswith(".json"):
+                with open(os.path.join(d, fn), encoding="utf-8") as f:
+                    out.append(json.load(f))
+        return sorted(out, key=lambda s: s["id"])
+
+    def load_sweep(self, sid):
+        """(bilgi, küp memmap); küp shape (len(fields),) + eksen uzunlukları."""
+        base = os.path.join(self.path, "sweeps", str(sid))
+        with open(base + ".json", encoding="utf-8") as f:
+            info = json.load(f)
+        return info, np.load(base + ".npy", mmap_mode="r")
+
+    # --- dışa aktarım ---
+    def export_parquet(self, path, idx=None):
+        if pq is None:
+            raise RuntimeError("Parquet için pyarrow gerekli (pip install pyarrow)")
+        t = self.table(idx)
+        t.pop("wave_off"), t.pop("wave_n")
+        pq.write_table(pa.table(t), path)
+        return path
+
+
+def compare(store, idx, ref=0, fields=COMPARE_FIELDS):
+    """Seçili tasarımların karşılaştırması: (alanlar, değerler, bağıl fark).
+
+    değerler shape (len(idx), len(alanlar)); bağıl fark referans satıra (idx[ref]) göre
+    (v - v_ref) / |v_ref|. Seçimin tamamında NaN olan alanlar atlanır."""
+    idx = np.asarray(idx)
+    values = np.column_stack([np.asarray(store.column(f)[idx], dtype=float) for f in fields])
+    used = ~np.all(np.isnan(values), axis=0)
+    values = values[:, used]
+    base = values[ref]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel = (values - base) / np.abs(base)
+    return tuple(f for f, u in zip(fields, used) if u), values, rel
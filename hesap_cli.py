@@ -0,0 +1,482 @@
+# hesap_cli.py
+# Komut satırı toplu hesap: CSV / Parquet tasarım dosyalarını parça parça okur,
+# her parçayı calc_core.*_batch ve timer_solver.solve_batch ile vektörel hesaplar,
+# sonuçları CSV / Parquet / JSON Lines olarak artımlı yazar. Bellek kullanımı dosya
+# boyutundan bağımsızdır (parça boyu × sütun sayısı); --workers > 1 iken CSV parçaları
+# süreç havuzuna ham metin olarak gider: ayrıştırma, hesap ve CSV / JSON Lines metnine
+# çevirme işçilerde yapılır, ana süreç sadece satır okur ve metni sırayla yazar.
+# Uçuştaki parça sayısı sınırlıdır.
+#
+#   python hesap_cli.py tasarimlar.csv -o sonuc.parquet --topology boost --f-clk 72e6
+#   python hesap_cli.py karisik.parquet -o sonuc.jsonl --workers 4
+#   python hesap_cli.py tasarimlar.csv -o sonuc.csv --store tasarimlar/   # depoya da ekle
+#
+# Giriş sütunları *_batch argüman adlarıdır (SI): Vin, Vout, freq, L / Lm, C, Iout,
+# ripI_pct, ripV_pct (oran) veya ripI_val, ripV_val (buck), nsnp, eff; isteğe bağlı
+# "topology" (satır başına) ve "f_clk" sütunları. "L_uH", "freq_kHz" gibi birimli
+# başlıklar SI'ya çevrilir ve çıktıya SI adlarıyla yazılır. Diğer sütunlar (id, ad...)
+# çıktıya aynen taşınır; bilinmeyen topolojili satırlar valid=0 olarak yazılır.
+# Parquet için pyarrow gerekir; yoksa sadece CSV / JSON Lines kullanılabilir.
+# --store: sonuçlar ayrıca design_store deposuna (GUI'nin "Tasarımlar" penceresi) eklenir.
+
+import argparse
+import csv
+import inspect
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS, BATCH_FIELDS
+from timer_solver import solve_batch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet desteği isteğe bağlı
+    pa = pq = None
+
+DEFAULT_CHUNK = 1 << 16
+UNITS = {"V": 1.0, "mV": 1e-3, "A": 1.0, "mA": 1e-3, "Hz": 1.0, "kHz": 1e3, "MHz": 1e6,
+         "H": 1.0, "mH": 1e-3, "uH": 1e-6, "µH": 1e-6, "nH": 1e-9,
+         "F": 1.0, "mF": 1e-3, "uF": 1e-6, "µF": 1e-6, "nF": 1e-9}
+RESULT_FIELDS = BATCH_FIELDS + ("nsnp_req",)
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+_PARAMS = {t: inspect.signature(f).parameters for t, f in BATCH_FUNCS.items()}
+_KNOWN = {"topology", "f_clk"}.union(*(set(p) for p in _PARAMS.values()))
+
+
+def parquet_available():
+    return pq is not None
+
+
+def _require_parquet():
+    if pq is None:
+        raise RuntimeError("Parquet için pyarrow gerekli (pip install pyarrow)")
+
+
+def _format_of(path, fmt=None):
+    if fmt:
+        return fmt
+    if path == "-":
+        return "csv"
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Dosya biçimi anlaşılamadı: {path} (--format verin)")
+    return FORMATS[ext]
+
+
+def parse_header(name):
+    """'L_uH' -> ('L', 1e-6); bilinen parametre adları ve birimsiz başlıklar ölçeklenmez."""
+    name = name.strip()
+    if name in _KNOWN:
+        return name, None
+    base, _, unit = name.rpartition("_")
+    if base in _KNOWN and unit in UNITS:
+        return base, UNITS[unit]
+    return name, None
+
+
+def _to_float(values):
+    """Metin dizisini float'a çevir; boş / hatalı hücreler NaN olur."""
+    a = np.char.strip(np.asarray(values, dtype=str))
+    try:
+        return np.where(a == "", "nan", a).astype(float)
+    except ValueError:
+        out = np.empty(len(values))
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                out[i] = math.nan
+        return out
+
+
+# ---------- Okuyucular ----------
+@dataclass
+class CsvBlock:
+    """Ayrıştırılmamış CSV satır bloğu; süreç havuzuna ucuz gönderilir, işçide çözülür."""
+    headers: list
+    delim: str
+    text: str
+
+    def columns(self):
+        rows = [row for row in csv.reader(io.StringIO(self.text, newline=""), delimiter=self.delim)
+                if row]
+        return {h: list(c) for h, c in zip(self.headers, zip(*rows))}
+
+
+def _csv_blocks(path, chunk_size):
+    """CSV'yi chunk_size satırlık ham bloklar olarak üret (tırnak içi satır sonları bölünmez)."""
+    f = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+    try:
+        head = f.readline()
+        delim = ";" if head.count(";") > head.count(",") else ","
+        headers = next(csv.reader([head], delimiter=delim))
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            text = "".join(lines)
+            while text.count('"') % 2:   # tırnaklı hücre bloğun sonunda açık kaldı
+                line = f.readline()
+                if not line:
+                    break
+                text += line
+            yield CsvBlock(headers, delim, text)
+            if len(lines) < chunk_size:
+                return
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _csv_chunks(path, chunk_size):
+    for block in _csv_blocks(path, chunk_size):
+        cols = block.columns()
+        if cols:
+            yield cols
+
+
+def _parquet_chunks(path, chunk_size):
+    _require_parquet()
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield {name: batch.column(i).to_numpy(zero_copy_only=False)
+               for i, name in enumerate(batch.schema.names)}
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK, fmt=None):
+    """Girişi {sütun: dizi} parçaları olarak üret; sayısal parametreler SI float'a çevrilir."""
+    fmt = _format_of(path, fmt)
+    if fmt == "jsonl":
+        raise ValueError("JSON Lines sadece çıktı biçimi olarak desteklenir")
+    raw = _csv_chunks(path, chunk_size) if fmt == "csv" else _parquet_chunks(path, chunk_size)
+    return map(convert_columns, raw)
+
+
+def convert_columns(chunk):
+    """Ham {başlık: değerler} parçasını SI adlı / float sütunlara çevir."""
+    out = {}
+    for h, values in chunk.items():
+        name, scale = parse_header(h)
+        if name in _KNOWN and name != "topology":
+            arr = _to_float(values) if isinstance(values, list) else np.asarray(values, dtype=float)
+            out[name] = arr * scale if scale else arr
+        else:
+            out[name] = np.asarray(values, dtype=str) if isinstance(values, list) else values
+    return out
+
+
+# ---------- Hesap ----------
+def check_columns(columns, topology=None):
+    """Eksik zorunlu sütunlar için ValueError."""
+    if topology is not None and topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    if topology is None and "topology" not in columns:
+        raise ValueError("Topoloji yok: --topology verin veya 'topology' sütunu ekleyin")
+    topos = [topology] if topology else sorted(set(np.asarray(columns["topology"], dtype=str)))
+    for t in topos:
+        if t not in BATCH_FUNCS:
+            continue  # satır düzeyinde geçersiz sayılır
+        missing = [p for p, par in _PARAMS[t].items()
+                   if par.default is inspect.Parameter.empty and p not in columns]
+        if missing:
+            raise ValueError(f"{t} için eksik sütun(lar): {', '.join(missing)}")
+
+
+def process_chunk(columns, topology=None, f_clk=None):
+    """Bir parçanın sonuç sütunları: giriş sütunları + hesap alanları (+ PSC/ARR)."""
+    n = len(next(iter(columns.values())))
+    topo = (np.full(n, topology, dtype=object) if topology
+            else np.asarray(columns["topology"], dtype=str))
+    out = {name: np.full(n, np.nan) for name in RESULT_FIELDS}
+    valid = np.zeros(n, dtype=bool)
+    ccm = np.zeros(n, dtype=bool)
+    for t in np.unique(topo):
+        sel = np.flatnonzero(topo == t)
+        if t not in BATCH_FUNCS:
+            continue  # bilinmeyen topoloji: satır geçersiz sayılır, dosya durmaz
+        check_columns(columns, t)
+        kw = {p: columns[p][sel] for p in _PARAMS[t] if p in columns}
+        res = BATCH_FUNCS[t](**kw)
+        for name in RESULT_FIELDS:
+            v = getattr(res, name)
+            if v is not None:
+                out[name][sel] = v
+        valid[sel] = res.valid
+        ccm[sel] = res.ccm
+    out["mode"] = np.where(valid, np.where(ccm, "CCM", "DCM"), "")
+    out["valid"] = valid
+
+    fclk = columns.get("f_clk")
+    if fclk is None and f_clk is not None:
+        fclk = np.full(n, float(f_clk))
+    if fclk is not None:
+        psc = np.full(n, -1, dtype=np.int64)
+        arr = np.full(n, -1, dtype=np.int64)
+        f_act = np.full(n, np.nan)
+        err = np.full(n, np.nan)
+        freq = columns.get("freq", np.full(n, np.nan))
+        ok = np.isfinite(fclk) & np.isfinite(freq) & (freq > 0) & (fclk > 0)
+        for fc in np.unique(fclk[ok]):
+            sel = np.flatnonzero(ok & (fclk == fc))
+            psc[sel], arr[sel], f_act[sel], err[sel] = solve_batch(fc, freq[sel])
+        out.update(psc=psc, arr=arr, f_actual=f_act, f_error=err)
+    return {**{k: v for k, v in columns.items() if k not in out}, **out}
+
+
+# ---------- Yazıcılar ----------
+def csv_text(cols, header):
+    """Sütunları header sırasıyla CSV satırlarına (başlıksız) çevir."""
+    buf = io.StringIO(newline="")
+    csv.writer(buf).writerows(zip(*(_cells(cols[h]) for h in header)))
+    return buf.getvalue()
+
+
+def jsonl_text(cols, header):
+    lists = [_json_cells(cols[h]) for h in header]
+    return "".join(json.dumps(dict(zip(header, row)), ensure_ascii=False) + "\n"
+                   for row in zip(*lists))
+
+
+class CsvWriter:
+    encode = staticmethod(csv_text)
+
+    def __init__(self, path):
+        self._f = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self._header = None
+
+    def write(self, cols):
+        self.write_text(csv_text(cols, self._header or list(cols)), list(cols))
+
+    def write_text(self, text, header):
+        """İşçide csv_text ile kodlanmış satırları yaz."""
+        if self._header is None:
+            self._header = header
+            csv.writer(self._f).writerow(header)
+        self._f.write(text)
+
+    def close(self):
+        if self._f is sys.stdout:
+            self._f.flush()
+        else:
+            self._f.close()
+
+
+class JsonlWriter:
+    encode = staticmethod(jsonl_text)
+
+    def __init__(self, path):
+        self._f = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, cols):
+        self.write_text(jsonl_text(cols, list(cols)), None)
+
+    def write_text(self, text, header):
+        self._f.write(text)
+
+    def close(self):
+        if self._f is sys.stdout:
+            self._f.flush()
+        else:
+            self._f.close()
+
+
+class ParquetWriter:
+    encode = None   # Arrow tablosu ana süreçte kurulur
+
+    def __init__(self, path):
+        _require_parquet()
+        self.path = path
+        self._w = None
+
+    def write(self, cols):
+        table = pa.table({k: np.asarray(v) for k, v in cols.items()})
+        if self._w is None:
+            self._w = pq.ParquetWriter(self.path, table.schema)
+        self._w.write_table(table.cast(self._w.schema))
+
+    def close(self):
+        if self._w is not None:
+            self._w.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonlWriter, "parquet": ParquetWriter}
+
+
+def _cells(a):
+    a = np.asarray(a)
+    if a.dtype.kind == "b":
+        return a.astype(np.int8).tolist()
+    if a.dtype.kind == "f":
+        # sayı -> metin dönüşümünü csv modülü (C) yapar; sadece NaN / inf hücreler boş yazılır
+        cells = a.tolist()
+        for i in np.flatnonzero(~np.isfinite(a)).tolist():
+            cells[i] = None
+        return cells
+    return a.tolist()
+
+
+def _json_cells(a):
+    a = np.asarray(a)
+    if a.dtype.kind == "f":
+        return [x if math.isfinite(x) else None for x in a.tolist()]  # JSON'da NaN yok
+    return a.tolist()
+
+
+# ---------- Çalıştırıcı ----------
+@dataclass
+class BatchSummary:
+    rows: int = 0
+    chunks: int = 0
+    valid: int = 0
+    ccm: int = 0
+    elapsed: float = 0.0
+    input_bytes: int = 0
+
+    @property
+    def rows_per_s(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def text(self):
+        mb = self.input_bytes / 1e6
+        return (f"{self.rows} satır, {self.chunks} parça, {self.elapsed:.2f} s "
+                f"({self.rows_per_s:,.0f} satır/s, {mb / self.elapsed if self.elapsed > 0 else 0:.1f} MB/s); "
+                f"geçerli {self.valid}, CCM {self.ccm}, DCM {self.valid - self.ccm}, "
+                f"geçersiz {self.rows - self.valid}")
+
+
+@dataclass
+class ChunkResult:
+    """İşçiden dönen parça: kodlanmış çıktı metni ve / veya sütunlar, sayaçlar."""
+    header: list
+    text: str = None
+    cols: dict = None
+    rows: int = 0
+    valid: int = 0
+    ccm: int = 0
+
+
+def _chunk_job(chunk, topology, f_clk, encode, keep_cols):
+    """Süreç havuzu işi: (ham CSV bloğu →) sütunlar → hesap → (çıktı metni)."""
+    if isinstance(chunk, CsvBlock):
+        chunk = convert_columns(chunk.columns())
+        if not chunk:
+            return None
+    cols = process_chunk(chunk, topology, f_clk)
+    header = list(cols)
+    return ChunkResult(header, encode(cols, header) if encode else None,
+                       cols if keep_cols or not encode else None, len(cols["valid"]),
+                       int(np.count_nonzero(cols["valid"])),
+                       int(np.count_nonzero(cols["mode"] == "CCM")))
+
+
+def run_batch(in_path, out_path, topology=None, f_clk=None, chunk_size=DEFAULT_CHUNK,
+              workers=1, in_format=None, out_format=None, progress=None, store=None):
+    """Girişi parça parça hesapla ve yaz; BatchSummary döndür.
+
+    workers > 1 ise parçalar süreç havuzunda işlenir: CSV girişte işçilere ham satır
+    blokları gider ve CSV / JSON Lines çıktı işçide metne çevrilir; ana süreç sadece
+    okur ve yazar. En fazla 2*workers parça uçuşta tutulur, çıktı giriş sırasıyla yazılır.
+    store: design_store.DesignStore; verilirse her parça depoya da eklenir (ad = giriş dosyası).
+    """
+    writer = WRITERS[_format_of(out_path, out_format)](out_path)
+    summary = BatchSummary(input_bytes=os.path.getsize(in_path) if in_path != "-" else 0)
+    t0 = time.perf_counter()
+
+    def emit(res):
+        if res is None:
+            return
+        if res.text is not None:
+            writer.write_text(res.text, res.header)
+        else:
+            writer.write(res.cols)
+        if store is not None:
+            store.add_columns(res.cols, topology, os.path.basename(in_path), f_clk)
+        summary.rows += res.rows
+        summary.chunks += 1
+        summary.valid += res.valid
+        summary.ccm += res.ccm
+        if progress:
+            progress(summary)
+
+    parallel = workers > 1
+    if parallel and _format_of(in_path, in_format) == "csv":
+        chunks = _csv_blocks(in_path, chunk_size)
+    else:
+        chunks = read_chunks(in_path, chunk_size, in_format)
+    try:
+        first = next(chunks, None)
+        if first is not None:
+            if isinstance(first, CsvBlock):
+                # ilk blok da işçide çözülür; burada sadece başlıklar kontrol edilir,
+                # satır topolojilerine göre eksik sütunları işçide process_chunk bildirir
+                check_columns(dict.fromkeys((parse_header(h)[0] for h in first.headers), ()),
+                              topology)
+            else:
+                check_columns(first, topology)
+            if not parallel:
+                emit(_chunk_job(first, topology, f_clk, None, True))
+                for chunk in chunks:
+                    emit(_chunk_job(chunk, topology, f_clk, None, True))
+            else:
+                job = (topology, f_clk, writer.encode, store is not None)
+                with ProcessPoolExecutor(max_workers=workers) as ex:
+                    pending = deque([ex.submit(_chunk_job, first, *job)])
+                    for chunk in chunks:
+                        pending.append(ex.submit(_chunk_job, chunk, *job))
+                        while len(pending) >= 2 * workers:
+                            emit(pending.popleft().result())
+                    while pending:
+                        emit(pending.popleft().result())
+    finally:
+        writer.close()
+    summary.elapsed = time.perf_counter() - t0
+    return summary
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Boost / Buck / Flyback toplu hesap (CSV / Parquet)")
+    ap.add_argument("input", help="CSV veya Parquet giriş dosyası ('-' = stdin CSV)")
+    ap.add_argument("-o", "--output", required=True, help="çıktı: .csv / .parquet / .jsonl ('-' = stdout CSV)")
+    ap.add_argument("--topology", choices=sorted(BATCH_FUNCS),
+                    help="tüm satırlar için topoloji (yoksa 'topology' sütunu kullanılır)")
+    ap.add_argument("--f-clk", type=float, default=None,
+                    help="PSC/ARR hesabı için timer saati (Hz); 'f_clk' sütunu varsa o kullanılır")
+    ap.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="parça başına satır")
+    ap.add_argument("--workers", type=int, default=1, help="süreç sayısı (0 = tüm çekirdekler)")
+    ap.add_argument("--in-format", choices=("csv", "parquet"))
+    ap.add_argument("--out-format", choices=sorted(WRITERS))
+    ap.add_argument("--store", metavar="DİZİN", help="sonuçları bu tasarım deposuna da ekle")
+    ap.add_argument("-q", "--quiet", action="store_true", help="ilerleme yazma")
+    args = ap.parse_args(argv)
+
+    def progress(s):
+        if not args.quiet:
+            print(f"\r{s.rows} satır...", end="", file=sys.stderr, flush=True)
+
+    try:
+        store = None
+        if args.store:
+            from design_store import DesignStore
+            store = DesignStore(args.store)
+        summary = run_batch(args.input, args.output, args.topology, args.f_clk, args.chunk,
+                            args.workers or os.cpu_count() or 1, args.in_format, args.out_format,
+                            progress, store)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"\nHata: {e}", file=sys.stderr)
+        return 1
+    print(("\r" if not args.quiet else "") + "Bitti: " + summary.text(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,141 +1,166 @@
 # hesap_defteri.py
 # Tam sürüm: Boost / Buck / Flyback hesaplayıcı + scroll UI + EXE güncelleme
 # Not: Güncelleme için requests gereklidir; yoksa check atlanır.
+# Açılış: pencere önce çizilir; NumPy/matplotlib/scipy arka planda yüklenir,
+# her sekmenin figürü ve ilk hesabı sekme ilk seçildiğinde yapılır.
+
+import time
+_T_START = time.perf_counter()  # açılış süresi ölçümü (pencere / ilk etkileşim)
 
 import os
 import sys
-import tempfile
+import json
 import subprocess
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
-import math
-import time
 
-# plotting
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-
-# optional libs
-try:
-    import requests
-    _HAS_REQUESTS = True
-except Exception:
-    _HAS_REQUESTS = False
+from instrument import PERF, format_cycle, sparkline  # NumPy'sız; kapalıyken maliyeti yok
 
 # ---------- AYARLAR (BURADAN DEĞİŞTİR) ----------
 LOCAL_VERSION = "1.0.1"  # yerel sürüm
 VERSION_URL = "https://raw.githubusercontent.com/belaliomer/hesap_defteri_update/refs/heads/main/version.txt"
+# MANIFEST_URL: {"version", "url", "size", "sha256"}; indirilen EXE bu SHA-256 ile doğrulanır
+MANIFEST_URL = "https://raw.githubusercontent.com/belaliomer/hesap_defteri_update/refs/heads/main/manifest.json"
 # EXE_URL: GitHub Releases direct download link veya raw link to exe in repo
 EXE_URL = "https://github.com/belaliomer/hesap_defteri_update/releases/latest/download/hesap_defteri.exe"
 # Eğer EXE'yi raw dosya olarak tutuyorsan: raw.githubusercontent.com/.../hesap_defteri.exe
+# Yerel deneme: HESAP_UPDATE_URL=http://127.0.0.1:8000/ (bkz. update_server.py)
+_UPDATE_BASE = os.environ.get("HESAP_UPDATE_URL")
+if _UPDATE_BASE:
+    VERSION_URL = _UPDATE_BASE.rstrip("/") + "/version.txt"
+    MANIFEST_URL = _UPDATE_BASE.rstrip("/") + "/manifest.json"
+    EXE_URL = _UPDATE_BASE.rstrip("/") + "/hesap_defteri.exe"
+# Parça katalogları: inductors.csv / capacitors.csv (biçim: catalog.py)
+CATALOG_DIR = os.environ.get("HESAP_CATALOG_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(sys.argv[0] or __file__)), "katalog")
+# Tasarım deposu (kaydedilen tasarımlar, dalga formları, taramalar; biçim: design_store.py)
+STORE_DIR = os.environ.get("HESAP_STORE_DIR") or os.path.join(
+    os.path.dirname(os.path.abspath(sys.argv[0] or __file__)), "tasarimlar")
 # ---------- /AYARLAR ----------
 
-# ---------- yardımcı fonksiyonlar ----------
-try:
-    from scipy import signal
-    _HAS_SCIPY = True
-except Exception:
-    _HAS_SCIPY = False
-
-def triangle_wave(freq, t):
-    """Return triangle wave in range [-1,1] for frequency freq (Hz) at times t (seconds)."""
-    if _HAS_SCIPY:
-        return signal.sawtooth(2 * np.pi * freq * t, 0.5)
-    # fallback
-    period = 1.0 / freq
-    phase = (t % period) / period  # 0..1
-    tri = np.where(phase < 0.5, 4 * phase - 1, 3 - 4 * phase)
-    return tri
-
-def calc_timer_from_inputs(f_clk, f_pwm, psc_fix, arr_fix, psc_val_str, arr_val_str):
-    """Return integer PSC_calc, ARR_calc based on choices. PSC minimized (0) if none fixed."""
-    try:
-        f_clk = float(f_clk)
-        f_pwm = float(f_pwm)
-    except:
-        raise ValueError("f_clk veya f_pwm sayısal değil")
-    if f_pwm <= 0:
-        raise ValueError("PWM frekansı pozitif olmalı")
-    if psc_fix and not arr_fix:
-        PSC_calc = int(float(psc_val_str))
-        ARR_calc = int(max(0, round(f_clk / ((PSC_calc + 1) * f_pwm) - 1)))
-    elif arr_fix and not psc_fix:
-        ARR_calc = int(float(arr_val_str))
-        PSC_calc = int(max(0, round(f_clk / ((ARR_calc + 1) * f_pwm) - 1)))
-    else:
-        PSC_calc = 0
-        ARR_calc = int(max(0, round(f_clk / ((PSC_calc + 1) * f_pwm) - 1)))
-    return PSC_calc, ARR_calc
+# ---------- hesap çekirdeği ----------
+# Formüller GUI'siz calc_core modülünde; bu dosya sadece giriş okur, sonuç yazar ve çizer.
+# Tekrar eden çalışma noktaları (sonuç + dalga formu + simülasyon) calc_cache LRU
+# önbelleğinden gelir. Bu modüller (NumPy) ve matplotlib açılışı yavaşlatmasın diye
+# fonksiyon içinde import edilir; preload_backend() ilk çizimden sonra arka planda ısıtır.
+STARTUP_LOG = os.environ.get("HESAP_STARTUP_LOG")  # açılış sürelerini JSON satırı olarak ekle
+STARTUP = {}  # {"window": s, "backend": s, "interactive": s}  (_T_START'tan itibaren)
+EXIT_AFTER_STARTUP = bool(os.environ.get("HESAP_EXIT_AFTER_STARTUP"))  # benchmark: ölçünce kapan
+
+def preload_backend(f_clks=()):
+    """Ağır modülleri yükle ve verilen f_clk'ler için PSC/ARR tablolarını kur (thread-safe)."""
+    import importlib
+    for name in ("calc_cache", "plotting", "montecarlo", "losses", "matplotlib.figure", "matplotlib.backends.backend_tkagg"):
+        importlib.import_module(name)
+    import calc_core
+    calc_core._scipy_signal()  # scipy yoksa sessizce NumPy yedeğine düşer
+    from timer_solver import timer_table
+    for f_clk in f_clks:
+        timer_table(f_clk)
+    get_catalogs()
 
 # ---------- Güncelleme fonksiyonları ----------
+# Ağ işleri updater modülünde (requests gerekir; yoksa kontrol atlanır) ve worker
+# thread'inde çalışır; Tk sadece ana thread'ten, after() ile yoklanarak güncellenir.
+_update_client = None
+
+def get_update_client():
+    """Paylaşılan UpdateClient (ETag durumu + keep-alive oturumu); requests yoksa None."""
+    global _update_client
+    if _update_client is None:
+        import updater
+        if not updater.available():
+            return None
+        _update_client = updater.UpdateClient(VERSION_URL, MANIFEST_URL, EXE_URL)
+    return _update_client
+
 def check_update_available():
     """Kontrol et: online version ile local farklı mı? döner: remote_version veya None"""
-    if not _HAS_REQUESTS:
-        return None
     try:
-        r = requests.get(VERSION_URL, timeout=6)
-        r.raise_for_status()
-        remote_version = r.text.strip()
-        if remote_version != LOCAL_VERSION:
-            return remote_version
+        client = get_update_client()
+        if client is None:
+            return None
+        with PERF.stage("update.check"):
+            return client.check(LOCAL_VERSION)
     except Exception:
         return None
-    return None
+
+def launch_exe(new_exe_path):
+    """Doğrulanmış yeni exe'yi başlat ve mevcut süreci kapat."""
+    messagebox.showinfo("Güncelleme", "Yeni sürüm indirildi ve doğrulandı. Uygulama yeniden başlatılıyor.")
+    try:
+        if sys.platform.startswith("win"):
+            # On Windows, simply start exe
+            subprocess.Popen([new_exe_path], shell=False)
+        else:
+            # Unix-like
+            subprocess.Popen([new_exe_path])
+    except Exception as e:
+        messagebox.showerror("Başlatma Hatası", f"Yeni exe başlatılamadı: {e}")
+    # Exit current process
+    sys.exit(0)
 
 def download_and_launch_exe(remote_version):
-    """EXE'yi indir ve çalıştır. Yeni exe'yi temp'e indirir, çalıştırır ve mevcut süreci kapatır."""
-    if not _HAS_REQUESTS:
+    """Yeni sürümü arka planda kur (ilerleme + iptal), doğrula ve çalıştır.
+
+    Donmuş EXE'de kurulu dosyaya yama zinciri uygulanır; zincir yoksa tam EXE indirilir.
+    """
+    client = get_update_client()
+    if client is None:
         messagebox.showerror("Güncelleme Hatası", "requests modülü yüklü değil; güncelleme yapılamıyor.")
         return
-    try:
-        # show small info
-        dlg = tk.Toplevel()
-        dlg.title("Güncelleme")
-        ttk.Label(dlg, text="Yeni sürüm indiriliyor, lütfen bekleyin...").pack(padx=20, pady=20)
-        dlg.update()
-
-        resp = requests.get(EXE_URL, stream=True, timeout=30)
-        resp.raise_for_status()
-        temp_dir = tempfile.gettempdir()
-        filename = f"hesap_defteri_v{remote_version}.exe"
-        new_exe_path = os.path.join(temp_dir, filename)
-        with open(new_exe_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-        dlg.destroy()
-        messagebox.showinfo("Güncelleme", "Yeni sürüm indirildi. Uygulama yeniden başlatılıyor.")
-        # Launch new exe
+    import updater
+
+    dlg = tk.Toplevel()
+    dlg.title("Güncelleme")
+    msg_var = tk.StringVar(value=f"Sürüm {remote_version} indiriliyor...")
+    ttk.Label(dlg, textvariable=msg_var).pack(padx=20, pady=(20, 8))
+    bar = ttk.Progressbar(dlg, length=360, mode="determinate", maximum=1.0)
+    bar.pack(padx=20, pady=4)
+    cancel = threading.Event()
+    ttk.Button(dlg, text="İptal", command=cancel.set).pack(pady=(8, 16))
+    dlg.protocol("WM_DELETE_WINDOW", cancel.set)
+
+    state = {"done": 0, "total": None, "path": None, "error": None, "finished": False}
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        state["done"], state["total"] = done, total
+
+    def worker():
         try:
-            if sys.platform.startswith("win"):
-                # On Windows, simply start exe
-                subprocess.Popen([new_exe_path], shell=False)
-            else:
-                # Unix-like
-                subprocess.Popen([new_exe_path])
+            base = sys.executable if getattr(sys, "frozen", False) else None
+            with PERF.stage("update.download"):
+                state["path"] = client.update(client.manifest(), LOCAL_VERSION, base_path=base,
+                                              progress=progress, cancel_event=cancel)
         except Exception as e:
-            messagebox.showerror("Başlatma Hatası", f"Yeni exe başlatılamadı: {e}")
-        # Exit current process
-        sys.exit(0)
-    except Exception as e:
-        messagebox.showerror("Güncelleme Hatası", f"Güncelleme indirilemedi: {e}")
-
-def check_and_prompt_update_blocking(root_widget):
-    """Bloklayıcı: açılışta çağrılırsa GUI başlamadan popup gösterir.
-       Eğer kullanıcı 'Evet' derse indir ve çalıştır; 'Hayır' derse devam et."""
-    remote = check_update_available()
-    if remote:
-        # küçük bir modal popup
-        try:
-            answer = messagebox.askyesno("Güncelleme Mevcut",
-                                         f"Güncel sürüm {remote} bulundu.\nGüncellemek ister misiniz?")
-            if answer:
-                download_and_launch_exe(remote)
-                # function exits process if successful
-        except Exception:
-            pass
+            state["error"] = e
+        state["finished"] = True
+
+    def poll():
+        done, total = state["done"], state["total"]
+        rate = done / max(time.perf_counter() - t0, 1e-3)
+        kind = {"delta": " (yama)", "full": " (tam)"}.get(client.last_method, "")
+        if total:
+            bar["value"] = done / total
+            msg_var.set(f"Sürüm {remote_version}{kind}: {done/2**20:.2f} / {total/2**20:.2f} MB ({rate/2**20:.2f} MB/s)")
+        else:
+            msg_var.set(f"Sürüm {remote_version}{kind}: {done/2**20:.2f} MB ({rate/2**20:.2f} MB/s)")
+        if not state["finished"]:
+            dlg.after(100, poll)
+            return
+        dlg.destroy()
+        err = state["error"]
+        if isinstance(err, updater.UpdateCancelled):
+            messagebox.showinfo("Güncelleme", "İndirme iptal edildi; bir sonraki denemede kaldığı yerden devam eder.")
+        elif err is not None:
+            messagebox.showerror("Güncelleme Hatası", f"Güncelleme indirilemedi: {err}")
+        else:
+            launch_exe(state["path"])
+
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
 
 # ---------- GUI: scrollable frame helper ----------
 class ScrollableFrame(ttk.Frame):
@@ -159,6 +184,25 @@ class ScrollableFrame(ttk.Frame):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
+# ---------- GUI: sürükleme olaylarını birleştirici ----------
+class Coalescer:
+    """Art arda gelen çağrıları tek bir after() işinde birleştirir.
+
+    Slider sürüklenirken her olay yeni hesap kuyruğa eklemez; bekleyen iş varsa
+    yeni çağrı yok sayılır ve iş çalıştığında en güncel değeri okur.
+    """
+    def __init__(self, widget, fn, delay_ms=15):
+        self.widget, self.fn, self.delay_ms = widget, fn, delay_ms
+        self._job = None
+
+    def __call__(self, *args):
+        if self._job is None:
+            self._job = self.widget.after(self.delay_ms, self._run)
+
+    def _run(self):
+        self._job = None
+        self.fn()
+
 # ---------- Pencere ve stil ----------
 root = tk.Tk()
 root.title("Elektronik Hesap Makinesi - Boost / Buck / Flyback")
@@ -176,9 +220,20 @@ style.configure("TNotebook.Tab", font=("Segoe UI", FONT_BASE+1))
 notebook = ttk.Notebook(root)
 notebook.pack(fill="both", expand=True, padx=8, pady=6)
 
+status_var = tk.StringVar(value="Yükleniyor...")
+status_bar = tk.Frame(root)
+status_bar.pack(side="bottom", fill="x", padx=8)
+btn_diag = tk.Button(status_bar, text="Tanılama (F12)", font=("Segoe UI", FONT_BASE-4), relief="flat")
+btn_diag.pack(side="right")
+btn_store = tk.Button(status_bar, text="Tasarımlar...", font=("Segoe UI", FONT_BASE-4), relief="flat")
+btn_store.pack(side="right")
+tk.Label(status_bar, textvariable=status_var, anchor="w", font=("Segoe UI", FONT_BASE-3)).pack(side="left", fill="x", expand=True)
+
 # helper to create matplotlib canvas
 def make_canvas(master, figsize=(8,4.5)):
-    fig = plt.Figure(figsize=figsize, dpi=100)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    fig = Figure(figsize=figsize, dpi=100)
     canvas = FigureCanvasTkAgg(fig, master=master)
     canvas.get_tk_widget().pack(side="bottom", fill="both", expand=True)
     return fig, canvas
@@ -190,6 +245,103 @@ def add_entry(parent, label, default):
     e.pack(anchor="w", pady=(0,6))
     return e
 
+def add_mc_controls(parent):
+    """Monte Carlo tolerans girişleri (örnek sayısı + parametre başına %)."""
+    tk.Label(parent, text="Monte Carlo (tolerans / yield)", font=TITLE_FONT).pack(anchor="w", pady=(6,6))
+    return {"n": add_entry(parent, "Örnek sayısı:", 100000),
+            "seed": add_entry(parent, "Seed:", 1),
+            "L": add_entry(parent, "L tol (±%):", 20),
+            "C": add_entry(parent, "C tol (±%):", 20),
+            "C_age": add_entry(parent, "C yaşlanma (%):", -10),
+            "Vin": add_entry(parent, "Vin tol (3σ %):", 5),
+            "Iout": add_entry(parent, "Iout tol (±%):", 10)}
+
+def add_loss_controls(parent):
+    """Kayıp modeli parametreleri (MOSFET / diyot / manyetik / kondansatör)."""
+    tk.Label(parent, text="Kayıp modeli (verim)", font=TITLE_FONT).pack(anchor="w", pady=(6,6))
+    return {"Rds_on": add_entry(parent, "MOSFET Rds_on (mΩ):", 20),
+            "t_sw": add_entry(parent, "MOSFET t_r + t_f (ns):", 30),
+            "Qg": add_entry(parent, "MOSFET Qg (nC):", 40),
+            "Coss": add_entry(parent, "MOSFET Coss (pF):", 300),
+            "Vf": add_entry(parent, "Diyot Vf (V):", 0.6),
+            "Qrr": add_entry(parent, "Diyot Qrr (nC):", 50),
+            "DCR": add_entry(parent, "Bobin DCR (mΩ):", 10),
+            "ESR": add_entry(parent, "Cout ESR (mΩ):", 30),
+            "N": add_entry(parent, "Sarım sayısı N:", 20),
+            "Ae": add_entry(parent, "Çekirdek Ae (mm²):", 100),
+            "Ve": add_entry(parent, "Çekirdek Ve (mm³):", 5000),
+            "steinmetz": add_entry(parent, "Steinmetz k, α, β:", "2.5, 1.4, 2.5")}
+
+OPT_OBJECTIVES = {"kayıp": "loss", "hacim": "volume", "maliyet": "cost"}
+
+def add_opt_controls(parent, flyback=False):
+    """Otomatik tasarım girişleri; aralıklar "min, maks" biçiminde (boş = nominalden)."""
+    tk.Label(parent, text="Otomatik tasarım (optimizasyon)", font=TITLE_FONT).pack(anchor="w", pady=(6,6))
+    d = {"Vin": add_entry(parent, "Vin aralığı (V) [boş: ±%10]:", ""),
+         "Iout": add_entry(parent, "Iout aralığı (A) [boş: %10-%100]:", ""),
+         "f": add_entry(parent, "f aralığı (kHz):", "5, 200"),
+         "L": add_entry(parent, "Lm aralığı (µH):" if flyback else "L aralığı (µH):", "1, 10000")}
+    if flyback:
+        d["nsnp"] = add_entry(parent, "Ns/Np aralığı:", "0.2, 5")
+    tk.Label(parent, text="Amaç:", font=LABEL_FONT).pack(anchor="w")
+    d["objective"] = tk.StringVar(value="kayıp")
+    ttk.Combobox(parent, textvariable=d["objective"], values=list(OPT_OBJECTIVES),
+                 state="readonly", font=LABEL_FONT).pack(anchor="w", pady=(0,6))
+    return d
+
+BODE_KINDS = {"yok": None, "Tip II": "II", "Tip III": "III"}
+
+def add_bode_controls(parent):
+    """Küçük sinyal / kompanzatör girişleri (PWM modülatörü, geri besleme, tasarım hedefi)."""
+    tk.Label(parent, text="Küçük sinyal (Bode / kompanzatör)", font=TITLE_FONT).pack(anchor="w", pady=(6,6))
+    tk.Label(parent, text="Kompanzatör:", font=LABEL_FONT).pack(anchor="w")
+    d = {"kind": tk.StringVar(value="Tip III")}
+    ttk.Combobox(parent, textvariable=d["kind"], values=list(BODE_KINDS),
+                 state="readonly", font=LABEL_FONT).pack(anchor="w", pady=(0,6))
+    d.update(pm_min=add_entry(parent, "Min. faz payı (°):", 45),
+             Vm=add_entry(parent, "PWM rampa Vm (V):", 1.0),
+             H=add_entry(parent, "Geri besleme H [boş: 2.5 V / Vout]:", ""),
+             delay=add_entry(parent, "Gecikme (periyot) [dijital ≈ 1.5]:", 0),
+             R1=add_entry(parent, "R1 (kΩ):", 10))
+    return d
+
+def add_wave_controls(parent):
+    """Tam çözünürlüklü uzun simülasyon (soft-start + isteğe bağlı yük basamağı)."""
+    tk.Label(parent, text="Uzun dalga formu (tam çözünürlük)", font=TITLE_FONT).pack(anchor="w", pady=(6,6))
+    return {"cycles": add_entry(parent, "Periyot sayısı:", 3000),
+            "ppc": add_entry(parent, "Örnek / periyot:", 200),
+            "soft": add_entry(parent, "Soft-start (periyot):", 300),
+            "step": add_entry(parent, "Yük basamağı (ms, A) [boş: yok]:", "")}
+
+class LazyTab:
+    """Sekmenin figürü ilk ihtiyaçta kurulur; ilk hesap sekme ilk seçildiğinde çalışır."""
+    def __init__(self, fig_frame, title_i, title_v, color):
+        self.fig_frame = fig_frame
+        self.titles = (title_i, title_v)
+        self.color = color
+        self.first_calc = None
+        self.activated = False
+        self._plot = None
+
+    @property
+    def plot(self):
+        if self._plot is None:
+            from plotting import WaveformPlot
+            fig, canvas = make_canvas(self.fig_frame)
+            self._plot = WaveformPlot(fig, canvas, *self.titles, self.color, font_base=FONT_BASE)
+        return self._plot
+
+    def activate(self):
+        """İlk seçilişte bir kez: figürü kur ve varsayılanlarla hesapla."""
+        if self.activated:
+            return False
+        self.activated = True
+        if self.first_calc is not None:
+            self.first_calc()
+        else:
+            self.plot
+        return True
+
 # ---------- BOOST SEKME ----------
 frame_boost = ttk.Frame(notebook)
 notebook.add(frame_boost, text="Boost")
@@ -224,13 +376,34 @@ var_b_ARR_fix = tk.BooleanVar()
 tk.Checkbutton(left_b, text="ARR Sabit Tut", variable=var_b_ARR_fix, font=LABEL_FONT).pack(anchor="w")
 entry_b_ARR = tk.Entry(left_b, font=LABEL_FONT); entry_b_ARR.pack(anchor="w", pady=(0,10))
 
+loss_b = add_loss_controls(left_b)
 btn_b_calc = tk.Button(left_b, text="Hesapla (Boost)", font=LABEL_FONT)
-btn_b_calc.pack(pady=(6,12))
+btn_b_calc.pack(pady=(6,6))
+btn_b_save = tk.Button(left_b, text="Tasarımı kaydet", font=LABEL_FONT)
+btn_b_save.pack(pady=(0,12))
+btn_b_sim = tk.Button(left_b, text="Simülasyon (soft-start)", font=LABEL_FONT)
+btn_b_sim.pack(pady=(0,12))
+wave_b = add_wave_controls(left_b)
+btn_b_wave = tk.Button(left_b, text="Uzun dalga formu", font=LABEL_FONT)
+btn_b_wave.pack(pady=(0,6))
+btn_b_capture = tk.Button(left_b, text="Yakalama aç (CSV / NPZ)...", font=LABEL_FONT)
+btn_b_capture.pack(pady=(0,12))
+mc_b = add_mc_controls(left_b)
+btn_b_mc = tk.Button(left_b, text="Monte Carlo", font=LABEL_FONT)
+btn_b_mc.pack(pady=(0,12))
+btn_b_effmap = tk.Button(left_b, text="Verim haritası (Vin × Iout × f)", font=LABEL_FONT)
+btn_b_effmap.pack(pady=(0,12))
+opt_b = add_opt_controls(left_b)
+btn_b_opt = tk.Button(left_b, text="Optimize et", font=LABEL_FONT)
+btn_b_opt.pack(pady=(0,12))
+bode_b = add_bode_controls(left_b)
+btn_b_bode = tk.Button(left_b, text="Bode / kompanzatör", font=LABEL_FONT)
+btn_b_bode.pack(pady=(0,12))
 
 tk.Label(right_b, text="Boost - Sonuçlar", font=TITLE_FONT).pack(anchor="w")
 out_b_text = tk.Text(right_b, width=50, height=28, font=MONO_FONT)
 out_b_text.pack()
-fig_b, canvas_b = make_canvas(fig_frame_b)
+tab_b = LazyTab(fig_frame_b, "Bobin Akımı (IL) - Boost", "Çıkış Gerilimi (Vout) - Boost", "red")
 
 # ---------- BUCK SEKME ----------
 frame_buck = ttk.Frame(notebook)
@@ -265,13 +438,34 @@ var_k_ARR_fix = tk.BooleanVar()
 tk.Checkbutton(left_k, text="ARR Sabit Tut", variable=var_k_ARR_fix, font=LABEL_FONT).pack(anchor="w")
 entry_k_ARR = tk.Entry(left_k, font=LABEL_FONT); entry_k_ARR.pack(anchor="w", pady=(0,10))
 
+loss_k = add_loss_controls(left_k)
 btn_k_calc = tk.Button(left_k, text="Hesapla (Buck)", font=LABEL_FONT)
-btn_k_calc.pack(pady=(6,12))
+btn_k_calc.pack(pady=(6,6))
+btn_k_save = tk.Button(left_k, text="Tasarımı kaydet", font=LABEL_FONT)
+btn_k_save.pack(pady=(0,12))
+btn_k_sim = tk.Button(left_k, text="Simülasyon (soft-start)", font=LABEL_FONT)
+btn_k_sim.pack(pady=(0,12))
+wave_k = add_wave_controls(left_k)
+btn_k_wave = tk.Button(left_k, text="Uzun dalga formu", font=LABEL_FONT)
+btn_k_wave.pack(pady=(0,6))
+btn_k_capture = tk.Button(left_k, text="Yakalama aç (CSV / NPZ)...", font=LABEL_FONT)
+btn_k_capture.pack(pady=(0,12))
+mc_k = add_mc_controls(left_k)
+btn_k_mc = tk.Button(left_k, text="Monte Carlo", font=LABEL_FONT)
+btn_k_mc.pack(pady=(0,12))
+btn_k_effmap = tk.Button(left_k, text="Verim haritası (Vin × Iout × f)", font=LABEL_FONT)
+btn_k_effmap.pack(pady=(0,12))
+opt_k = add_opt_controls(left_k)
+btn_k_opt = tk.Button(left_k, text="Optimize et", font=LABEL_FONT)
+btn_k_opt.pack(pady=(0,12))
+bode_k = add_bode_controls(left_k)
+btn_k_bode = tk.Button(left_k, text="Bode / kompanzatör", font=LABEL_FONT)
+btn_k_bode.pack(pady=(0,12))
 
 tk.Label(right_k, text="Buck - Sonuçlar", font=TITLE_FONT).pack(anchor="w")
 out_k_text = tk.Text(right_k, width=50, height=28, font=MONO_FONT)
 out_k_text.pack()
-fig_k, canvas_k = make_canvas(fig_frame_k)
+tab_k = LazyTab(fig_frame_k, "Bobin Akımı (IL) - Buck", "Çıkış Gerilimi (Vout) - Buck", "red")
 
 # ---------- FLYBACK SEKME ----------
 frame_f = ttk.Frame(notebook)
@@ -290,237 +484,1418 @@ entry_f_f = add_entry(left_f, "Frekans (kHz):", 50)
 entry_f_Lm = add_entry(left_f, "Lm (µH) (primer):", 100)
 entry_f_nsnp = add_entry(left_f, "Ns/Np (sec/prim):", 1.0)
 entry_f_Iout = add_entry(left_f, "Iout (A):", 10.0)
+entry_f_C = add_entry(left_f, "Cout (µF):", 470)
 entry_f_ripI = add_entry(left_f, "Tolerans ΔI (%):", 30)
 entry_f_ripV = add_entry(left_f, "Tolerans ΔV (%):", 5)
 
+loss_f = add_loss_controls(left_f)
 btn_f_calc = tk.Button(left_f, text="Hesapla (Flyback)", font=LABEL_FONT)
-btn_f_calc.pack(pady=(8,12))
+btn_f_calc.pack(pady=(8,6))
+btn_f_save = tk.Button(left_f, text="Tasarımı kaydet", font=LABEL_FONT)
+btn_f_save.pack(pady=(0,12))
+btn_f_sim = tk.Button(left_f, text="Simülasyon (soft-start)", font=LABEL_FONT)
+btn_f_sim.pack(pady=(0,12))
+wave_f = add_wave_controls(left_f)
+btn_f_wave = tk.Button(left_f, text="Uzun dalga formu", font=LABEL_FONT)
+btn_f_wave.pack(pady=(0,6))
+btn_f_capture = tk.Button(left_f, text="Yakalama aç (CSV / NPZ)...", font=LABEL_FONT)
+btn_f_capture.pack(pady=(0,12))
+mc_f = add_mc_controls(left_f)
+btn_f_mc = tk.Button(left_f, text="Monte Carlo", font=LABEL_FONT)
+btn_f_mc.pack(pady=(0,12))
+btn_f_effmap = tk.Button(left_f, text="Verim haritası (Vin × Iout × f)", font=LABEL_FONT)
+btn_f_effmap.pack(pady=(0,12))
+opt_f = add_opt_controls(left_f, flyback=True)
+btn_f_opt = tk.Button(left_f, text="Optimize et", font=LABEL_FONT)
+btn_f_opt.pack(pady=(0,12))
+bode_f = add_bode_controls(left_f)
+btn_f_bode = tk.Button(left_f, text="Bode / kompanzatör", font=LABEL_FONT)
+btn_f_bode.pack(pady=(0,12))
 
 tk.Label(right_f, text="Flyback - Sonuçlar", font=TITLE_FONT).pack(anchor="w")
 out_f_text = tk.Text(right_f, width=50, height=28, font=MONO_FONT)
 out_f_text.pack()
-fig_f, canvas_f = make_canvas(fig_frame_f)
+tab_f = LazyTab(fig_frame_f, "Primer Bobin Akımı (approx) - Flyback", "Sekonder Gerilim (approx) - Flyback", "green")
 
-# ---------- Hesaplama fonksiyonları (tam hali) ----------
-def do_boost_calc():
-    try:
-        Vin = float(entry_b_vin.get()); Vout = float(entry_b_vout.get())
-        freq = float(entry_b_f.get()) * 1e3
-        L = float(entry_b_L.get()) * 1e-6
-        C = float(entry_b_C.get()) * 1e-6
-        ripI_pct = float(entry_b_ripI.get()) / 100.0
-        ripV_pct = float(entry_b_ripV.get()) / 100.0
-        Iout = float(slider_b_Iout.get())
-
-        if Vout <= Vin:
-            messagebox.showerror("Hata", "Boost için Vout > Vin olmalı.")
-            return
+# ---------- Hesaplama fonksiyonları (GUI istemcisi; formüller calc_core'da) ----------
+def _timer_pins(fix_var_psc, fix_var_arr, entry_psc, entry_arr):
+    """Checkbox durumuna göre sabit tutulacak PSC / ARR değerlerini döndür (None = serbest)."""
+    psc_fix, arr_fix = fix_var_psc.get(), fix_var_arr.get()
+    psc = float(entry_psc.get()) if psc_fix and not arr_fix else None
+    arr = float(entry_arr.get()) if arr_fix and not psc_fix else None
+    return psc, arr
 
-        D = 1.0 - Vin / Vout
-        if D <= 0:
-            messagebox.showerror("Hata", "Hesaplanan duty negatif veya sıfır; parametreleri kontrol edin.")
-            return
-
-        delta_IL = (Vin * D) / (L * freq)
-        # daha gerçekçi ΔV ~ ΔIL/(8 f C) varsayımı kullanıldı (yaklaşık)
-        delta_Vout = delta_IL / (8.0 * freq * C) if C > 0 else float('inf')
-        IL_avg = Iout / (1.0 - D) if (1.0 - D) != 0 else float('inf')
-        IL_min = IL_avg - delta_IL/2.0
-        mode = "CCM" if IL_min > 0 else "DCM"
+def _parse_fclk(entry):
+    try:
+        return float(entry.get())
+    except ValueError:
+        raise ValueError("f_clk veya f_pwm sayısal değil")
 
-        # önerilen min L,C (toleranslara göre)
-        delta_IL_max = ripI_pct * Iout
-        delta_V_max = ripV_pct * Vout
-        L_min = (Vin * D) / (delta_IL_max * freq) if delta_IL_max > 0 else float('inf')
-        C_min = delta_IL_max / (8.0 * freq * delta_V_max) if delta_V_max > 0 else float('inf')
+def _boost_inputs():
+    psc, arr = _timer_pins(var_b_PSC_fix, var_b_ARR_fix, entry_b_PSC, entry_b_ARR)
+    return dict(Vin=float(entry_b_vin.get()), Vout=float(entry_b_vout.get()),
+                freq=float(entry_b_f.get()) * 1e3,
+                L=float(entry_b_L.get()) * 1e-6, C=float(entry_b_C.get()) * 1e-6,
+                Iout=float(slider_b_Iout.get()),
+                ripI_pct=float(entry_b_ripI.get()) / 100.0, ripV_pct=float(entry_b_ripV.get()) / 100.0,
+                f_clk=_parse_fclk(entry_b_fclk), psc=psc, arr=arr)
+
+def _buck_inputs():
+    psc, arr = _timer_pins(var_k_PSC_fix, var_k_ARR_fix, entry_k_PSC, entry_k_ARR)
+    return dict(Vin=float(entry_k_vin.get()), Vout=float(entry_k_vout.get()),
+                freq=float(entry_k_f.get()) * 1e3,
+                L=float(entry_k_L.get()) * 1e-6, C=float(entry_k_C.get()) * 1e-6,
+                Iout=float(slider_k_Iout.get()),
+                ripI_val=float(entry_k_ripI.get()), ripV_val=float(entry_k_ripV.get()),
+                f_clk=_parse_fclk(entry_k_fclk), psc=psc, arr=arr)
+
+def _fly_inputs():
+    return dict(Vin=float(entry_f_vin.get()), Vout=float(entry_f_vout.get()),
+                freq=float(entry_f_f.get()) * 1e3,
+                Lm=float(entry_f_Lm.get()) * 1e-6, nsnp=float(entry_f_nsnp.get()),
+                Iout=float(entry_f_Iout.get()),
+                ripI_pct=float(entry_f_ripI.get()) / 100.0, ripV_pct=float(entry_f_ripV.get()) / 100.0,
+                C=float(entry_f_C.get()) * 1e-6)
+
+LOSS_ENTRIES = {"boost": loss_b, "buck": loss_k, "flyback": loss_f}
+OPT_ENTRIES = {"boost": opt_b, "buck": opt_k, "flyback": opt_f}
+BODE_ENTRIES = {"boost": bode_b, "buck": bode_k, "flyback": bode_f}
+WAVE_ENTRIES = {"boost": wave_b, "buck": wave_k, "flyback": wave_f}
+B_SAT_WARN = 0.3  # T, ferrit için kabaca doyma sınırı (optimizer.DesignSpec.B_max ile aynı)
+
+def _loss_params(entries):
+    from losses import LossParams
+    num = lambda name, scale=1.0: float(entries[name].get()) * scale
+    k, alpha, beta = (float(x) for x in entries["steinmetz"].get().replace(";", ",").split(","))
+    return LossParams(Rds_on=num("Rds_on", 1e-3), t_sw=num("t_sw", 1e-9), Coss=num("Coss", 1e-12),
+                      Qg=num("Qg", 1e-9), Vf=num("Vf"), Qrr=num("Qrr", 1e-9), DCR=num("DCR", 1e-3),
+                      ESR=num("ESR", 1e-3), N=num("N"), Ae=num("Ae", 1e-6), Ve=num("Ve", 1e-9),
+                      k_core=k, alpha=alpha, beta=beta)
+
+def _apply_losses(topology, inp):
+    """Kayıp modelinden verimi bul, girişlere eff olarak ekle; LossBreakdown döndür."""
+    from calc_cache import cached_calc
+    from losses import efficiency
+    # önce kayıpsız hesap: geçersiz girişlerde calc_core'un kendi mesajı gösterilsin
+    # (ör. "Boost için Vout > Vin olmalı."), kayıp modelinin genel hatası değil
+    cached_calc(topology, **dict(inp, eff=1.0))
+    lb = efficiency(topology, inp, _loss_params(LOSS_ENTRIES[topology]))
+    inp["eff"] = lb.eff
+    return lb
+
+def _sim_loss_kw(topology, r, lb):
+    """Simülasyona kayıplı çalışma noktası: duty = r.D (η ile) ve toplam kaybı ortalama
+    bobin akımında harcayan eşdeğer seri direnç (DCR dahil tüm kayıplar tek rL'de)."""
+    I_mean = r.IL_avg / r.D if topology == "flyback" else r.IL_avg  # flyback: mıknatıslama akımı
+    return dict(duty=r.D, rL=lb.P_total / I_mean ** 2 if I_mean > 0 else 0.0)
+
+def _loss_lines(lb):
+    lines = [f"Verim η = {lb.eff*100:.2f} % (kayıp {lb.P_total:.3f} W, Pin {lb.Pout + lb.P_total:.2f} W)\n",
+             f" - iletim {lb.P_cond:.3f} W, anahtarlama {lb.P_sw:.3f} W, sürücü {lb.P_gate:.3f} W\n",
+             f" - diyot {lb.P_diode:.3f} W, bakır {lb.P_cu:.3f} W, ESR {lb.P_esr:.3f} W\n",
+             f" - çekirdek {lb.P_core:.3f} W (B̂ = {lb.B_pk*1e3:.0f} mT)\n",
+             f"Giriş akımı (ort.) ≈ {lb.Iin:.3f} A\n"]
+    if lb.B_pk > B_SAT_WARN:
+        lines.append(f"(Uyarı: B̂ > {B_SAT_WARN*1e3:.0f} mT, çekirdek doymaya yakın; N veya Ae artırın.)\n")
+    return "".join(lines) + "\n"
+
+def _set_entry(entry, value):
+    entry.delete(0, tk.END); entry.insert(0, str(value))
+
+def _timer_lines(tr, n_alt=4, min_gain_bits=0.1):
+    """Gerçek PWM frekansı + hata/çözünürlük Pareto alternatifleri (önbellekli)."""
+    lines = [f"Timer: PSC={tr.psc}, ARR={tr.arr}\n",
+             f"PWM f (gerçek) = {tr.f_actual:.3f} Hz (hata {tr.error*100:+.4f} %)\n"]
+    # ARR'yi birer birer artıran basamakları atla; sadece anlamlı çözünürlük kazancı göster
+    alts, bits = [], tr.resolution_bits
+    from timer_solver import pareto_options
+    for o in pareto_options(tr.f_clk, tr.f_pwm):
+        if o.resolution_bits >= bits + min_gain_bits:
+            alts.append(o); bits = o.resolution_bits
+    if alts:
+        lines.append("Alternatif PSC/ARR (hata / çözünürlük):\n")
+        for o in alts[:n_alt]:
+            lines.append(f" - PSC={o.psc}, ARR={o.arr}: {o.error*100:+.4f} %, {o.resolution_bits:.1f} bit\n")
+    return "".join(lines)
+
+_catalogs = None
+_catalog_lock = threading.Lock()
+CATALOG_TOP_N = 3
+
+def get_catalogs():
+    """(bobin, kondansatör) katalogları; dosya yoksa ilgili eleman None. Bir kez yüklenir."""
+    global _catalogs
+    with _catalog_lock:
+        if _catalogs is None:
+            from catalog import Catalog
+            cats = []
+            for name in ("inductors.csv", "capacitors.csv"):
+                path = os.path.join(CATALOG_DIR, name)
+                try:
+                    cats.append(Catalog.from_csv(path).build_indexes() if os.path.isfile(path) else None)
+                except Exception:
+                    cats.append(None)  # bozuk katalog hesapları engellemesin
+            _catalogs = tuple(cats)
+        return _catalogs
+
+def _catalog_lines(topology, r, inputs, top_n=CATALOG_TOP_N):
+    """Katalogdan ilk N uygun bobin / kondansatör (hacme göre); katalog yoksa boş."""
+    from catalog import match_inductors, match_capacitors
+    ind, cap = get_catalogs()
+    lines = []
+    if ind is not None:
+        lines.append("Katalog - bobin (L ≥ L_min, Isat ≥ Ipk, hacim artan):\n")
+        hits = match_inductors(ind, topology, r, top_n)
+        for h in hits:
+            v = h.values
+            lines.append(f" - {h.part}: {v['L']*1e6:.1f} µH, Isat {v.get('Isat', float('nan')):.1f} A "
+                         f"(Ipk {h.peak:.2f} A), {v.get('volume', float('nan')):.0f} mm³\n")
+        if not hits:
+            lines.append(" - uygun parça yok\n")
+    if cap is not None:
+        lines.append("Katalog - kondansatör (C ≥ C_min, ESR dahil ΔVout):\n")
+        hits = match_capacitors(cap, topology, r, inputs, top_n)
+        for h in hits:
+            v = h.values
+            lines.append(f" - {h.part}: {v['C']*1e6:.0f} µF / {v.get('V', float('nan')):.0f} V, "
+                         f"ESR {v.get('ESR', float('nan'))*1e3:.0f} mΩ -> ΔVout {h.delta_Vout:.4f} V, "
+                         f"{v.get('volume', float('nan')):.0f} mm³\n")
+        if not hits:
+            lines.append(" - uygun parça yok\n")
+    return "".join(lines) + ("\n" if lines else "")
+
+def _show_waveforms(plot, topology, res, title_i, title_v):
+    from calc_cache import cached_waveforms
+    with PERF.stage("plot.waveforms"):
+        t, IL_wave, V_wave = cached_waveforms(topology, res)
+    plot.update(t * 1e6, [IL_wave], V_wave, title_i, title_v, "Zaman (µs)")
+
+def do_boost_calc(live=False):
+    from calc_cache import cached_calc
+    cyc = PERF.cycle("boost")
+    try:
+        inp = _boost_inputs()
+        cyc.lap("parse")
+        lb = _apply_losses("boost", inp)
+        cyc.lap("losses")
+        r = cached_calc("boost", **inp)
+        cyc.lap("math")
 
         # timer
-        PSC_calc, ARR_calc = calc_timer_from_inputs(entry_b_fclk.get(), freq, var_b_PSC_fix.get(), var_b_ARR_fix.get(), entry_b_PSC.get(), entry_b_ARR.get())
-        entry_b_PSC.delete(0, tk.END); entry_b_PSC.insert(0, str(PSC_calc))
-        entry_b_ARR.delete(0, tk.END); entry_b_ARR.insert(0, str(ARR_calc))
+        _set_entry(entry_b_PSC, r.timer.psc)
+        _set_entry(entry_b_ARR, r.timer.arr)
 
         # sonuç yaz
         out_b_text.configure(state="normal"); out_b_text.delete("1.0", tk.END)
         out_b_text.insert(tk.END, f"--- Girilen (Boost) ---\n")
-        out_b_text.insert(tk.END, f"Vin={Vin} V, Vout={Vout} V, f={freq/1e3} kHz\n")
-        out_b_text.insert(tk.END, f"L={L*1e6:.1f} µH, Cout={C*1e6:.1f} µF, Iout={Iout:.3f} A\n\n")
-        out_b_text.insert(tk.END, f"Duty D = {D:.5f}\n")
-        out_b_text.insert(tk.END, f"IL(avg) ≈ {IL_avg:.3f} A\n")
-        out_b_text.insert(tk.END, f"ΔIL (ideal anlık) = {delta_IL:.3f} A\n")
-        out_b_text.insert(tk.END, f"ΔVout (approx) = {delta_Vout:.5f} V\n")
-        out_b_text.insert(tk.END, f"Çalışma modu: {mode}\n\n")
-        out_b_text.insert(tk.END, f"Önerilen minimum L = {L_min*1e6:.2f} µH\n")
-        out_b_text.insert(tk.END, f"Önerilen minimum C = {C_min*1e6:.2f} µF\n\n")
+        out_b_text.insert(tk.END, f"Vin={r.Vin} V, Vout={r.Vout} V, f={r.freq/1e3} kHz\n")
+        out_b_text.insert(tk.END, f"L={r.L*1e6:.1f} µH, Cout={r.C*1e6:.1f} µF, Iout={r.Iout:.3f} A\n\n")
+        out_b_text.insert(tk.END, f"Duty D = {r.D:.5f} (η = {r.eff*100:.2f} % ile)\n")
+        out_b_text.insert(tk.END, f"IL(avg) ≈ {r.IL_avg:.3f} A\n")
+        out_b_text.insert(tk.END, f"ΔIL (ideal anlık) = {r.delta_IL:.3f} A\n")
+        out_b_text.insert(tk.END, f"ΔVout (approx) = {r.delta_Vout:.5f} V\n")
+        out_b_text.insert(tk.END, f"Çalışma modu: {r.mode}\n\n")
+        out_b_text.insert(tk.END, _loss_lines(lb))
+        out_b_text.insert(tk.END, f"Önerilen minimum L = {r.L_min*1e6:.2f} µH\n")
+        out_b_text.insert(tk.END, f"Önerilen minimum C = {r.C_min*1e6:.2f} µF\n\n")
+        out_b_text.insert(tk.END, _catalog_lines("boost", r, inp))
+        out_b_text.insert(tk.END, _timer_lines(r.timer) + "\n")
         out_b_text.insert(tk.END, "Dipnot (AMC sensor önerileri):\n")
         out_b_text.insert(tk.END, " - AMC1350 için: voltage divider 330k & 10k.\n")
         out_b_text.insert(tk.END, " - AMC1200 için: voltage divider 330k & 470Ω.\n")
         out_b_text.insert(tk.END, "\n(Not: ΔIL anlık duty sıçramaları içindir; PID/soft-start gerçek ripple'ı düşürür.)\n")
         out_b_text.configure(state="disabled")
+        cyc.lap("text")
 
         # grafik çizimi (4 periyot göster)
-        fig_b.clf()
-        ax1 = fig_b.add_subplot(211); ax2 = fig_b.add_subplot(212)
-        t = np.linspace(0, 4.0 / freq, 800)  # seconds
-        tri = triangle_wave(freq, t)
-        IL_wave = IL_avg + (delta_IL / 2.0) * tri
-        Vout_wave = Vout + (delta_Vout / 2.0) * tri
-
-        ax1.plot(t * 1e6, IL_wave); ax1.set_title("Bobin Akımı (IL) - Boost", fontsize=FONT_BASE+1); ax1.set_ylabel("A", fontsize=FONT_BASE); ax1.grid(True)
-        ax2.plot(t * 1e6, Vout_wave, color="red"); ax2.set_title("Çıkış Gerilimi (Vout) - Boost", fontsize=FONT_BASE+1); ax2.set_ylabel("V", fontsize=FONT_BASE); ax2.set_xlabel("Zaman (µs)", fontsize=FONT_BASE); ax2.grid(True)
-
-        fig_b.tight_layout(); canvas_b.draw()
+        _show_waveforms(tab_b.plot, "boost", r, "Bobin Akımı (IL) - Boost", "Çıkış Gerilimi (Vout) - Boost")
+        cyc.lap("plot")
+        cyc.done()
 
     except Exception as e:
-        messagebox.showerror("Hata (Boost)", str(e))
+        if not live:  # sürükleme sırasında hata penceresi yağdırma
+            messagebox.showerror("Hata (Boost)", str(e))
 
-def do_buck_calc():
+def do_buck_calc(live=False):
+    from calc_cache import cached_calc
+    cyc = PERF.cycle("buck")
     try:
-        Vin = float(entry_k_vin.get()); Vout = float(entry_k_vout.get())
-        freq = float(entry_k_f.get()) * 1e3
-        L = float(entry_k_L.get()) * 1e-6
-        C = float(entry_k_C.get()) * 1e-6
-        ripI_val = float(entry_k_ripI.get())
-        ripV_val = float(entry_k_ripV.get())
-        Iout = float(slider_k_Iout.get())
-
-        if Vout >= Vin:
-            messagebox.showerror("Hata", "Buck için Vout < Vin olmalı.")
-            return
+        inp = _buck_inputs()
+        cyc.lap("parse")
+        lb = _apply_losses("buck", inp)
+        cyc.lap("losses")
+        r = cached_calc("buck", **inp)
+        cyc.lap("math")
 
-        D = Vout / Vin
-        if D <= 0:
-            messagebox.showerror("Hata", "Hesaplanan duty negatif veya sıfır; parametreleri kontrol edin.")
-            return
-
-        delta_IL = (Vin - Vout) * D / (L * freq)
-        delta_Vout = delta_IL / (8.0 * freq * C) if C > 0 else float('inf')
-        IL_avg = Iout
-        IL_min = IL_avg - delta_IL / 2.0
-        mode = "CCM" if IL_min > 0 else "DCM"
-
-        # önerilen
-        delta_IL_max = ripI_val
-        delta_V_max = ripV_val
-        L_min = (Vin - Vout) * D / (delta_IL_max * freq) if delta_IL_max > 0 else float('inf')
-        C_min = delta_IL_max / (8.0 * freq * delta_V_max) if delta_V_max > 0 else float('inf')
-
-        PSC_calc, ARR_calc = calc_timer_from_inputs(entry_k_fclk.get(), freq, var_k_PSC_fix.get(), var_k_ARR_fix.get(), entry_k_PSC.get(), entry_k_ARR.get())
-        entry_k_PSC.delete(0, tk.END); entry_k_PSC.insert(0, str(PSC_calc))
-        entry_k_ARR.delete(0, tk.END); entry_k_ARR.insert(0, str(ARR_calc))
+        _set_entry(entry_k_PSC, r.timer.psc)
+        _set_entry(entry_k_ARR, r.timer.arr)
 
         out_k_text.configure(state="normal"); out_k_text.delete("1.0", tk.END)
         out_k_text.insert(tk.END, f"--- Girilen (Buck) ---\n")
-        out_k_text.insert(tk.END, f"Vin={Vin} V, Vout={Vout} V, f={freq/1e3} kHz\n")
-        out_k_text.insert(tk.END, f"L={L*1e6:.1f} µH, Cout={C*1e6:.1f} µF, Iout={Iout:.3f} A\n\n")
-        out_k_text.insert(tk.END, f"Duty D = {D:.5f}\n")
-        out_k_text.insert(tk.END, f"IL(avg) = {IL_avg:.3f} A\n")
-        out_k_text.insert(tk.END, f"ΔIL (ideal) = {delta_IL:.3f} A\n")
-        out_k_text.insert(tk.END, f"ΔVout (approx) = {delta_Vout:.5f} V\n")
-        out_k_text.insert(tk.END, f"Çalışma modu: {mode}\n\n")
-        out_k_text.insert(tk.END, f"Önerilen minimum L = {L_min*1e6:.2f} µH\n")
-        out_k_text.insert(tk.END, f"Önerilen minimum C = {C_min*1e6:.2f} µF\n")
+        out_k_text.insert(tk.END, f"Vin={r.Vin} V, Vout={r.Vout} V, f={r.freq/1e3} kHz\n")
+        out_k_text.insert(tk.END, f"L={r.L*1e6:.1f} µH, Cout={r.C*1e6:.1f} µF, Iout={r.Iout:.3f} A\n\n")
+        out_k_text.insert(tk.END, f"Duty D = {r.D:.5f} (η = {r.eff*100:.2f} % ile)\n")
+        out_k_text.insert(tk.END, f"IL(avg) = {r.IL_avg:.3f} A\n")
+        out_k_text.insert(tk.END, f"ΔIL (ideal) = {r.delta_IL:.3f} A\n")
+        out_k_text.insert(tk.END, f"ΔVout (approx) = {r.delta_Vout:.5f} V\n")
+        out_k_text.insert(tk.END, f"Çalışma modu: {r.mode}\n\n")
+        out_k_text.insert(tk.END, _loss_lines(lb))
+        out_k_text.insert(tk.END, f"Önerilen minimum L = {r.L_min*1e6:.2f} µH\n")
+        out_k_text.insert(tk.END, f"Önerilen minimum C = {r.C_min*1e6:.2f} µF\n\n")
+        out_k_text.insert(tk.END, _catalog_lines("buck", r, inp))
+        out_k_text.insert(tk.END, _timer_lines(r.timer))
         out_k_text.configure(state="disabled")
+        cyc.lap("text")
 
         # grafik
-        fig_k.clf()
-        ax1 = fig_k.add_subplot(211); ax2 = fig_k.add_subplot(212)
-        t = np.linspace(0, 4.0 / freq, 800)
-        tri = triangle_wave(freq, t)
-        IL_wave = IL_avg + (delta_IL / 2.0) * tri
-        Vout_wave = Vout + (delta_Vout / 2.0) * tri
+        _show_waveforms(tab_k.plot, "buck", r, "Bobin Akımı (IL) - Buck", "Çıkış Gerilimi (Vout) - Buck")
+        cyc.lap("plot")
+        cyc.done()
 
-        ax1.plot(t * 1e6, IL_wave); ax1.set_title("Bobin Akımı (IL) - Buck", fontsize=FONT_BASE+1); ax1.set_ylabel("A", fontsize=FONT_BASE); ax1.grid(True)
-        ax2.plot(t * 1e6, Vout_wave, color="red"); ax2.set_title("Çıkış Gerilimi (Vout) - Buck", fontsize=FONT_BASE+1); ax2.set_ylabel("V", fontsize=FONT_BASE); ax2.set_xlabel("Zaman (µs)", fontsize=FONT_BASE); ax2.grid(True)
+    except Exception as e:
+        if not live:  # sürükleme sırasında hata penceresi yağdırma
+            messagebox.showerror("Hata (Buck)", str(e))
+
+def do_fly_calc(live=False):
+    from calc_cache import cached_calc
+    cyc = PERF.cycle("flyback")
+    try:
+        inp = _fly_inputs()
+        cyc.lap("parse")
+        lb = _apply_losses("flyback", inp)
+        cyc.lap("losses")
+        r = cached_calc("flyback", **inp)
+        cyc.lap("math")
+
+        out_f_text.configure(state="normal"); out_f_text.delete("1.0", tk.END)
+        out_f_text.insert(tk.END, f"--- Girilen (Flyback) ---\n")
+        out_f_text.insert(tk.END, f"Vin={r.Vin} V, Vout={r.Vout} V, f={r.freq/1e3} kHz\n")
+        out_f_text.insert(tk.END, f"Lm={r.Lm*1e6:.1f} µH, Ns/Np (girilen)={r.nsnp:.3f}, Iout={r.Iout:.3f} A\n\n")
+        out_f_text.insert(tk.END, f"Duty ~ {r.D:.5f} (η = {r.eff*100:.2f} % ile)\n")
+        out_f_text.insert(tk.END, f"Önerilen Ns/Np (hesap) = {r.nsnp_req:.4f}\n")
+        out_f_text.insert(tk.END, f"Ipk (approx) = {r.Ipk:.3f} A\n")
+        out_f_text.insert(tk.END, f"Primer magnetizing ΔI (approx) = {r.delta_I_m:.3f} A\n")
+        out_f_text.insert(tk.END, f"Ortalama primer I ≈ {r.IL_avg:.3f} A\n")
+        out_f_text.insert(tk.END, f"ΔVout (approx, Cout={r.C*1e6:.1f} µF) = {r.delta_Vout:.5f} V\n")
+        out_f_text.insert(tk.END, f"Çalışma modu: {r.mode}\n\n")
+        out_f_text.insert(tk.END, _loss_lines(lb))
+        out_f_text.insert(tk.END, f"Önerilen minimum Lm = {r.L_min*1e6:.2f} µH\n")
+        out_f_text.insert(tk.END, f"Önerilen minimum C = {r.C_min*1e6:.2f} µF\n\n")
+        out_f_text.insert(tk.END, _catalog_lines("flyback", r, inp))
+        out_f_text.insert(tk.END, "(Not: Duty, Ipk ve giriş akımı kayıp modelinin verimiyle hesaplanır; RMS akımlar CCM yaklaşımıdır.)\n")
+        out_f_text.configure(state="disabled")
+        cyc.lap("text")
+
+        # grafik
+        _show_waveforms(tab_f.plot, "flyback", r, "Primer Bobin Akımı (approx) - Flyback", "Sekonder Gerilim (approx) - Flyback")
+        cyc.lap("plot")
+        cyc.done()
+
+    except Exception as e:
+        if not live:  # sürükleme sırasında hata penceresi yağdırma
+            messagebox.showerror("Hata (Flyback)", str(e))
+
+# ---------- Periyot-doğru simülasyon (soft-start + kararlı durum dalgalanması) ----------
+SIM_CYCLES = 3000
+SIM_SOFT_START = 300
+
+def do_sim(topology):
+    tabs = {"boost": ("Boost", _boost_inputs, out_b_text, tab_b),
+            "buck": ("Buck", _buck_inputs, out_k_text, tab_k),
+            "flyback": ("Flyback", _fly_inputs, out_f_text, tab_f)}
+    name, read_inputs, out_text, tab = tabs[topology]
+    from calc_cache import cached_calc, cached_simulate
+    cyc = PERF.cycle(f"sim.{topology}")
+    try:
+        inp = read_inputs()
+        cyc.lap("parse")
+        lb = _apply_losses(topology, inp)
+        r = cached_calc(topology, **inp)
+        cyc.lap("math")
+        s = cached_simulate(topology, Vin=r.Vin, Vout=r.Vout, freq=r.freq, L=inp.get("L", inp.get("Lm")),
+                            C=r.C, Iout=r.Iout, cycles=SIM_CYCLES, nsnp=inp.get("nsnp", 1.0),
+                            soft_start_cycles=SIM_SOFT_START, **_sim_loss_kw(topology, r, lb))
+        cyc.lap("simulate")
+
+        out_text.configure(state="normal")
+        out_text.insert(tk.END, f"\n--- Simülasyon ({SIM_CYCLES} periyot, soft-start {SIM_SOFT_START}) ---\n")
+        out_text.insert(tk.END, f"Vout (son) = {s.Vout_final:.4f} V, yerleşme (±2%) = {s.settling_time()*1e3:.3f} ms\n")
+        out_text.insert(tk.END, f"ΔIL sim = {s.delta_IL:.4f} A (formül {r.delta_IL:.4f} A)\n")
+        out_text.insert(tk.END, f"ΔVout sim = {s.delta_Vout:.5f} V (formül {r.delta_Vout:.5f} V)\n")
+        out_text.insert(tk.END, f"IL(avg) sim = {s.IL_avg:.3f} A, mod: {'DCM' if s.dcm[-1] else 'CCM'}\n")
+        out_text.configure(state="disabled")
+        cyc.lap("text")
+
+        tab.plot.update(s.t * 1e3, [s.iL_peak, s.iL_start], s.v_start,
+                    f"Bobin Akımı (periyot tepe/vadi) - {name}", f"Çıkış Gerilimi (soft-start) - {name}",
+                    "Zaman (ms)")
+        cyc.lap("plot")
+        cyc.done()
+    except Exception as e:
+        messagebox.showerror(f"Hata ({name} simülasyon)", str(e))
+
+# ---------- Uzun dalga formu (min/maks piramidi) ----------
+# Simülasyon (dense=True) veya yakalama dosyası worker thread'inde okunur ve
+# waveview.MinMaxPyramid'e çevrilir; pencere sadece piksel başına zarfı çizer ve araç
+# çubuğuyla yakınlaştırınca görünür aralığı piramitten yeniden alır (plotting.PyramidPlot).
+_wave_running = set()
+
+def _load_step(entry):
+    text = entry.get().strip()
+    if not text:
+        return ()
+    t_ms, I = (float(x) for x in text.replace(";", ",").split(","))
+    return ((t_ms * 1e-3, I),)
+
+def show_long_waveform(title, pyr, panels, info):
+    from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
+    from plotting import PyramidPlot
+    win = tk.Toplevel(root)
+    win.title(title)
+    top = tk.Frame(win); top.pack(side="top", fill="x", padx=8, pady=(6,0))
+    tk.Label(top, text=info, font=LABEL_FONT, anchor="w", justify="left").pack(side="left")
+    fig, canvas = make_canvas(win, figsize=(10, 6))
+    toolbar = NavigationToolbar2Tk(canvas, win, pack_toolbar=False)
+    toolbar.update()
+    toolbar.pack(side="bottom", fill="x")
+    plot = PyramidPlot(fig, canvas, pyr, panels, font_base=FONT_BASE)
+    tk.Button(top, text="Tümünü göster", font=LABEL_FONT, command=plot.view).pack(side="right")
+    canvas.draw()
+    win._plot = plot  # pencere yaşadıkça piramit ve callback'ler canlı kalsın
+    return plot
+
+def _run_wave_job(key, label, job, show):
+    """job() worker thread'inde; show(sonuç, süre) ana thread'de."""
+    if key in _wave_running:
+        return
+    state = {"result": None, "error": None, "finished": False}
+
+    def worker():
+        try:
+            t0 = time.perf_counter()
+            state["result"] = job()
+            state["elapsed"] = time.perf_counter() - t0
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
+
+    def poll():
+        if not state["finished"]:
+            root.after(50, poll)
+            return
+        _wave_running.discard(key)
+        if state["error"] is not None:
+            status_var.set("")
+            messagebox.showerror(f"Hata ({label})", str(state["error"]))
+            return
+        show(state["result"], state["elapsed"])
+
+    _wave_running.add(key)
+    status_var.set(f"{label} hazırlanıyor...")
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+def do_long_waveform(topology):
+    from calc_cache import cached_calc
+    names = {"boost": ("Boost", _boost_inputs), "buck": ("Buck", _buck_inputs), "flyback": ("Flyback", _fly_inputs)}
+    name, read_inputs = names[topology]
+    e = WAVE_ENTRIES[topology]
+    try:
+        inp = read_inputs()
+        lb = _apply_losses(topology, inp)
+        r = cached_calc(topology, **inp)
+        kw = dict(Vin=r.Vin, Vout=r.Vout, freq=r.freq, L=inp.get("L", inp.get("Lm")), C=r.C, Iout=r.Iout,
+                  nsnp=inp.get("nsnp", 1.0), **_sim_loss_kw(topology, r, lb),
+                  cycles=int(e["cycles"].get()), soft_start_cycles=int(e["soft"].get()),
+                  points_per_cycle=int(e["ppc"].get()), load_steps=_load_step(e["step"]))
+    except Exception as ex:
+        messagebox.showerror(f"Hata ({name} uzun dalga formu)", str(ex))
+        return
 
-        fig_k.tight_layout(); canvas_k.draw()
+    def job():
+        from switching_sim import simulate
+        from waveview import MinMaxPyramid
+        s = simulate(topology, dense=True, **kw)
+        return s, MinMaxPyramid(s.t_dense, s.iL_dense, s.v_dense)
+
+    def show(result, elapsed):
+        s, pyr = result
+        info = (f"{name}: {kw['cycles']} periyot × {kw['points_per_cycle']} örnek = {len(pyr):,} nokta, "
+                f"piramit {pyr.nbytes/1e6:.0f} MB, hazırlık {elapsed:.2f} s\n"
+                f"Vout (son) = {s.Vout_final:.4f} V, yerleşme (±2%) = {s.settling_time()*1e3:.3f} ms")
+        status_var.set(f"Uzun dalga formu ({name}): {len(pyr):,} nokta, {elapsed:.2f} s")
+        show_long_waveform(f"Uzun dalga formu - {name}", pyr,
+                           [(f"Bobin Akımı (IL) - {name}", "A", [(0, "iL", "red")]),
+                            (f"Çıkış Gerilimi - {name}", "V", [(1, "Vout", "blue")])], info)
+
+    _run_wave_job(topology, f"{name} uzun dalga formu", job, show)
+
+def do_open_capture(name):
+    from tkinter import filedialog
+    path = filedialog.askopenfilename(title="Yakalama dosyası", filetypes=[
+        ("Yakalama", "*.csv *.txt *.npz *.npy"), ("Tümü", "*.*")])
+    if not path:
+        return
 
+    def job():
+        from waveview import MinMaxPyramid, load_capture
+        t, ys, labels = load_capture(path)
+        if not ys:
+            raise ValueError("Dosyada zaman sütunundan başka kanal yok.")
+        return MinMaxPyramid(t, *ys), labels
+
+    def show(result, elapsed):
+        pyr, labels = result
+        colors = ("red", "blue", "green", "orange", "purple", "brown")
+        panels = [(f"{lbl} - {os.path.basename(path)}", "", [(k, lbl, colors[k % len(colors)])])
+                  for k, lbl in enumerate(labels)]
+        info = f"{os.path.basename(path)}: {pyr.channels} kanal × {len(pyr):,} örnek, {elapsed:.2f} s"
+        status_var.set(f"Yakalama ({name}): {len(pyr):,} örnek, {elapsed:.2f} s")
+        show_long_waveform(f"Yakalama - {os.path.basename(path)}", pyr, panels, info)
+
+    _run_wave_job(path, "yakalama", job, show)
+
+# ---------- Monte Carlo tolerans / yield analizi ----------
+# Hesap worker thread'inde (NumPy GIL'i bırakır); sonuç after() yoklamasıyla yazılır.
+_mc_running = set()
+
+def _mc_tolerances(entries):
+    from montecarlo import Tolerance
+    pct = lambda name: float(entries[name].get()) / 100.0
+    return {"L": Tolerance(pct("L")), "C": Tolerance(pct("C"), shift=pct("C_age")),
+            "Vin": Tolerance(pct("Vin"), "normal"), "Iout": Tolerance(pct("Iout"))}
+
+def show_mc_histograms(name, r):
+    """ΔIL, ΔVout ve CCM marjı histogramları (ayrı pencere)."""
+    win = tk.Toplevel(root)
+    win.title(f"Monte Carlo - {name}")
+    fig, canvas = make_canvas(win, figsize=(7, 7))
+    units = {"delta_IL": ("ΔIL (A)", r.limits[0]), "delta_Vout": ("ΔVout (V)", r.limits[1]),
+             "ccm_margin": ("CCM marjı IL_min/IL_avg", 0.0)}
+    for k, key in enumerate(("delta_IL", "delta_Vout", "ccm_margin")):
+        ax = fig.add_subplot(3, 1, k + 1)
+        st = r.metrics[key]
+        label, limit = units[key]
+        ax.stairs(st.counts, st.edges, fill=True, alpha=0.6)
+        ax.axvline(limit, color="red", linestyle="--", label="sınır")
+        for q in (1, 99):
+            ax.axvline(st.percentiles[q], color="gray", linestyle=":")
+        ax.set_xlabel(label, fontsize=FONT_BASE - 2)
+        ax.grid(True)
+    fig.suptitle(f"{name}: yield {r.yield_*100:.2f} % ({r.n} örnek)", fontsize=FONT_BASE)
+    fig.tight_layout()
+    canvas.draw()
+
+def do_monte_carlo(topology):
+    tabs = {"boost": ("Boost", _boost_inputs, out_b_text, mc_b),
+            "buck": ("Buck", _buck_inputs, out_k_text, mc_k),
+            "flyback": ("Flyback", _fly_inputs, out_f_text, mc_f)}
+    name, read_inputs, out_text, entries = tabs[topology]
+    if topology in _mc_running:
+        return
+    try:
+        inp = read_inputs()
+        _apply_losses(topology, inp)
+        tols = _mc_tolerances(entries)
+        n, seed = int(float(entries["n"].get())), int(entries["seed"].get())
     except Exception as e:
-        messagebox.showerror("Hata (Buck)", str(e))
+        messagebox.showerror(f"Hata ({name} Monte Carlo)", str(e))
+        return
+    state = {"done": 0, "total": n, "result": None, "error": None, "finished": False}
+
+    def worker():
+        try:
+            from montecarlo import run_monte_carlo
+            state["result"] = run_monte_carlo(topology, inp, tols, n=n, seed=seed,
+                                              progress=lambda d, t: state.update(done=d))
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
 
-def do_fly_calc():
+    def poll():
+        if not state["finished"]:
+            status_var.set(f"Monte Carlo ({name}): {state['done']}/{state['total']}")
+            root.after(100, poll)
+            return
+        _mc_running.discard(topology)
+        if state["error"] is not None:
+            status_var.set("")
+            messagebox.showerror(f"Hata ({name} Monte Carlo)", str(state["error"]))
+            return
+        r = state["result"]
+        status_var.set(f"Monte Carlo ({name}): {r.n} örnek, {r.elapsed:.2f} s ({r.throughput/1e6:.1f} M/s)")
+        lo, hi = r.yield_ci()
+        dI, dV = r.metrics["delta_IL"], r.metrics["delta_Vout"]
+        margin = r.metrics["ccm_margin"]
+        out_text.configure(state="normal")
+        out_text.insert(tk.END, f"\n--- Monte Carlo ({r.n} örnek, seed {r.seed}) ---\n")
+        out_text.insert(tk.END, f"Yield = {r.yield_*100:.2f} % (95% GA {lo*100:.2f}-{hi*100:.2f} %)\n")
+        out_text.insert(tk.END, f"Sınırlar: ΔI ≤ {r.limits[0]:.4f} A, ΔV ≤ {r.limits[1]:.5f} V\n")
+        out_text.insert(tk.END, f"Red: ΔI {r.fail_dI/r.n*100:.2f} %, ΔV {r.fail_dV/r.n*100:.2f} %, "
+                                f"geçersiz {r.invalid/r.n*100:.2f} %\n")
+        out_text.insert(tk.END, f"ΔIL p1/p50/p99 = {dI.percentiles[1]:.4f} / {dI.percentiles[50]:.4f} / {dI.percentiles[99]:.4f} A\n")
+        out_text.insert(tk.END, f"ΔVout p1/p50/p99 = {dV.percentiles[1]:.5f} / {dV.percentiles[50]:.5f} / {dV.percentiles[99]:.5f} V\n")
+        out_text.insert(tk.END, f"CCM marjı p1 = {margin.percentiles[1]:.3f}, DCM oranı = {r.dcm/r.n*100:.2f} %\n")
+        out_text.configure(state="disabled")
+        show_mc_histograms(name, r)
+
+    _mc_running.add(topology)
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+# ---------- Verim haritası (Vin × Iout × f) ----------
+# Küp worker thread'inde tek vektörel çağrıyla çözülür; frekans kaydırıcısı sadece
+# hazır dilimi gösterir (im.set_data), yeniden hesap yapmaz.
+_effmap_running = set()
+
+def show_efficiency_map(name, m, nominal):
+    import numpy as np
+    from matplotlib import cm
+    win = tk.Toplevel(root)
+    win.title(f"Verim haritası - {name}")
+    fig, canvas = make_canvas(win, figsize=(7, 5.5))
+    ax = fig.add_subplot(1, 1, 1)
+    i0, data = m.slice_at(nominal["freq"])
+    finite = m.eff[np.isfinite(m.eff)]
+    vmin = float(np.percentile(finite, 2)) if finite.size else 0.0
+    extent = (m.Iout[0], m.Iout[-1], m.Vin[0], m.Vin[-1])
+    im = ax.imshow(data * 100, origin="lower", aspect="auto", extent=extent, cmap=cm.viridis,
+                   vmin=vmin * 100, vmax=100 * float(finite.max()) if finite.size else 100, interpolation="nearest")
+    fig.colorbar(im, ax=ax, label="η (%)")
+    ax.plot([nominal["Iout"]], [nominal["Vin"]], "r+", markersize=14, mew=2)
+    ax.set_xlabel("Iout (A)", fontsize=FONT_BASE - 2)
+    ax.set_ylabel("Vin (V)", fontsize=FONT_BASE - 2)
+    title = ax.set_title("", fontsize=FONT_BASE - 1)
+
+    def show(i):
+        i = int(float(i))
+        im.set_data(m.eff[i] * 100)
+        sl = m.eff[i]
+        best = np.nanmax(sl) * 100 if np.isfinite(sl).any() else float("nan")
+        title.set_text(f"{name}: f = {m.freq[i]/1e3:.2f} kHz, maks. η = {best:.2f} %")
+        canvas.draw_idle()
+
+    scale = tk.Scale(win, from_=0, to=len(m.freq) - 1, orient="horizontal", showvalue=False,
+                     label="Frekans dilimi", command=show, font=LABEL_FONT)
+    scale.pack(side="top", fill="x", padx=8)
+    scale.set(i0)
+    show(i0)
+    fig.tight_layout()
+
+def do_efficiency_map(topology):
+    tabs = {"boost": ("Boost", _boost_inputs), "buck": ("Buck", _buck_inputs), "flyback": ("Flyback", _fly_inputs)}
+    name, read_inputs = tabs[topology]
+    if topology in _effmap_running:
+        return
     try:
-        Vin = float(entry_f_vin.get()); Vout = float(entry_f_vout.get())
-        freq = float(entry_f_f.get()) * 1e3
-        Lm = float(entry_f_Lm.get()) * 1e-6
-        nsnp = float(entry_f_nsnp.get())
-        Iout = float(entry_f_Iout.get())
-        ripI_pct = float(entry_f_ripI.get()) / 100.0
-        ripV_pct = float(entry_f_ripV.get()) / 100.0
-
-        if nsnp == 0:
-            messagebox.showerror("Hata", "Ns/Np sıfır olamaz.")
+        inp = read_inputs()
+        params = _loss_params(LOSS_ENTRIES[topology])
+    except Exception as e:
+        messagebox.showerror(f"Hata ({name} verim haritası)", str(e))
+        return
+    state = {"result": None, "error": None, "finished": False}
+
+    def worker():
+        try:
+            from losses import efficiency_map, map_axes
+            t0 = time.perf_counter()
+            state["result"] = efficiency_map(topology, inp, *map_axes(topology, inp), params=params)
+            state["elapsed"] = time.perf_counter() - t0
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
+
+    def poll():
+        if not state["finished"]:
+            root.after(50, poll)
+            return
+        _effmap_running.discard(topology)
+        if state["error"] is not None:
+            status_var.set("")
+            messagebox.showerror(f"Hata ({name} verim haritası)", str(state["error"]))
             return
+        m = state["result"]
+        status_var.set(f"Verim haritası ({name}): {m.size} nokta, {state['elapsed']*1e3:.0f} ms")
+        show_efficiency_map(name, m, inp)
+
+    _effmap_running.add(topology)
+    status_var.set(f"Verim haritası ({name}) hesaplanıyor...")
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+# ---------- Otomatik tasarım (optimizer) ----------
+# Kaba ızgara + yerel iyileştirme worker thread'inde; iyileştirme thread havuzunda
+# paralel çalışır (süreç havuzu bu ana modülü yeniden çalıştırırdı).
+_opt_running = set()
+
+def _parse_range(entry, default, scale=1.0):
+    text = entry.get().strip()
+    if not text:
+        return default
+    parts = [float(x) * scale for x in text.replace(";", ",").split(",")]
+    if len(parts) == 1:
+        parts *= 2
+    if len(parts) != 2:
+        raise ValueError(f"Aralık 'min, maks' biçiminde olmalı: {text}")
+    return tuple(sorted(parts))
+
+def _design_spec(topology):
+    from optimizer import DesignSpec
+    if topology == "flyback":
+        inp, pins, f_clk = _fly_inputs(), (None, None), None  # flyback sekmesinde timer yok: varsayılan f_clk
+    elif topology == "boost":
+        inp = _boost_inputs()
+        pins, f_clk = _timer_pins(var_b_PSC_fix, var_b_ARR_fix, entry_b_PSC, entry_b_ARR), inp["f_clk"]
+    else:
+        inp = _buck_inputs()
+        pins, f_clk = _timer_pins(var_k_PSC_fix, var_k_ARR_fix, entry_k_PSC, entry_k_ARR), inp["f_clk"]
+    entries = OPT_ENTRIES[topology]
+    rip = ("ripI_val", "ripV_val") if topology == "buck" else ("ripI_pct", "ripV_pct")
+    kw = dict(Vin=_parse_range(entries["Vin"], (0.9 * inp["Vin"], 1.1 * inp["Vin"])),
+              Iout=_parse_range(entries["Iout"], (0.1 * inp["Iout"], inp["Iout"])),
+              f_range=_parse_range(entries["f"], None, 1e3), L_range=_parse_range(entries["L"], None, 1e-6),
+              psc=None if pins[0] is None else int(pins[0]), arr=None if pins[1] is None else int(pins[1]),
+              loss_params=_loss_params(LOSS_ENTRIES[topology]))
+    if f_clk is not None:
+        kw["f_clk"] = f_clk
+    if topology == "flyback":
+        kw["nsnp_range"] = _parse_range(entries["nsnp"], None)
+    return DesignSpec(topology, Vout=inp["Vout"], ripI=inp[rip[0]], ripV=inp[rip[1]],
+                      **{k: v for k, v in kw.items() if v is not None or k in ("psc", "arr")})
+
+def _load_design(topology, d):
+    """Seçilen tasarımı giriş alanlarına yaz ve yeniden hesapla."""
+    fmt = lambda v: f"{v:.10g}"
+    if topology == "boost":
+        _set_entry(entry_b_f, fmt(d.freq / 1e3)); _set_entry(entry_b_L, fmt(d.L * 1e6))
+        _set_entry(entry_b_C, fmt(d.C * 1e6)); _set_entry(entry_b_PSC, d.psc); _set_entry(entry_b_ARR, d.arr)
+        do_boost_calc()
+    elif topology == "buck":
+        _set_entry(entry_k_f, fmt(d.freq / 1e3)); _set_entry(entry_k_L, fmt(d.L * 1e6))
+        _set_entry(entry_k_C, fmt(d.C * 1e6)); _set_entry(entry_k_PSC, d.psc); _set_entry(entry_k_ARR, d.arr)
+        do_buck_calc()
+    else:
+        _set_entry(entry_f_f, fmt(d.freq / 1e3)); _set_entry(entry_f_Lm, fmt(d.L * 1e6))
+        _set_entry(entry_f_C, fmt(d.C * 1e6)); _set_entry(entry_f_nsnp, f"{d.nsnp:.4g}")
+        do_fly_calc()
+
+def show_design_front(name, topology, r):
+    """Pareto cephesi tablosu + kayıp/hacim grafiği; seçilen satır girişlere yüklenir."""
+    win = tk.Toplevel(root)
+    win.title(f"Otomatik tasarım - {name} ({r.evaluated} tasarım, {r.elapsed:.2f} s)")
+    cols = ("sıra", "aşama", "f (kHz)", "PSC/ARR", "L (µH)", "C (µF)", "Ns/Np", "kayıp (W)", "η (%)",
+            "hacim (cm³)", "maliyet")
+    tree = ttk.Treeview(win, columns=cols, show="headings", height=min(len(r.front), 12))
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=80, anchor="e")
+    for i, d in enumerate(r.front):
+        tree.insert("", tk.END, iid=str(i), values=(
+            i + 1, d.stage, f"{d.freq/1e3:.3f}", f"{d.psc}/{d.arr}", f"{d.L*1e6:.1f}", f"{d.C*1e6:.2f}",
+            "-" if d.nsnp != d.nsnp else f"{d.nsnp:.3f}", f"{d.loss:.2f}", f"{d.eff*100:.2f}",
+            f"{d.volume/1e3:.1f}", f"{d.cost:.2f}"))
+    tree.pack(side="top", fill="x", padx=8, pady=6)
+
+    def load_selected():
+        sel = tree.selection()
+        if sel:
+            _load_design(topology, r.front[int(sel[0])])
+
+    tk.Button(win, text="Seçileni girişlere yükle", font=LABEL_FONT, command=load_selected).pack(pady=(0,6))
+    fig, canvas = make_canvas(win, figsize=(7, 4))
+    ax = fig.add_subplot(1, 1, 1)
+    sc = ax.scatter([d.volume / 1e3 for d in r.front], [d.loss for d in r.front],
+                    c=[d.cost for d in r.front], cmap="viridis")
+    fig.colorbar(sc, ax=ax, label="maliyet")
+    if r.front:
+        ax.plot([r.front[0].volume / 1e3], [r.front[0].loss], "r*", markersize=14)
+    ax.set_xscale("log")
+    ax.set_xlabel("Hacim (cm³)", fontsize=FONT_BASE - 2)
+    ax.set_ylabel("En kötü kayıp (W)", fontsize=FONT_BASE - 2)
+    ax.set_title(f"{name}: Pareto cephesi ({len(r.front)} tasarım)", fontsize=FONT_BASE - 1)
+    ax.grid(True)
+    fig.tight_layout()
+    canvas.draw()
+
+def do_optimize(topology):
+    names = {"boost": "Boost", "buck": "Buck", "flyback": "Flyback"}
+    name = names[topology]
+    if topology in _opt_running:
+        return
+    try:
+        spec = _design_spec(topology)
+        objective = OPT_OBJECTIVES[OPT_ENTRIES[topology]["objective"].get()]
+    except Exception as e:
+        messagebox.showerror(f"Hata ({name} optimizasyon)", str(e))
+        return
+    state = {"done": 0, "total": 1, "result": None, "error": None, "finished": False}
+
+    def worker():
+        try:
+            from optimizer import optimize
+            state["result"] = optimize(spec, objective, use_processes=False,
+                                       progress=lambda d, t: state.update(done=d, total=t))
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
 
-        denom = Vout + (Vin * (1.0 / nsnp))
-        if denom == 0:
-            messagebox.showerror("Hata", "Geçersiz Ns/Np veya gerilim değerleri.")
+    def poll():
+        if not state["finished"]:
+            status_var.set(f"Optimizasyon ({name}): aşama {state['done']}/{state['total']}")
+            root.after(100, poll)
             return
+        _opt_running.discard(topology)
+        if state["error"] is not None:
+            status_var.set("")
+            messagebox.showerror(f"Hata ({name} optimizasyon)", str(state["error"]))
+            return
+        r = state["result"]
+        status_var.set(f"Optimizasyon ({name}): {r.evaluated} tasarım, {r.feasible} uygun, "
+                       f"cephe {len(r.front)}, {r.elapsed:.2f} s")
+        if not r.front:
+            messagebox.showinfo(f"{name} optimizasyon", "Kısıtları sağlayan tasarım bulunamadı; aralıkları genişletin.")
+            return
+        show_design_front(name, topology, r)
+
+    _opt_running.add(topology)
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+# ---------- Küçük sinyal (Bode / kompanzatör) ----------
+# Model ve tasarım smallsignal modülünde. Worker thread'i tek seferde hesaplar: Vin × Iout
+# köşe ızgarasının tüm cevapları, Tip II / III aday ağlarının köşelerdeki payları ve
+# seçilen ağın faz payı haritası. Penceredeki Iout kaydırıcısı sadece tek noktayı yeniden
+# hesaplar (~ms) ve vurgulanan eğrileri set_data ile günceller.
+_bode_running = set()
+BODE_VIN = (0.9, 1.0, 1.1)                 # üst üste çizilen çalışma noktaları (nominale oran)
+BODE_IOUT = (0.1, 0.25, 0.5, 1.0, 1.5)
+BODE_MAP = ((0.8, 1.2), (0.05, 1.5), 30)  # faz payı haritası: Vin, Iout oranları, nokta
+
+def _db(x):
+    import numpy as np
+    with np.errstate(divide="ignore"):
+        return 20 * np.log10(np.abs(x))
+
+def _phase(x):
+    import numpy as np
+    return np.degrees(np.unwrap(np.angle(x), axis=-1))
+
+def _bode_setup(topology):
+    from smallsignal import LoopParams
+    read_inputs = {"boost": _boost_inputs, "buck": _buck_inputs, "flyback": _fly_inputs}[topology]
+    inp = read_inputs()
+    _apply_losses(topology, inp)
+    lp = _loss_params(LOSS_ENTRIES[topology])
+    e = BODE_ENTRIES[topology]
+    H = e["H"].get().strip()
+    loop = LoopParams(Vm=float(e["Vm"].get()), H=float(H) if H else None,
+                      delay_cycles=float(e["delay"].get()))
+    return dict(inp=inp, DCR=lp.DCR, ESR=lp.ESR, loop=loop, kind=BODE_KINDS[e["kind"].get()],
+                pm_min=float(e["pm_min"].get()), R1=float(e["R1"].get()) * 1e3)
+
+def _bode_compute(topology, cfg):
+    import numpy as np
+    from smallsignal import design, freq_grid, plant_response, pm_map
+    inp, dcr, esr, loop = cfg["inp"], cfg["DCR"], cfg["ESR"], cfg["loop"]
+    out = {"f": freq_grid(inp["freq"]), "design": None, "map": None}
+    grid = dict(inp, Vin=inp["Vin"] * np.array(BODE_VIN)[:, None],
+                Iout=inp["Iout"] * np.array(BODE_IOUT)[None, :])
+    out["overlay"] = plant_response(topology, grid, out["f"], dcr, esr)
+    if cfg["kind"]:
+        pm_min = cfg["pm_min"]
+        r = design(topology, inp, cfg["kind"], pm=np.arange(pm_min, pm_min + 30, 5), DCR=dcr, ESR=esr,
+                   loop=loop, pm_min=pm_min)
+        out["design"] = r
+        if r.best is not None:
+            (v0, v1), (i0, i1), n = BODE_MAP
+            Vin, Iout = inp["Vin"] * np.linspace(v0, v1, n), inp["Iout"] * np.linspace(i0, i1, n)
+            out["map"] = (Vin, Iout) + pm_map(topology, inp, r.best_comp, Vin, Iout, dcr, esr, loop)
+    return out
+
+def _bode_design_lines(cfg, r):
+    from smallsignal import network_values
+    if r is None:
+        return "Kompanzatör yok: açık çevrim Gvd ve Zout gösteriliyor."
+    if r.best is None:
+        return (f"Tip {cfg['kind']}: {r.comp.Kc.size} aday, hiçbiri tüm köşelerde PM ≥ {cfg['pm_min']:.0f}° "
+                f"ve GM ≥ 6 dB sağlamıyor.\nAçık çevrim gösteriliyor; fc'yi düşürmek için L / C'yi değiştirin.")
+    i, c = r.best, r.best_comp
+    nv = network_values(c, cfg["R1"])
+    parts = ", ".join(f"{k} = {_eng(v, 'F' if k.startswith('C') else 'Ω')}" for k, v in nv.items())
+    return (f"{c.describe()}\n"
+            f"{int(r.feasible.sum())}/{r.comp.Kc.size} aday uygun; seçilen: hedef fc {r.fc_target[i]:.4g} Hz, "
+            f"köşelerde fc {r.fc_min[i]:.4g}-{r.fc_max[i]:.4g} Hz, en kötü PM {r.pm_worst[i]:.1f}°, "
+            f"GM {r.gm_worst[i]:.1f} dB\nOp-amp ağı: {parts}")
+
+def _eng(v, unit):
+    for scale, prefix in ((1e6, "M"), (1e3, "k"), (1.0, ""), (1e-3, "m"), (1e-6, "µ"), (1e-9, "n"), (1e-12, "p")):
+        if abs(v) >= scale:
+            return f"{v/scale:.3g} {prefix}{unit}"
+    return f"{v:.3g} {unit}"
+
+def show_bode(name, topology, cfg, out):
+    import numpy as np
+    from smallsignal import PM_LEVELS, loop_gain, margins, plant_response
+    inp, f, loop = cfg["inp"], out["f"], cfg["loop"]
+    r = out["design"]
+    comp = None if r is None else r.best_comp
+    f_sw = inp["freq"]
+    win = tk.Toplevel(root)
+    win.title(f"Küçük sinyal - {name}")
+    tk.Label(win, text=_bode_design_lines(cfg, r), font=MONO_FONT, justify="left", anchor="w").pack(
+        side="top", fill="x", padx=8, pady=(6,0))
+    point_var = tk.StringVar()
+    tk.Label(win, textvariable=point_var, font=LABEL_FONT, anchor="w").pack(side="top", fill="x", padx=8)
+    fig, canvas = make_canvas(win, figsize=(10, 7))
+    ax_mag, ax_pm = fig.add_subplot(2, 2, 1), fig.add_subplot(2, 2, 2)
+    ax_ph, ax_z = fig.add_subplot(2, 2, 3, sharex=ax_mag), fig.add_subplot(2, 2, 4)
+
+    def responses(p):
+        """(kazanç eğrisi, Zout): kompanzatör varsa döngü kazancı ve kapalı çevrim Zout."""
+        if comp is None:
+            return p.Gvd, p.Zout
+        T = loop_gain(p, comp, f_sw, loop)
+        return T, p.Zout / (1 + T)
+
+    ov = out["overlay"]
+    H_ov, Z_ov = responses(ov)
+    for H, Z in zip(H_ov.reshape(-1, len(f)), Z_ov.reshape(-1, len(f))):
+        ax_mag.semilogx(f, _db(H), color="0.75", lw=0.8)
+        ax_ph.semilogx(f, _phase(H), color="0.75", lw=0.8)
+        ax_z.semilogx(f, _db(Z), color="0.75", lw=0.8)
+    (l_mag,) = ax_mag.semilogx(f, np.full_like(f, np.nan), color="tab:red", lw=2)
+    (l_ph,) = ax_ph.semilogx(f, np.full_like(f, np.nan), color="tab:red", lw=2)
+    (l_z,) = ax_z.semilogx(f, np.full_like(f, np.nan), color="tab:red", lw=2)
+    loop_txt = "T = Gvd·Gc·H/Vm" if comp is not None else "Gvd (açık çevrim)"
+    ax_mag.set_title(f"{name}: {loop_txt}", fontsize=FONT_BASE - 1)
+    ax_mag.set_ylabel("Kazanç (dB)", fontsize=FONT_BASE - 2)
+    ax_ph.set_ylabel("Faz (°)", fontsize=FONT_BASE - 2)
+    ax_ph.set_xlabel("Frekans (Hz)", fontsize=FONT_BASE - 2)
+    ax_mag.axhline(0, color="k", lw=0.6)
+    ax_ph.axhline(-180, color="k", lw=0.6)
+    ax_z.set_title("Çıkış empedansı" + (" (kapalı çevrim)" if comp is not None else ""), fontsize=FONT_BASE - 1)
+    ax_z.set_ylabel("|Zout| (dBΩ)", fontsize=FONT_BASE - 2)
+    ax_z.set_xlabel("Frekans (Hz)", fontsize=FONT_BASE - 2)
+    for ax in (ax_mag, ax_ph, ax_z):
+        ax.grid(True, which="both", alpha=0.3)
+    marker = None
+    if out["map"] is not None:
+        Vin_m, Iout_m, _, pm, _ = out["map"]
+        lo, hi = np.nanmin(pm), np.nanmax(pm)
+        cs = ax_pm.contourf(Iout_m, Vin_m, pm, levels=np.linspace(lo, max(hi, lo + 1), 13),
+                            cmap="RdYlGn", vmin=0, vmax=90, extend="both")
+        fig.colorbar(cs, ax=ax_pm, label="Faz payı (°)")
+        lines = ax_pm.contour(Iout_m, Vin_m, pm, levels=[lv for lv in PM_LEVELS if lo < lv < hi],
+                              colors="0.3", linewidths=0.6)
+        ax_pm.clabel(lines, fmt="%d°", fontsize=FONT_BASE - 4)
+        if lo < cfg["pm_min"] < hi:
+            ax_pm.contour(Iout_m, Vin_m, pm, levels=[cfg["pm_min"]], colors="k", linewidths=1.5)
+        (marker,) = ax_pm.plot([inp["Iout"]], [inp["Vin"]], "k+", markersize=14, mew=2)
+        ax_pm.set_title(f"Faz payı (siyah: {cfg['pm_min']:.0f}°)", fontsize=FONT_BASE - 1)
+        ax_pm.set_xlabel("Iout (A)", fontsize=FONT_BASE - 2)
+        ax_pm.set_ylabel("Vin (V)", fontsize=FONT_BASE - 2)
+    else:
+        ax_pm.axis("off")
+        ax_pm.text(0.5, 0.5, "Faz payı haritası için\nuygun kompanzatör gerekli", ha="center", va="center",
+                   transform=ax_pm.transAxes, fontsize=FONT_BASE - 2)
+
+    def show_point(value):
+        with PERF.stage("bode.update"):
+            Iout = float(value)
+            p = plant_response(topology, dict(inp, Iout=Iout), f, cfg["DCR"], cfg["ESR"])
+            H, Z = responses(p)
+            l_mag.set_ydata(_db(H)); l_ph.set_ydata(_phase(H)); l_z.set_ydata(_db(Z))
+            mode = ("CCM" if p.ccm else "DCM") if p.valid else "geçersiz"
+            text = f"Iout = {Iout:.3g} A ({mode}), D = {float(p.D):.3f}, "
+            text += (f"f0 = {float(p.f0):.4g} Hz, Q = {float(p.Q):.2f}" if p.ccm
+                     else f"kutup = {float(p.f0):.4g} Hz")
+            if np.isfinite(p.f_rhpz):
+                text += f", RHP sıfırı = {float(p.f_rhpz):.4g} Hz"
+            if comp is not None:
+                fc, pm, gm = margins(f, H)
+                text += f"  |  fc = {float(fc):.4g} Hz, PM = {float(pm):.1f}°, GM = {float(gm):.1f} dB"
+            point_var.set(text)
+            if marker is not None:
+                marker.set_data([Iout], [inp["Vin"]])
+            for ax in (ax_mag, ax_ph, ax_z):
+                ax.relim(); ax.autoscale_view()
+            canvas.draw_idle()
+
+    lo, hi = inp["Iout"] * BODE_IOUT[0], inp["Iout"] * BODE_IOUT[-1]
+    scale = tk.Scale(win, from_=lo, to=hi, resolution=(hi - lo) / 200, orient="horizontal",
+                     label="Iout (A) - vurgulanan çalışma noktası", command=show_point, font=LABEL_FONT)
+    scale.pack(side="top", fill="x", padx=8)
+    scale.set(inp["Iout"])
+    show_point(inp["Iout"])
+    fig.tight_layout()
+    canvas.draw()
+
+def do_bode(topology):
+    names = {"boost": "Boost", "buck": "Buck", "flyback": "Flyback"}
+    name = names[topology]
+    if topology in _bode_running:
+        return
+    try:
+        cfg = _bode_setup(topology)
+    except Exception as e:
+        messagebox.showerror(f"Hata ({name} küçük sinyal)", str(e))
+        return
+    state = {"result": None, "error": None, "finished": False}
 
-        D = Vout / denom
-        D = max(1e-6, min(0.999999, D))
-        Pout = Vout * Iout
-        Fs = freq
-        if Lm <= 0:
-            Ipk = float('inf')
-            delta_I_m = float('inf')
+    def worker():
+        try:
+            t0 = time.perf_counter()
+            with PERF.stage("bode.compute"):
+                state["result"] = _bode_compute(topology, cfg)
+            state["elapsed"] = time.perf_counter() - t0
+        except Exception as e:
+            state["error"] = e
+        state["finished"] = True
+
+    def poll():
+        if not state["finished"]:
+            root.after(50, poll)
+            return
+        _bode_running.discard(topology)
+        if state["error"] is not None:
+            status_var.set("")
+            messagebox.showerror(f"Hata ({name} küçük sinyal)", str(state["error"]))
+            return
+        out = state["result"]
+        r = out["design"]
+        extra = "" if r is None else f", {r.comp.Kc.size} aday ağ"
+        status_var.set(f"Küçük sinyal ({name}): {out['overlay'].valid.size} çalışma noktası{extra}, "
+                       f"{state['elapsed']*1e3:.0f} ms")
+        show_bode(name, topology, cfg, out)
+
+    _bode_running.add(topology)
+    status_var.set(f"Küçük sinyal ({name}) hesaplanıyor...")
+    threading.Thread(target=worker, daemon=True).start()
+    poll()
+
+# ---------- Tasarım deposu (kaydet / yükle / karşılaştır) ----------
+# design_store dizin tabanlı kolonsal depodur: pencere açılırken sütunlar memmap ile
+# eşlenir, tablo sadece son STORE_SHOW_MAX satırı gösterir. Karşılaştırma seçili
+# tasarımların kayıtlı dalga formlarını üst üste çizer ve ilk seçilene göre farkları yazar.
+STORE_SHOW_MAX = 2000
+STORE_UNITS = {"Vin": "V", "Vout": "V", "freq": "Hz", "L": "H", "C": "F", "Iout": "A", "nsnp": "",
+               "D": "", "delta_IL": "A", "delta_Vout": "V", "IL_avg": "A", "Ipk": "A", "L_min": "H",
+               "C_min": "F", "nsnp_req": "", "eff": "", "P_loss": "W"}
+_store = None
+_store_lock = threading.Lock()
+_store_win = {"win": None, "refresh": None}
+
+def get_store():
+    """Uygulamanın tasarım deposu (STORE_DIR); ilk kullanımda açılır / oluşturulur."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from design_store import DesignStore
+            _store = DesignStore(STORE_DIR)
+        return _store
+
+def _set_inputs(topology, inp):
+    """Kayıtlı calc girişlerini (SI) sekmenin alanlarına yaz."""
+    widgets = {"boost": ((entry_b_vin, "Vin", 1), (entry_b_vout, "Vout", 1), (entry_b_f, "freq", 1e-3),
+                         (entry_b_L, "L", 1e6), (entry_b_C, "C", 1e6), (slider_b_Iout, "Iout", 1),
+                         (entry_b_ripI, "ripI_pct", 100), (entry_b_ripV, "ripV_pct", 100),
+                         (entry_b_fclk, "f_clk", 1), (entry_b_PSC, "psc", 1), (entry_b_ARR, "arr", 1)),
+               "buck": ((entry_k_vin, "Vin", 1), (entry_k_vout, "Vout", 1), (entry_k_f, "freq", 1e-3),
+                        (entry_k_L, "L", 1e6), (entry_k_C, "C", 1e6), (slider_k_Iout, "Iout", 1),
+                        (entry_k_ripI, "ripI_val", 1), (entry_k_ripV, "ripV_val", 1),
+                        (entry_k_fclk, "f_clk", 1), (entry_k_PSC, "psc", 1), (entry_k_ARR, "arr", 1)),
+               "flyback": ((entry_f_vin, "Vin", 1), (entry_f_vout, "Vout", 1), (entry_f_f, "freq", 1e-3),
+                           (entry_f_Lm, "Lm", 1e6), (entry_f_nsnp, "nsnp", 1), (entry_f_Iout, "Iout", 1),
+                           (entry_f_C, "C", 1e6), (entry_f_ripI, "ripI_pct", 100),
+                           (entry_f_ripV, "ripV_pct", 100))}
+    for w, key, scale in widgets[topology]:
+        if key not in inp:
+            continue
+        v = inp[key] * scale
+        if isinstance(w, tk.Scale):
+            w.set(v)
         else:
-            # basit approx
-            Ipk = math.sqrt(max(0.0, 2.0 * Pout / (Lm * Fs)))
-            delta_I_m = (Vin * D) / (Lm * Fs)
+            _set_entry(w, v if isinstance(v, int) else f"{v:.10g}")
 
-        eff = 0.9
-        Iin = Pout / (Vin * eff) if Vin > 0 else 0.0
-        Iavg = Iin
-        IL_min = Iavg - delta_I_m / 2.0
-        mode = "CCM" if IL_min > 0 else "DCM"
-        nsnp_req = (Vout * (1.0 - D)) / (Vin * D) if D != 0 else float('inf')
+def do_save_design(topology):
+    from tkinter import simpledialog
+    from calc_cache import cached_calc, cached_waveforms
+    names = {"boost": ("Boost", _boost_inputs), "buck": ("Buck", _buck_inputs), "flyback": ("Flyback", _fly_inputs)}
+    name, read_inputs = names[topology]
+    try:
+        inp = read_inputs()
+        lb = _apply_losses(topology, inp)
+        r = cached_calc(topology, **inp)
+        waves = cached_waveforms(topology, r)
+    except Exception as e:
+        messagebox.showerror(f"Hata ({name} kaydet)", str(e))
+        return
+    default = f"{name} {r.Vin:g}→{r.Vout:g} V, {r.freq/1e3:g} kHz, {r.Iout:g} A"
+    label = simpledialog.askstring("Tasarımı kaydet", "Tasarım adı:", initialvalue=default, parent=root)
+    if label is None:
+        return
+    try:
+        did = get_store().add(topology, inp, r, waves, name=label.strip() or default, P_loss=lb.P_total)
+    except (OSError, ValueError) as e:
+        messagebox.showerror(f"Hata ({name} kaydet)", f"Kaydedilemedi: {e}")
+        return
+    status_var.set(f"Tasarım #{did} kaydedildi: {label.strip() or default} ({STORE_DIR})")
+    if _store_win["refresh"] is not None:
+        _store_win["refresh"]()
+
+def _compare_text(store, idx):
+    """Alan × tasarım tablosu; ilk sütun referans, diğerleri değer (Δ%)."""
+    from design_store import compare
+    fields, values, rel = compare(store, idx)
+    ids = store.column("id")
+    cell = lambda v, f: "-" if v != v else _eng(v, STORE_UNITS[f])
+    head = f"{'alan':<11}" + "".join(f"{'#%d' % ids[i]:>22}" for i in idx)
+    lines = [head, "-" * len(head)]
+    for j, f in enumerate(fields):
+        cells = [f"{cell(values[0, j], f):>22}"]
+        for k in range(1, len(idx)):
+            d = rel[k, j]
+            delta = "" if d != d or not abs(d) < 1e6 else f" ({d*100:+.1f}%)"
+            cells.append(f"{cell(values[k, j], f) + delta:>22}")
+        lines.append(f"{f:<11}" + "".join(cells))
+    names = [f"#{ids[i]}: {store.column('name')[i]} ({store.topology(i)})" for i in idx]
+    return "\n".join(lines + [""] + names) + "\n"
+
+def show_design_store():
+    if _store_win["win"] is not None and _store_win["win"].winfo_exists():
+        _store_win["win"].lift()
+        return
+    try:
+        store = get_store()
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Tasarım deposu", f"Açılamadı: {e}")
+        return
+    from design_store import TOPOLOGIES, parquet_available
+    win = tk.Toplevel(root)
+    _store_win["win"] = win
+    win.title(f"Tasarım deposu - {STORE_DIR}")
+    bar = tk.Frame(win)
+    bar.pack(side="top", fill="x", padx=8, pady=6)
+    topo_var = tk.StringVar(value="tümü")
+    ttk.Combobox(bar, textvariable=topo_var, values=("tümü",) + TOPOLOGIES, state="readonly", width=10,
+                 font=LABEL_FONT).pack(side="left")
+    info_var = tk.StringVar()
+    tk.Label(bar, textvariable=info_var, font=LABEL_FONT).pack(side="left", padx=8)
+    cols = ("#", "ad", "topoloji", "Vin (V)", "Vout (V)", "f (kHz)", "L (µH)", "C (µF)", "Iout (A)", "D",
+            "ΔIL (A)", "η (%)", "kayıp (W)", "tarih")
+    tree = ttk.Treeview(win, columns=cols, show="headings", height=12, selectmode="extended")
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=220 if c == "ad" else (130 if c == "tarih" else 75),
+                    anchor="w" if c in ("ad", "topoloji", "tarih") else "e")
+    tree.pack(side="top", fill="x", padx=8)
+    delta_text = tk.Text(win, height=12, font=MONO_FONT, wrap="none")
+    delta_text.pack(side="bottom", fill="x", padx=8, pady=(0, 8))
+    fig, canvas = make_canvas(win, figsize=(10, 4.5))
+
+    def fill():
+        topo = topo_var.get()
+        idx = store.select(None if topo == "tümü" else topo)
+        shown = idx[::-1][:STORE_SHOW_MAX]  # en yeni üstte
+        t = store.table(shown)
+        tree.delete(*tree.get_children())
+        for k, i in enumerate(shown):
+            v = {c: t[c][k] for c in t}
+            fmt = lambda x, s=1.0, p=".3g": "-" if x != x else format(x * s, p)
+            tree.insert("", tk.END, iid=str(i), values=(
+                v["id"], v["name"], v["topology"], fmt(v["Vin"]), fmt(v["Vout"]), fmt(v["freq"], 1e-3),
+                fmt(v["L"], 1e6), fmt(v["C"], 1e6), fmt(v["Iout"]), fmt(v["D"], p=".4f"),
+                fmt(v["delta_IL"]), fmt(v["eff"], 100, ".2f"), fmt(v["P_loss"]),
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(v["created"]))))
+        more = f" (son {len(shown)} gösteriliyor)" if len(idx) > len(shown) else ""
+        info_var.set(f"{len(idx)} tasarım{more}, {len(store.sweeps())} tarama")
+
+    def selected():
+        return [int(s) for s in tree.selection()]
+
+    def do_compare():
+        idx = selected()
+        if not idx:
+            return
+        with PERF.stage("store.compare"):
+            fig.clf()
+            ax_i, ax_v = fig.add_subplot(2, 1, 1), fig.add_subplot(2, 1, 2)
+            ids = store.column("id")
+            for i in idx:
+                w = store.waveform(i)
+                if w is None:
+                    continue  # toplu eklenen tasarımlarda dalga formu yok
+                label = f"#{ids[i]} {store.column('name')[i]}"
+                ax_i.plot(w[0] * 1e6, w[1], lw=1.2, label=label)
+                ax_v.plot(w[0] * 1e6, w[2], lw=1.2, label=label)
+            ax_i.set_title("Bobin Akımı (IL)", fontsize=FONT_BASE - 1)
+            ax_v.set_title("Çıkış Gerilimi", fontsize=FONT_BASE - 1)
+            ax_v.set_xlabel("Zaman (µs)", fontsize=FONT_BASE - 2)
+            for ax, unit in ((ax_i, "A"), (ax_v, "V")):
+                ax.set_ylabel(unit, fontsize=FONT_BASE - 2)
+                ax.grid(True)
+            if ax_i.lines:
+                ax_i.legend(loc="upper right", fontsize=FONT_BASE - 4)
+            fig.tight_layout()
+            canvas.draw()
+            delta_text.delete("1.0", tk.END)
+            delta_text.insert(tk.END, _compare_text(store, idx))
+
+    def load_selected():
+        idx = selected()
+        if not idx:
+            return
+        i = idx[0]
+        topo = store.topology(i)
+        _set_inputs(topo, store.calc_inputs(i))
+        notebook.select({"boost": frame_boost, "buck": frame_buck, "flyback": frame_f}[topo])
+        {"boost": do_boost_calc, "buck": do_buck_calc, "flyback": do_fly_calc}[topo]()
+
+    def delete_selected():
+        idx = selected()
+        if idx and messagebox.askyesno("Tasarım deposu", f"{len(idx)} tasarım silinsin mi?", parent=win):
+            store.delete(idx)
+            fill()
+
+    def export_parquet():
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=win, defaultextension=".parquet",
+                                            filetypes=[("Parquet", "*.parquet")])
+        if not path:
+            return
+        try:
+            topo = topo_var.get()
+            store.export_parquet(path, store.select(None if topo == "tümü" else topo))
+        except (OSError, RuntimeError) as e:
+            messagebox.showerror("Tasarım deposu", f"Dışa aktarılamadı: {e}", parent=win)
+
+    tk.Button(bar, text="Karşılaştır", font=LABEL_FONT, command=do_compare).pack(side="right", padx=4)
+    tk.Button(bar, text="Girişlere yükle", font=LABEL_FONT, command=load_selected).pack(side="right", padx=4)
+    tk.Button(bar, text="Sil", font=LABEL_FONT, command=delete_selected).pack(side="right", padx=4)
+    if parquet_available():
+        tk.Button(bar, text="Parquet...", font=LABEL_FONT, command=export_parquet).pack(side="right", padx=4)
+    topo_var.trace_add("write", lambda *a: fill())
+    tree.bind("<Double-1>", lambda e: do_compare())
+
+    def on_close():
+        _store_win.update(win=None, refresh=None)
+        win.destroy()
+
+    win.protocol("WM_DELETE_WINDOW", on_close)
+    _store_win["refresh"] = fill
+    fill()
+
+def _last_designs():
+    """Açılışta (worker thread'i): topoloji başına GUI'den kaydedilen (dalga formlu) son
+    tasarımın girişleri; toplu eklenen satırlar atlanır."""
+    from design_store import DesignStore, TOPOLOGIES
+    if not DesignStore.exists(STORE_DIR):
+        return {}
+    store = get_store()
+    out = {}
+    for topo in TOPOLOGIES:
+        i = store.latest(topo, {"wave_n": (1, None)})
+        if i is not None:
+            out[topo] = store.calc_inputs(i)
+    return out
+
+# ---------- Tanılama paneli (aşama süreleri, cProfile, JSON) ----------
+# Ölçüm kapalıyken PERF.stage / PERF.cycle boş nesne döndürür (kayıt yok). Panel açıkken
+# tablo 500 ms'de bir kayan pencere özetinden yenilenir; güncelleme kontrolü / indirme
+# worker thread'inde ölçülür, tabloya sadece buradan (ana thread) yansır.
+_diag = {"win": None}
+
+def _on_perf_cycle(name, total, laps):
+    status_var.set("Süre: " + format_cycle(name, total, laps))
+
+PERF.on_cycle = _on_perf_cycle  # döngüler ana thread'de biter
+
+def show_diagnostics():
+    if _diag["win"] is not None and _diag["win"].winfo_exists():
+        _diag["win"].lift()
+        return
+    win = tk.Toplevel(root)
+    _diag["win"] = win
+    win.title("Tanılama - aşama süreleri")
+    bar = tk.Frame(win)
+    bar.pack(side="top", fill="x", padx=8, pady=6)
+    enabled = tk.BooleanVar(value=PERF.enabled)
+    tk.Checkbutton(bar, text="Ölçüm açık", variable=enabled, font=LABEL_FONT,
+                   command=lambda: setattr(PERF, "enabled", enabled.get())).pack(side="left")
+    cols = ("aşama", "sayı", "son (ms)", "p50 (ms)", "p95 (ms)", "max (ms)", "toplam (s)",
+            "dağılım (1 µs … 10 s)")
+    tree = ttk.Treeview(win, columns=cols, show="headings", height=16)
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=200 if c == cols[-1] else (150 if c == cols[0] else 80),
+                    anchor="w" if c in (cols[0], cols[-1]) else "e")
+    tree.pack(side="top", fill="both", expand=True, padx=8)
+    info_var = tk.StringVar()
+    tk.Label(win, textvariable=info_var, anchor="w", font=LABEL_FONT).pack(fill="x", padx=8)
+    prof_text = tk.Text(win, height=12, font=MONO_FONT, wrap="none")
+
+    def fill():
+        tree.delete(*tree.get_children())
+        for name, st in PERF.snapshot().items():
+            tree.insert("", tk.END, values=(
+                name, st["count"], f"{st['last']*1e3:.2f}", f"{st['p50']*1e3:.2f}",
+                f"{st['p95']*1e3:.2f}", f"{st['max']*1e3:.2f}", f"{st['total']:.3f}",
+                sparkline(st["hist"])))
+        cyc = PERF.last_cycle
+        state = "açık" if PERF.enabled else "kapalı"
+        info_var.set(f"Ölçüm {state}" + (f"; son döngü: {format_cycle(*cyc)}" if cyc else "")
+                     + ("; cProfile kaydediyor..." if PERF.profiling else ""))
+
+    def tick():
+        if not win.winfo_exists():
+            return
+        fill()
+        win.after(500, tick)
 
-        out_f_text.configure(state="normal"); out_f_text.delete("1.0", tk.END)
-        out_f_text.insert(tk.END, f"--- Girilen (Flyback) ---\n")
-        out_f_text.insert(tk.END, f"Vin={Vin} V, Vout={Vout} V, f={freq/1e3} kHz\n")
-        out_f_text.insert(tk.END, f"Lm={Lm*1e6:.1f} µH, Ns/Np (girilen)={nsnp:.3f}, Iout={Iout:.3f} A\n\n")
-        out_f_text.insert(tk.END, f"Duty ~ {D:.5f}\n")
-        out_f_text.insert(tk.END, f"Önerilen Ns/Np (hesap) = {nsnp_req:.4f}\n")
-        out_f_text.insert(tk.END, f"Ipk (approx) = {Ipk:.3f} A\n")
-        out_f_text.insert(tk.END, f"Primer magnetizing ΔI (approx) = {delta_I_m:.3f} A\n")
-        out_f_text.insert(tk.END, f"Ortalama primer I ≈ {Iavg:.3f} A\n")
-        out_f_text.insert(tk.END, f"Çalışma modu: {mode}\n\n")
-        out_f_text.insert(tk.END, "(Not: Flyback hesapları ideal, gerçekte diyot düşümü, verim, çekirdek özellikleri önemlidir.)\n")
-        out_f_text.configure(state="disabled")
+    def toggle_profile():
+        if not PERF.profiling:
+            PERF.start_profile()
+            prof_btn.config(text="cProfile durdur")
+        else:
+            text = PERF.stop_profile()
+            prof_btn.config(text="cProfile başlat")
+            prof_text.delete("1.0", tk.END)
+            prof_text.insert(tk.END, text or "")
+            prof_text.pack(side="bottom", fill="both", expand=True, padx=8, pady=(0, 8))
+        fill()
+
+    def export():
+        from tkinter import filedialog
+        path = filedialog.asksaveasfilename(parent=win, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")],
+                                            initialfile=f"hesap_perf_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        if not path:
+            return
+        try:
+            PERF.export_json(path, version=LOCAL_VERSION, startup=STARTUP)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Tanılama", f"Kaydedilemedi: {e}", parent=win)
 
-        # grafik
-        fig_f.clf()
-        ax1 = fig_f.add_subplot(211); ax2 = fig_f.add_subplot(212)
-        t = np.linspace(0, 4.0 / freq, 800)
-        tri = triangle_wave(freq, t)
-        IL_wave = Iavg + (delta_I_m / 2.0) * tri
-        Vsec_wave = Vout * np.ones_like(t)
+    def reset():
+        PERF.reset()
+        fill()
 
-        ax1.plot(t * 1e6, IL_wave); ax1.set_title("Primer Bobin Akımı (approx) - Flyback", fontsize=FONT_BASE+1); ax1.set_ylabel("A", fontsize=FONT_BASE); ax1.grid(True)
-        ax2.plot(t * 1e6, Vsec_wave, color="green"); ax2.set_title("Sekonder Gerilim (approx) - Flyback", fontsize=FONT_BASE+1); ax2.set_ylabel("V", fontsize=FONT_BASE); ax2.set_xlabel("Zaman (µs)", fontsize=FONT_BASE); ax2.grid(True)
+    tk.Button(bar, text="Sıfırla", font=LABEL_FONT, command=reset).pack(side="left", padx=4)
+    prof_btn = tk.Button(bar, text="cProfile başlat", font=LABEL_FONT, command=toggle_profile)
+    prof_btn.pack(side="left", padx=4)
+    tk.Button(bar, text="JSON kaydet...", font=LABEL_FONT, command=export).pack(side="left", padx=4)
 
-        fig_f.tight_layout(); canvas_f.draw()
+    def on_close():
+        if PERF.profiling:
+            PERF.stop_profile()  # sahipsiz profil kalmasın
+        win.destroy()
 
-    except Exception as e:
-        messagebox.showerror("Hata (Flyback)", str(e))
+    win.protocol("WM_DELETE_WINDOW", on_close)
+    tick()
+
+btn_diag.config(command=show_diagnostics)
+btn_store.config(command=show_design_store)
+root.bind("<F12>", lambda e: show_diagnostics())
 
 # butonlara bağla
 btn_b_calc.config(command=do_boost_calc)
 btn_k_calc.config(command=do_buck_calc)
 btn_f_calc.config(command=do_fly_calc)
+btn_b_sim.config(command=lambda: do_sim("boost"))
+btn_k_sim.config(command=lambda: do_sim("buck"))
+btn_f_sim.config(command=lambda: do_sim("flyback"))
+btn_b_mc.config(command=lambda: do_monte_carlo("boost"))
+btn_k_mc.config(command=lambda: do_monte_carlo("buck"))
+btn_f_mc.config(command=lambda: do_monte_carlo("flyback"))
+btn_b_effmap.config(command=lambda: do_efficiency_map("boost"))
+btn_k_effmap.config(command=lambda: do_efficiency_map("buck"))
+btn_f_effmap.config(command=lambda: do_efficiency_map("flyback"))
+btn_b_opt.config(command=lambda: do_optimize("boost"))
+btn_k_opt.config(command=lambda: do_optimize("buck"))
+btn_f_opt.config(command=lambda: do_optimize("flyback"))
+btn_b_wave.config(command=lambda: do_long_waveform("boost"))
+btn_k_wave.config(command=lambda: do_long_waveform("buck"))
+btn_f_wave.config(command=lambda: do_long_waveform("flyback"))
+btn_b_capture.config(command=lambda: do_open_capture("Boost"))
+btn_k_capture.config(command=lambda: do_open_capture("Buck"))
+btn_f_capture.config(command=lambda: do_open_capture("Flyback"))
+btn_b_bode.config(command=lambda: do_bode("boost"))
+btn_k_bode.config(command=lambda: do_bode("buck"))
+btn_f_bode.config(command=lambda: do_bode("flyback"))
+btn_b_save.config(command=lambda: do_save_design("boost"))
+btn_k_save.config(command=lambda: do_save_design("buck"))
+btn_f_save.config(command=lambda: do_save_design("flyback"))
+
+# yük akımı slider'ları: sürüklerken canlı hesap + blit'li çizim (birleştirilmiş)
+slider_b_Iout.config(command=Coalescer(root, lambda: do_boost_calc(live=True)))
+slider_k_Iout.config(command=Coalescer(root, lambda: do_buck_calc(live=True)))
+
+# ---------- Tembel açılış ----------
+# Varsayılanlar (depoda kayıt varsa topoloji başına son tasarım) sekme ilk seçildiğinde
+# hesaplanır (<<NotebookTabChanged>>).
+tab_b.first_calc = do_boost_calc
+tab_k.first_calc = do_buck_calc
+tab_f.first_calc = do_fly_calc
+LAZY_TABS = [tab_b, tab_k, tab_f]  # notebook sırasıyla
+_backend_ready = threading.Event()
+
+def _mark(stage):
+    STARTUP[stage] = time.perf_counter() - _T_START
+    parts = [f"{name} {STARTUP[name]:.2f} s" for name in ("window", "backend", "interactive") if name in STARTUP]
+    status_var.set("Açılış: " + ", ".join(parts))
+    if stage == "interactive" and STARTUP_LOG:
+        try:
+            with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+                f.write(json.dumps(dict(STARTUP, version=LOCAL_VERSION)) + "\n")
+        except OSError:
+            pass
+    if stage == "interactive" and EXIT_AFTER_STARTUP:
+        root.after(0, root.destroy)
+
+def activate_selected_tab():
+    if not notebook.tabs() or not _backend_ready.is_set():
+        return  # arka plan yüklemesi bitince tekrar çağrılır
+    if LAZY_TABS[notebook.index("current")].activate() and "interactive" not in STARTUP:
+        root.update_idletasks()
+        _mark("interactive")
+
+def _on_tab_changed(event=None):
+    activate_selected_tab()
+
+def _backend_loaded(last=None):
+    _mark("backend")
+    for topology, inp in (last or {}).items():
+        _set_inputs(topology, inp)  # oturum sabit varsayılanlar yerine son kayıtlı tasarımla başlar
+    activate_selected_tab()
+
+def _preload_worker(f_clks):
+    last = None
+    try:
+        preload_backend(f_clks)
+        last = _last_designs()
+    except Exception:
+        pass  # eksik modül / bozuk depo hatası ilk kullanımda kullanıcıya gösterilir
+    _backend_ready.set()
+    root.after(0, _backend_loaded, last)
 
-# başta hepsi için bir hesap çalıştır (varsayılanları göster)
-try:
-    do_boost_calc()
-    do_buck_calc()
-    do_fly_calc()
-except Exception:
-    pass
+def _on_first_map(event):
+    if event.widget is not root or "window" in STARTUP:
+        return
+    root.update_idletasks()
+    _mark("window")
+    f_clks = set()
+    for entry in (entry_b_fclk, entry_k_fclk):  # Tk sadece ana thread'ten okunur
+        try:
+            f_clks.add(float(entry.get()))
+        except ValueError:
+            pass
+    threading.Thread(target=_preload_worker, args=(sorted(f_clks),), daemon=True).start()
+
+notebook.bind("<<NotebookTabChanged>>", _on_tab_changed)
+root.bind("<Map>", _on_first_map, add="+")
 
 # Başlangıçta güncelleme kontrolünü ayrı thread'te yap, ama modal istiyorsan blocking çağır
 def start_update_check_thread():
-    if not _HAS_REQUESTS:
-        return
     def worker():
         time.sleep(0.8)  # GUI açılışına kısa gecikme ver
         remote = check_update_available()
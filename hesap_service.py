@@ -0,0 +1,615 @@
+# hesap_service.py
+# Yerel HTTP/JSON hesap servisi (asyncio; sadece standart kütüphane + NumPy, Tk yok).
+# Eşzamanlı tekil istekler (tek çalışma noktası / tek timer) Coalescer'da toplanır ve
+# tek vektörel çağrıda hesaplanır (hesap_cli.process_chunk, timer_solver.solve_batch):
+# bir parti hesaplanırken gelenler bir sonraki partiye eklenir, yük arttıkça parti
+# büyür. Büyük sütun istekleri ve ızgara taramaları süreç havuzunda, küçük sütun
+# istekleri thread havuzunda çözülür (JSON çözme / kodlama dahil), olay döngüsü hiç
+# bloklanmaz. /metrics gecikme yüzdeliklerini, istek/s ve parti istatistiklerini verir.
+#
+#   python hesap_service.py --port 8765 --workers 2
+#   python hesap_service.py --load-test http://127.0.0.1:8765 --clients 64 --requests 20000
+#
+# Uç noktalar (gövde ve yanıt JSON; NaN -> null):
+#   POST /calc/boost|buck|flyback  {"Vin": 12, "Vout": 24, ..., "f_clk": 72e6}  -> tek nokta
+#   POST /timer                    {"f_clk": 72e6, "freq": 100e3 [, "psc" | "arr"]}
+#   POST /batch[/topoloji]         {"Vin": [...], "L": [...], "topology": "boost", ...} sütunlar
+#   POST /sweep                    {"topology", "axes": {ad: [değerler]}, "fixed": {...},
+#                                   "best": [{"axis", "objective", "minimize", "constraints"}]}
+#   GET  /metrics, GET /health
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from calc_cache import CALC_FUNCS
+from calc_core import BATCH_FUNCS
+from hesap_cli import RESULT_FIELDS, check_columns, process_chunk
+from sweep import BestPerAxis, Sweep, run_sweep
+from timer_solver import calc_timer, solve_batch
+
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW = 0.0          # s; ek bekleme (0 = aynı döngü turunda gelenler + hesap sürerken birikenler)
+DEFAULT_MAX_BATCH = 4096
+POOL_BYTES = 256 * 1024       # bundan büyük /batch gövdeleri süreç havuzuna gider
+MAX_BODY = 64 * 1024 * 1024
+MAX_SWEEP = 50_000_000
+LATENCY_WINDOW = 20_000       # yüzdelikler için uç nokta başına son N gecikme
+RATE_WINDOW = 10.0            # s; istek/s bu pencerede ölçülür
+PERCENTILES = (50, 90, 95, 99)
+_PARAMS = {t: inspect.signature(f).parameters for t, f in BATCH_FUNCS.items()}
+_KNOWN = {"f_clk"}.union(*(set(p) for p in _PARAMS.values()))
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _num(value, name):
+    if isinstance(value, bool) or value is None:
+        raise ValueError(f"{name} sayısal olmalı")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} sayısal olmalı: {value!r}") from None
+
+
+def _column_list(a):
+    a = np.asarray(a)
+    if a.dtype.kind == "f":
+        return [x if math.isfinite(x) else None for x in a.tolist()]  # JSON'da NaN yok
+    return a.tolist()
+
+
+def _dumps(obj):
+    return json.dumps(obj, allow_nan=False, separators=(",", ":")).encode()
+
+
+# ---------- Hesap işleri (olay döngüsü dışında çalışır) ----------
+def calc_point(topology, body):
+    """Tek nokta isteğini doğrula: eksiksiz parametre sözlüğü (+ f_clk) döndür."""
+    if topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    point = {"topology": topology}
+    for p, par in _PARAMS[topology].items():
+        if p in body and body[p] is not None:
+            point[p] = _num(body[p], p)
+        elif par.default is inspect.Parameter.empty:
+            raise ValueError(f"{topology} için eksik parametre: {p}")
+        else:
+            point[p] = float(par.default)
+    point["f_clk"] = _num(body["f_clk"], "f_clk") if body.get("f_clk") is not None else math.nan
+    return point
+
+
+def _invalid_reason(point):
+    """Geçersiz noktalar için tekil hesabın hata mesajı (nadir yol)."""
+    t = point["topology"]
+    params = inspect.signature(CALC_FUNCS[t]).parameters
+    kw = {k: v for k, v in point.items() if k in params and k != "f_clk" and math.isfinite(v)}
+    try:
+        CALC_FUNCS[t](**kw)
+    except (ValueError, ZeroDivisionError) as e:
+        return str(e) or "Geçersiz giriş"
+    return "Geçersiz giriş"
+
+
+def compute_points(points):
+    """Toplanmış tek nokta istekleri: tek process_chunk çağrısı, nokta başına sözlük."""
+    keys = {k for p in points for k in p}
+    columns = {k: np.array([p.get(k, math.nan) for p in points], dtype=float)
+               for k in keys if k != "topology"}
+    columns["topology"] = np.array([p["topology"] for p in points], dtype=str)
+    out = process_chunk(columns)
+    names = [n for n in RESULT_FIELDS + ("mode", "valid", "psc", "arr", "f_actual", "f_error")
+             if n in out]
+    cols = [_column_list(out[n]) for n in names]
+    rows = []
+    for i, values in enumerate(zip(*cols)):
+        row = {"topology": points[i]["topology"], **dict(zip(names, values))}
+        if points[i]["topology"] != "flyback":
+            row.pop("nsnp_req", None)
+        if not math.isfinite(points[i]["f_clk"]):
+            for k in ("psc", "arr", "f_actual", "f_error"):
+                row.pop(k, None)
+        elif row.get("psc", -1) < 0:
+            row["psc"] = row["arr"] = None
+        if not row["valid"]:
+            row["error"] = _invalid_reason(points[i])
+        rows.append(row)
+    return rows
+
+
+def compute_timers(requests):
+    """(f_clk, freq) çiftleri: f_clk başına tek solve_batch çağrısı."""
+    fclk = np.array([r[0] for r in requests], dtype=float)
+    freq = np.array([r[1] for r in requests], dtype=float)
+    rows = [None] * len(requests)
+    for fc in np.unique(fclk):
+        sel = np.flatnonzero(fclk == fc)
+        psc, arr, f_act, err = solve_batch(fc, freq[sel])
+        for j, i in enumerate(sel.tolist()):
+            if psc[j] < 0:
+                rows[i] = ValueError("Bu f_clk ile istenen PWM frekansı elde edilemiyor")
+            else:
+                rows[i] = {"psc": int(psc[j]), "arr": int(arr[j]), "f_clk": float(fc),
+                           "f_pwm": float(freq[sel][j]), "f_actual": float(f_act[j]),
+                           "error": float(err[j])}
+    return rows
+
+
+def batch_columns(body, topology=None):
+    """/batch gövdesi: listeler sütun, skalerler (ör. "topology", "f_clk") yayınlanır."""
+    if not isinstance(body, dict) or not body:
+        raise ValueError("Gövde sütun sözlüğü olmalı")
+    lengths = {len(v) for v in body.values() if isinstance(v, list)}
+    if len(lengths) > 1:
+        raise ValueError("Sütun uzunlukları farklı")
+    n = lengths.pop() if lengths else 1
+    columns = {}
+    for k, v in body.items():
+        if k == "topology":
+            columns[k] = np.asarray(v if isinstance(v, list) else [v] * n, dtype=str)
+        elif k in _KNOWN:
+            vals = v if isinstance(v, list) else [v] * n
+            try:
+                columns[k] = np.array([math.nan if x is None else x for x in vals], dtype=float)
+            except (TypeError, ValueError):
+                raise ValueError(f"{k} sütunu sayısal olmalı") from None
+        else:
+            columns[k] = np.asarray(v if isinstance(v, list) else [v] * n)
+    if topology is not None:
+        columns["topology"] = np.full(n, topology)
+    check_columns(columns, topology)
+    return columns
+
+
+def batch_job(body, topology=None):
+    """Ham gövde -> kodlanmış yanıt; süreç havuzunda da çalışabilir (çözme / kodlama dahil)."""
+    cols = process_chunk(batch_columns(json.loads(body), topology))
+    n = len(cols["valid"])
+    return _dumps({"n": n, "valid": int(np.count_nonzero(cols["valid"])),
+                   "columns": {k: _column_list(v) for k, v in cols.items()}})
+
+
+def sweep_job(body):
+    """Izgara taraması (tek süreçte, havuz işçisinde): özet + eksen başına en iyiler."""
+    req = json.loads(body)
+    if not isinstance(req, dict):
+        raise ValueError("Gövde sözlük olmalı")
+    sweep = Sweep(req.get("topology"), req.get("axes") or {}, req.get("fixed"))
+    if sweep.size > MAX_SWEEP:
+        raise ValueError(f"Izgara çok büyük: {sweep.size} nokta (sınır {MAX_SWEEP})")
+    reducers = []
+    for spec in req.get("best") or []:
+        if spec.get("axis") not in sweep.axes:
+            raise ValueError(f"Bilinmeyen eksen: {spec.get('axis')}")
+        cons = {k: tuple(v) for k, v in (spec.get("constraints") or {}).items()}
+        reducers.append(BestPerAxis(spec["axis"], spec.get("objective", "Ipk"),
+                                    bool(spec.get("minimize", True)), cons))
+    res = run_sweep(sweep, reducers=reducers, workers=1)
+    best = {name: [{"value": v, **item} for v, item in red.items()]
+            for name, red in res.reductions.items()}
+    return _dumps({"topology": sweep.topology, "size": sweep.size, "shape": list(sweep.shape),
+                   "elapsed": res.elapsed, "best": best})
+
+
+# ---------- Toplayıcı ----------
+class Coalescer:
+    """Tekil istekleri partiler halinde compute(items) -> sonuç listesi ile çözer.
+
+    İlk istekten window saniye sonra (window = 0 ise aynı döngü turunda, max_batch
+    dolunca hemen) parti başlar; hesap ayrı bir thread'de sürerken gelenler bir sonraki
+    partide toplanır, böylece bekleme eklemeden parti boyu yükle birlikte büyür. Sonuç listesindeki
+    Exception öğeleri ilgili isteğe hata olarak döner.
+    """
+
+    def __init__(self, compute, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 metrics=None, name="batch"):
+        self.compute = compute
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = metrics
+        self.name = name
+        self._pending = []
+        self._timer = None
+        self._running = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if not self._running:
+            if len(self._pending) >= self.max_batch or self.window <= 0:
+                self._schedule(loop, 0.0)
+            elif self._timer is None:
+                self._schedule(loop, self.window)
+        return fut
+
+    def _schedule(self, loop, delay):
+        if self._timer is None:
+            self._timer = (loop.call_later(delay, self._start, loop) if delay > 0
+                           else loop.call_soon(self._start, loop))
+
+    def _start(self, loop):
+        self._timer = None
+        if self._running or not self._pending:
+            return
+        batch = self._pending[:self.max_batch]
+        del self._pending[:self.max_batch]
+        self._running = True
+        t0 = time.perf_counter()
+        job = loop.run_in_executor(self._executor, self.compute, [item for item, _ in batch])
+        job.add_done_callback(lambda f: self._done(loop, batch, f, t0))
+
+    def _done(self, loop, batch, job, t0):
+        self._running = False
+        if self.metrics is not None:
+            self.metrics.observe_batch(self.name, len(batch), time.perf_counter() - t0)
+        exc = job.exception()
+        results = [exc] * len(batch) if exc is not None else job.result()
+        for (_, fut), r in zip(batch, results):
+            if fut.done():
+                continue  # istemci bağlantıyı kapattı
+            if isinstance(r, BaseException):
+                fut.set_exception(r)
+            else:
+                fut.set_result(r)
+        if self._pending:
+            self._schedule(loop, 0.0)  # bekleyenler zaten bir parti süresi bekledi
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+# ---------- Metrikler ----------
+class Metrics:
+    """Uç nokta başına sayaçlar, kayan pencere gecikme yüzdelikleri ve istek/s."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.monotonic()
+        self.requests = Counter()
+        self.errors = Counter()
+        self._latency = {}
+        self._window = window
+        self._recent = deque()
+        self.batches = Counter()
+        self.batch_items = Counter()
+        self.batch_max = Counter()
+        self.batch_time = Counter()
+        self.pool_jobs = 0
+        self.inflight = 0
+
+    def observe(self, route, status, dt):
+        now = time.monotonic()
+        self.requests[route] += 1
+        if status >= 400:
+            self.errors[route] += 1
+        lat = self._latency.get(route)
+        if lat is None:
+            lat = self._latency[route] = deque(maxlen=self._window)
+        lat.append(dt)
+        self._recent.append(now)
+        while self._recent and self._recent[0] < now - RATE_WINDOW:
+            self._recent.popleft()
+
+    def observe_batch(self, name, size, dt):
+        self.batches[name] += 1
+        self.batch_items[name] += size
+        self.batch_max[name] = max(self.batch_max[name], size)
+        self.batch_time[name] += dt
+
+    def snapshot(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        while self._recent and self._recent[0] < now - RATE_WINDOW:
+            self._recent.popleft()
+        routes = {}
+        for route, lat in self._latency.items():
+            a = np.fromiter(lat, dtype=float, count=len(lat)) * 1e3
+            routes[route] = {"requests": self.requests[route], "errors": self.errors[route],
+                             "latency_ms": {**{f"p{q}": float(v) for q, v in
+                                               zip(PERCENTILES, np.percentile(a, PERCENTILES))},
+                                            "mean": float(a.mean()), "max": float(a.max())}}
+        total = sum(self.requests.values())
+        return {"uptime_s": uptime, "requests": total, "inflight": self.inflight,
+                "throughput_rps": len(self._recent) / min(RATE_WINDOW, max(uptime, 1e-9)),
+                "mean_rps": total / uptime if uptime > 0 else 0.0,
+                "routes": routes,
+                "batches": {name: {"batches": n, "items": self.batch_items[name],
+                                   "mean_size": self.batch_items[name] / n,
+                                   "max_size": self.batch_max[name],
+                                   "mean_ms": 1e3 * self.batch_time[name] / n}
+                            for name, n in self.batches.items()},
+                "pool_jobs": self.pool_jobs}
+
+
+# ---------- Servis ----------
+class CalcService:
+    """HTTP/1.1 (keep-alive) üzerinden JSON hesap servisi.
+
+    workers: süreç havuzu boyutu (büyük /batch ve /sweep); 0 = havuz yok, bu işler
+    varsayılan thread havuzunda çalışır.
+    """
+
+    def __init__(self, workers=None, window=DEFAULT_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 pool_bytes=POOL_BYTES):
+        self.metrics = Metrics()
+        self.calc = Coalescer(compute_points, window, max_batch, self.metrics, "calc")
+        self.timer = Coalescer(compute_timers, window, max_batch, self.metrics, "timer")
+        self.pool_bytes = pool_bytes
+        workers = min(4, os.cpu_count() or 1) if workers is None else workers
+        self.pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self._client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.calc.close()
+        self.timer.close()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _offload(self, func, *args):
+        self.metrics.pool_jobs += 1
+        return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    # --- yönlendirme ---
+    async def dispatch(self, method, path, body):
+        """(durum, yanıt baytları)."""
+        parts = [p for p in path.split("?", 1)[0].split("/") if p]
+        route = parts[0] if parts else ""
+        if route in ("health", "metrics"):
+            if method != "GET":
+                raise HttpError(405, "GET bekleniyor")
+            return 200, _dumps({"ok": True} if route == "health" else self.metrics.snapshot())
+        if route not in ("calc", "timer", "batch", "sweep") or len(parts) > 2:
+            raise HttpError(404, f"Bilinmeyen yol: {path}")
+        if method != "POST":
+            raise HttpError(405, "POST bekleniyor")
+        topology = parts[1] if len(parts) > 1 else None
+        if route == "batch":
+            if len(body) > self.pool_bytes:
+                return 200, await self._offload(batch_job, body, topology)
+            # küçük gövdede süreç havuzu (pickle) masrafına değmez, ama JSON çözme / hesap
+            # yine de olay döngüsünü bloklamasın: varsayılan thread havuzunda
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(None, batch_job, body, topology)
+        if route == "sweep":
+            return 200, await self._offload(sweep_job, body)
+        req = json.loads(body or b"{}")
+        if not isinstance(req, dict):
+            raise ValueError("Gövde JSON nesnesi olmalı")
+        if route == "calc":
+            point = calc_point(topology or req.get("topology"), req)
+            return 200, _dumps(await self.calc.submit(point))
+        f_clk, freq = _num(req.get("f_clk"), "f_clk"), _num(req.get("freq"), "freq")
+        if f_clk <= 0 or freq <= 0:
+            raise ValueError("f_clk ve freq pozitif olmalı")
+        if req.get("psc") is not None or req.get("arr") is not None:
+            tr = calc_timer(f_clk, freq, req.get("psc"), req.get("arr"))
+            row = {"psc": tr.psc, "arr": tr.arr, "f_clk": tr.f_clk, "f_pwm": tr.f_pwm,
+                   "f_actual": tr.f_actual, "error": tr.error}
+        else:
+            row = await self.timer.submit((f_clk, freq))
+        return 200, _dumps(row)
+
+    # --- HTTP ---
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    req = await _read_request(reader)
+                except HttpError as e:
+                    await _write_response(writer, e.status, _dumps({"error": str(e)}), False)
+                    break
+                if req is None:
+                    break
+                method, path, headers, body = req
+                keep = headers.get("connection", "").lower() != "close"
+                t0 = time.perf_counter()
+                self.metrics.inflight += 1
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload = e.status, _dumps({"error": str(e)})
+                except (ValueError, TypeError, KeyError) as e:
+                    # json.JSONDecodeError da ValueError'dır
+                    status, payload = 400, _dumps({"error": str(e)})
+                except Exception as e:
+                    status, payload = 500, _dumps({"error": f"{type(e).__name__}: {e}"})
+                finally:
+                    self.metrics.inflight -= 1
+                await _write_response(writer, status, payload, keep)
+                self.metrics.observe(path.split("?", 1)[0].rstrip("/") or "/", status,
+                                     time.perf_counter() - t0)
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _read_request(reader):
+    """(method, path, headers, body) veya bağlantı kapandıysa None."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Geçersiz istek satırı") from None
+    headers = {}
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        headers[k.strip().lower()] = v.strip()
+    try:
+        n = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Geçersiz Content-Length") from None
+    if n > MAX_BODY:
+        raise HttpError(413, f"Gövde çok büyük (sınır {MAX_BODY} bayt)")
+    body = await reader.readexactly(n) if n else b""
+    return method.upper(), path, headers, body
+
+
+async def _write_response(writer, status, payload, keep):
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep else 'close'}\r\n\r\n")
+    writer.write(head.encode() + payload)
+    await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=None, window=DEFAULT_WINDOW,
+                max_batch=DEFAULT_MAX_BATCH, ready=None):
+    """Servisi çalıştır (iptal edilene kadar). ready(port) dinlemeye başlayınca çağrılır."""
+    service = CalcService(workers, window, max_batch)
+    port = await service.start(host, port)
+    if ready:
+        ready(port)
+    try:
+        await service.server.serve_forever()
+    finally:
+        await service.close()
+
+
+# ---------- Yük testi istemcisi ----------
+SAMPLE_INPUTS = {
+    "boost": {"Vin": 12.0, "Vout": 24.0, "freq": 100e3, "L": 100e-6, "C": 100e-6, "Iout": 1.0,
+              "ripI_pct": 0.2, "ripV_pct": 0.01},
+    "buck": {"Vin": 24.0, "Vout": 5.0, "freq": 200e3, "L": 47e-6, "C": 100e-6, "Iout": 2.0,
+             "ripI_val": 0.4, "ripV_val": 0.05},
+    "flyback": {"Vin": 48.0, "Vout": 12.0, "freq": 100e3, "Lm": 200e-6, "nsnp": 4.0, "Iout": 1.0,
+                "ripI_pct": 0.3, "ripV_pct": 0.01, "C": 220e-6},
+}
+
+
+async def _http(reader, writer, host, method, path, body=b""):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                  f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode()
+                 + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    n = 0
+    while True:
+        h = await reader.readline()
+        if h in (b"\r\n", b"\n", b""):
+            break
+        k, _, v = h.decode("latin-1").partition(":")
+        if k.strip().lower() == "content-length":
+            n = int(v)
+    return status, await reader.readexactly(n)
+
+
+async def load_test(url, clients=32, requests=10_000, topology="boost", f_clk=72e6, seed=0):
+    """Keep-alive bağlantılarla eşzamanlı tek nokta /calc yükü; istemci tarafı özet döndürür."""
+    u = urlsplit(url)
+    host, port = u.hostname or "127.0.0.1", u.port or DEFAULT_PORT
+    rng = random.Random(seed)
+    base = SAMPLE_INPUTS[topology]
+    bodies = [_dumps({**base, "Vin": base["Vin"] * rng.uniform(0.9, 1.1),
+                      "Iout": base["Iout"] * rng.uniform(0.2, 1.5), "f_clk": f_clk})
+              for _ in range(min(requests, 1024))]
+    latencies, errors = [], Counter()
+    counter = iter(range(requests))
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            for i in counter:
+                t0 = time.perf_counter()
+                status, _ = await _http(reader, writer, host, "POST", f"/calc/{topology}",
+                                        bodies[i % len(bodies)])
+                latencies.append(time.perf_counter() - t0)
+                if status != 200:
+                    errors[status] += 1
+        finally:
+            writer.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - t0
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, metrics = await _http(reader, writer, host, "GET", "/metrics")
+    finally:
+        writer.close()
+    a = np.array(latencies) * 1e3
+    return {"requests": len(latencies), "elapsed_s": elapsed, "rps": len(latencies) / elapsed,
+            "latency_ms": {f"p{q}": float(v) for q, v in zip(PERCENTILES, np.percentile(a, PERCENTILES))},
+            "errors": dict(errors), "server": json.loads(metrics)}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Boost / Buck / Flyback / Timer JSON hesap servisi")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=None,
+                    help="büyük işler için süreç sayısı (0 = havuz yok; varsayılan min(4, çekirdek))")
+    ap.add_argument("--window", type=float, default=DEFAULT_WINDOW * 1e3,
+                    help="parti toplama penceresi (ms, 0 = sadece eşzamanlı gelenler)")
+    ap.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    ap.add_argument("--load-test", metavar="URL", help="servis yerine yük testi istemcisi çalıştır")
+    ap.add_argument("--clients", type=int, default=32)
+    ap.add_argument("--requests", type=int, default=10_000)
+    ap.add_argument("--topology", choices=sorted(BATCH_FUNCS), default="boost")
+    args = ap.parse_args(argv)
+
+    if args.load_test:
+        try:
+            r = asyncio.run(load_test(args.load_test, args.clients, args.requests, args.topology))
+        except OSError as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 1
+        lat = r["latency_ms"]
+        print(f"{r['requests']} istek, {r['elapsed_s']:.2f} s, {r['rps']:,.0f} istek/s; "
+              + ", ".join(f"{k} {v:.2f} ms" for k, v in lat.items())
+              + (f"; hatalar {r['errors']}" if r["errors"] else ""))
+        b = r["server"]["batches"].get("calc")
+        if b:
+            print(f"Sunucu: {b['batches']} parti, ortalama {b['mean_size']:.1f} / en büyük "
+                  f"{b['max_size']} nokta, parti başına {b['mean_ms']:.2f} ms")
+        return 0
+
+    def ready(port):
+        print(f"Dinleniyor: http://{args.host}:{port}/  (Ctrl+C ile dur)", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.window / 1e3,
+                          args.max_batch, ready))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# instrument.py
+# Hafif sıcak yol ölçümü: hesap / çizim döngüsünün aşamaları (giriş okuma, kayıp modeli,
+# hesap, metin yazma, dalga formu, tight_layout, canvas.draw / blit), güncelleme kontrolü
+# ve indirme süreleri. Kapalıyken stage() / cycle() paylaşılan boş nesneler döndürür:
+# maliyet tek bayrak kontrolüdür (~0.1 µs), kayıt / bellek yoktur.
+# Açıkken aşama başına son WINDOW süre tutulur; yüzdelikler ve log aralıklı histogram
+# istek anında bu kayan pencereden hesaplanır. Kayıt thread-safe'tir (güncelleme işleri
+# worker thread'inde ölçülür). cProfile yakalama isteğe bağlıdır ve sadece başlatan
+# thread'i (GUI ana thread'i) profiller; JSON dışa aktarım özetleri ve profili içerir.
+# NumPy'a bağlı değildir; açılışta import edilebilir.
+
+import bisect
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+
+WINDOW = 512
+# 1 µs - 10 s, onluk başına 2 bin (1, 3.16, 10, ...); uçlar taşma binlerine düşer
+HIST_EDGES = tuple(10.0 ** (k / 2.0) for k in range(-12, 3))
+SPARK = "▁▂▃▄▅▆▇█"
+PROFILE_TOP = 25
+
+
+class _Null:
+    """Kapalıyken stage() ve cycle() yerine dönen boş nesne."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def lap(self, name):
+        pass
+
+    def done(self):
+        pass
+
+
+_NULL = _Null()
+
+
+class _Span:
+    __slots__ = ("_inst", "_name", "_t0")
+
+    def __init__(self, inst, name):
+        self._inst, self._name = inst, name
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._inst.record(self._name, time.perf_counter() - self._t0)
+        return False
+
+
+class Cycle:
+    """Bir hesap / çizim döngüsü: lap(ad) önceki lap'tan bu yana geçen süreyi
+    "<döngü>.<ad>" aşamasına yazar; done() toplamı "<döngü>" aşamasına yazar ve
+    kırılımı Instrument.last_cycle'a koyar. Hata ile yarıda kalan döngüde sadece
+    tamamlanan lap'lar kaydedilir."""
+
+    __slots__ = ("_inst", "name", "laps", "_t0", "_t")
+
+    def __init__(self, inst, name):
+        self._inst, self.name, self.laps = inst, name, []
+        self._t0 = self._t = time.perf_counter()
+
+    def lap(self, name):
+        t = time.perf_counter()
+        self.laps.append((name, t - self._t))
+        self._inst.record(f"{self.name}.{name}", t - self._t)
+        self._t = t
+
+    def done(self):
+        total = time.perf_counter() - self._t0
+        self._inst.record(self.name, total)
+        self._inst._cycle_done(self.name, total, self.laps)
+
+
+class _Stats:
+    __slots__ = ("count", "total", "max", "last", "window")
+
+    def __init__(self, window):
+        self.count = 0
+        self.total = self.max = self.last = 0.0
+        self.window = deque(maxlen=window)
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * q / 100.0
+    i = int(k)
+    j = min(i + 1, len(sorted_values) - 1)
+    return sorted_values[i] + (sorted_values[j] - sorted_values[i]) * (k - i)
+
+
+def histogram(values, edges=HIST_EDGES):
+    """Log aralıklı kutu sayıları; ilk / son kutu alt / üst taşmaları da içerir."""
+    counts = [0] * (len(edges) - 1)
+    for v in values:
+        i = bisect.bisect_right(edges, v) - 1
+        counts[min(max(i, 0), len(counts) - 1)] += 1
+    return counts
+
+
+def sparkline(counts):
+    """Histogramı tek satırlık blok karakterlere çevir (boş kutu = boşluk)."""
+    top = max(counts, default=0)
+    if not top:
+        return ""
+    return "".join(" " if c == 0 else SPARK[min(len(SPARK) - 1, (c * len(SPARK) - 1) // top)]
+                   for c in counts)
+
+
+class Instrument:
+    """Aşama süreleri + isteğe bağlı cProfile. enabled False iken hiçbir şey kaydedilmez."""
+
+    def __init__(self, window=WINDOW, enabled=False):
+        self.enabled = enabled
+        self.window = window
+        self.last_cycle = None     # (ad, toplam s, [(lap, s), ...])
+        self.on_cycle = None       # on_cycle(ad, toplam, laps); döngünün thread'inde çağrılır
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._profile = None
+        self._profile_text = None
+        self._profile_rows = None
+
+    # --- kayıt ---
+    def stage(self, name):
+        """with stage("plot.draw"): ... — kapalıyken boş bağlam."""
+        return _Span(self, name) if self.enabled else _NULL
+
+    def cycle(self, name):
+        """Lap'lı döngü ölçümü (kapalıyken lap / done boş)."""
+        return Cycle(self, name) if self.enabled else _NULL
+
+    def record(self, name, dt):
+        with self._lock:
+            s = self._stats.get(name)
+            if s is None:
+                s = self._stats[name] = _Stats(self.window)
+            s.count += 1
+            s.total += dt
+            s.last = dt
+            if dt > s.max:
+                s.max = dt
+            s.window.append(dt)
+
+    def _cycle_done(self, name, total, laps):
+        self.last_cycle = (name, total, list(laps))
+        if self.on_cycle is not None:
+            self.on_cycle(name, total, laps)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+        self.last_cycle = None
+
+    # --- özet ---
+    def snapshot(self):
+        """{aşama: {count, total, mean, last, max, p50, p95, p99, hist}} (s); pencere
+        istatistikleri son WINDOW ölçümden."""
+        with self._lock:
+            items = [(name, s.count, s.total, s.last, s.max, list(s.window))
+                     for name, s in self._stats.items()]
+        out = {}
+        for name, count, total, last, mx, win in sorted(items):
+            sv = sorted(win)
+            out[name] = {"count": count, "total": total, "mean": total / count, "last": last,
+                         "max": mx, "p50": _percentile(sv, 50), "p95": _percentile(sv, 95),
+                         "p99": _percentile(sv, 99), "hist": histogram(sv)}
+        return out
+
+    # --- cProfile ---
+    @property
+    def profiling(self):
+        return self._profile is not None
+
+    def start_profile(self):
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop_profile(self, path=None, top=PROFILE_TOP):
+        """Profili durdur; en pahalı top fonksiyonun metin özetini döndür.
+        path verilirse pstats dosyası (.prof) da yazılır (snakeviz vb. ile açılır)."""
+        prof, self._profile = self._profile, None
+        if prof is None:
+            return None
+        prof.disable()
+        if path:
+            prof.dump_stats(path)
+        buf = io.StringIO()
+        st = pstats.Stats(prof, stream=buf).sort_stats("cumulative")
+        st.print_stats(top)
+        self._profile_text = buf.getvalue()
+        rows = sorted(st.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top]
+        self._profile_rows = [{"function": f"{os.path.basename(fn)}:{line}({func})", "calls": nc,
+                               "tottime": tt, "cumtime": ct}
+                              for (fn, line, func), (cc, nc, tt, ct, _) in rows]
+        return self._profile_text
+
+    @property
+    def profile_text(self):
+        return self._profile_text
+
+    # --- dışa aktarım ---
+    def to_dict(self, **extra):
+        cyc = self.last_cycle
+        return {"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "enabled": self.enabled,
+                "window": self.window, "unit": "s", "hist_edges": list(HIST_EDGES),
+                "stages": self.snapshot(),
+                "last_cycle": None if cyc is None else {"name": cyc[0], "total": cyc[1],
+                                                        "laps": dict(cyc[2])},
+                "profile": self._profile_rows, **extra}
+
+    def export_json(self, path, **extra):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(**extra), f, indent=2, allow_nan=False,
+                      default=lambda x: None)
+        return path
+
+
+def format_cycle(name, total, laps):
+    """'boost 12.3 ms (parse 0.1 · math 0.2 · text 1.5 · plot 10.5)'"""
+    parts = " · ".join(f"{lap} {dt * 1e3:.1f}" for lap, dt in laps)
+    return f"{name} {total * 1e3:.1f} ms" + (f" ({parts})" if parts else "")
+
+
+# Uygulama geneli örnek; HESAP_PERF=1 ile açık başlar (ör. açılıştaki güncelleme kontrolü için)
+PERF = Instrument(enabled=bool(os.environ.get("HESAP_PERF")))
+stage = PERF.stage
+cycle = PERF.cycle
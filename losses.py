@@ -0,0 +1,225 @@
+# losses.py
+# Kayıp ve verim modeli (boost / buck / flyback), tamamen vektörel.
+# Kayıp kalemleri: MOSFET iletim (Rds_on) ve anahtarlama (V·I·t_sw·f/2 + Coss·V²·f/2),
+# kapı sürme (Qg·V_drive·f), diyot (Vf·I + Rd·I² + Qrr·V·f), bobin / trafo bakırı (DCR),
+# çıkış kondansatörü ESR'si ve Steinmetz çekirdek kaybı (Pv = k·f^α·B̂^β, B̂ = ΔB/2).
+# Akım dalga biçimleri CCM yamuk yaklaşımıyla (I_rms² = d·(I² + ΔI²/12)) hesaplanır.
+#
+# Verim akımlara, akımlar verime bağlıdır: calc_core.*_batch eff ile tekrar tekrar
+# çağrılıp η = Pout / (Pout + Pkayıp) sabit noktasına gidilir (birkaç iterasyon).
+# Girişler NumPy yayınlama kurallarına uyar; Vin × Iout × f ızgarası tek çağrıda çözülür.
+
+import inspect
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS
+
+ITERATIONS = 12
+TOL = 1e-7
+CONVERGED = 1e-4   # bu kadar tutarsız kalan noktalar (yakınsamayan) geçersiz sayılır
+LOSS_TERMS = ("P_cond", "P_sw", "P_gate", "P_diode", "P_cu", "P_core", "P_esr", "P_fixed")
+
+
+@dataclass(frozen=True)
+class LossParams:
+    """Yarı iletken, manyetik ve kondansatör parametreleri (SI birimleri)."""
+    Rds_on: float = 0.02      # Ω
+    t_sw: float = 30e-9       # s, yükselme + düşme
+    Coss: float = 300e-12     # F
+    Qg: float = 40e-9         # C
+    V_drive: float = 12.0     # V
+    Vf: float = 0.6           # V, diyot iletim düşümü
+    Rd: float = 0.0           # Ω, diyot dinamik direnci
+    Qrr: float = 50e-9        # C, ters toparlanma yükü
+    DCR: float = 0.01         # Ω, bobin / primer sargı direnci
+    ESR: float = 0.03         # Ω, çıkış kondansatörü
+    N: float = 20.0           # sarım (flyback'te primer)
+    Ae: float = 100e-6        # m², çekirdek kesiti
+    Ve: float = 5e-6          # m³, çekirdek hacmi
+    k_core: float = 2.5       # Steinmetz k (W/m³, f [Hz], B [T]); tipik ferrit
+    alpha: float = 1.4
+    beta: float = 2.5
+    P_fixed: float = 0.0      # W, denetleyici vb. sabit kayıp
+
+
+DEFAULT_LOSS_PARAMS = LossParams()
+
+
+@dataclass
+class LossBreakdown:
+    """Kalem kalem kayıplar (W), verim ve kayıplı çalışma noktası; alanlar dizi veya float."""
+    eff: np.ndarray
+    Pout: np.ndarray
+    P_total: np.ndarray
+    P_cond: np.ndarray
+    P_sw: np.ndarray
+    P_gate: np.ndarray
+    P_diode: np.ndarray
+    P_cu: np.ndarray
+    P_core: np.ndarray
+    P_esr: np.ndarray
+    P_fixed: np.ndarray
+    Iin: np.ndarray        # ortalama giriş akımı
+    D: np.ndarray
+    Ipk: np.ndarray
+    B_pk: np.ndarray       # ΔB/2 (T)
+    valid: np.ndarray
+    iterations: int = 0
+
+    def item(self):
+        """Tek noktalı sonucu float alanlara çevir."""
+        return LossBreakdown(**{f.name: (getattr(self, f.name).item() if f.name != "iterations"
+                                         else self.iterations) for f in fields(self)})
+
+
+def _batch_kwargs(topology, inputs):
+    params = inspect.signature(BATCH_FUNCS[topology]).parameters
+    kw = {k: v for k, v in inputs.items() if k in params and k != "eff" and v is not None}
+    kw.setdefault("C", np.nan)  # ΔVout kayıp hesabında kullanılmaz
+    return kw
+
+
+def loss_terms(topology, res, inputs, params=DEFAULT_LOSS_PARAMS):
+    """Verilen (kayıplı) çalışma noktası için kayıp kalemleri {ad: dizi}.
+
+    res: calc_core.*_batch sonucu; inputs: aynı çağrının girişleri.
+    """
+    p = params
+    Vin, Vout = np.asarray(inputs["Vin"], float), np.asarray(inputs["Vout"], float)
+    Iout, freq = np.asarray(inputs["Iout"], float), np.asarray(inputs["freq"], float)
+    L = np.asarray(inputs["Lm" if topology == "flyback" else "L"], float)
+    D, dI, IL = res.D, res.delta_IL, res.IL_avg
+    ripple2 = dI * dI / 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if topology == "boost":
+            V_sw, I_sw, V_rr = Vout, IL, Vout
+            sw_rms2 = D * (IL * IL + ripple2)
+            d_avg = IL * (1.0 - D)
+            d_rms2 = (1.0 - D) * (IL * IL + ripple2)
+            cu_rms2 = IL * IL + ripple2
+            cap_rms2 = np.maximum(0.0, d_rms2 - Iout * Iout)
+        elif topology == "buck":
+            V_sw, I_sw, V_rr = Vin, IL, Vin
+            sw_rms2 = D * (IL * IL + ripple2)
+            d_avg = IL * (1.0 - D)
+            d_rms2 = (1.0 - D) * (IL * IL + ripple2)
+            cu_rms2 = IL * IL + ripple2
+            cap_rms2 = ripple2
+        elif topology == "flyback":
+            # yansıyan gerilim volt-saniye dengesinden; sarım oranı ondan türetilir (kural bağımsız)
+            V_refl = Vin * D / (1.0 - D)
+            ratio = V_refl / Vout                   # = Np/Ns, sekonder akım = primer * ratio
+            I_sw = IL / D                           # iletim sırasında ortalama primer akım
+            V_sw, V_rr = Vin + V_refl, Vout + Vin / ratio
+            sw_rms2 = D * (I_sw * I_sw + ripple2)
+            I_sec = Iout / (1.0 - D)
+            d_avg = Iout
+            d_rms2 = (1.0 - D) * (I_sec * I_sec + ripple2 * ratio * ratio)
+            cu_rms2 = sw_rms2 + d_rms2 / (ratio * ratio)  # sekonder bakır primere yansıtılmış
+            cap_rms2 = np.maximum(0.0, d_rms2 - Iout * Iout)
+        else:
+            raise ValueError(f"Bilinmeyen topoloji: {topology}")
+        B_pk = L * dI / (2.0 * p.N * p.Ae)
+    return {"P_cond": p.Rds_on * sw_rms2,
+            "P_sw": 0.5 * V_sw * I_sw * p.t_sw * freq + 0.5 * p.Coss * V_sw * V_sw * freq,
+            "P_gate": p.Qg * p.V_drive * freq * np.ones_like(D),
+            "P_diode": p.Vf * d_avg + p.Rd * d_rms2 + p.Qrr * V_rr * freq,
+            "P_cu": p.DCR * cu_rms2,
+            "P_core": p.k_core * freq ** p.alpha * np.abs(B_pk) ** p.beta * p.Ve,
+            "P_esr": p.ESR * cap_rms2,
+            "P_fixed": np.full(np.shape(D), float(p.P_fixed)),
+            "B_pk": B_pk}
+
+
+def efficiency_batch(topology, inputs, params=DEFAULT_LOSS_PARAMS, iterations=ITERATIONS, tol=TOL):
+    """Kayıp modeli ile tutarlı verim: η = Pout / (Pout + ΣP(η)) sabit noktası.
+
+    inputs: *_batch argümanları (dizi veya skaler; fazlası / eff yok sayılır).
+    Geçersiz ya da sabit noktası bulunamayan (ör. kayıplarla duty >= 1) noktalar
+    NaN / valid=False döner.
+    """
+    if topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    func = BATCH_FUNCS[topology]
+    kw = _batch_kwargs(topology, inputs)
+    kw = dict(zip(kw, np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in kw.values()))))
+    Pout = kw["Vout"] * kw["Iout"]
+    eff = np.ones_like(Pout)
+    it = 0
+    for it in range(1, iterations + 1):
+        res = func(**kw, eff=eff)
+        terms = loss_terms(topology, res, kw, params)
+        P_total = sum(terms[k] for k in LOSS_TERMS)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new = Pout / (Pout + P_total)
+        # geçersizleşen noktalar (ör. buck'ta D >= 1) son değerde kalır, sonda elenir
+        new = np.clip(np.where(np.isfinite(new), new, eff), 0.05, 1.0)
+        done = np.nanmax(np.abs(new - eff), initial=0.0) < tol
+        eff = new
+        if done:
+            break
+    res = func(**kw, eff=eff)
+    terms = loss_terms(topology, res, kw, params)
+    P_total = sum(terms[k] for k in LOSS_TERMS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Iin = (Pout + P_total) / kw["Vin"]
+        consistent = np.abs(Pout / (Pout + P_total) - eff) < CONVERGED
+    valid = res.valid & np.isfinite(P_total) & (Pout > 0) & consistent
+    nan = lambda a: np.where(valid, a, np.nan)
+    return LossBreakdown(eff=nan(eff), Pout=nan(Pout), P_total=nan(P_total),
+                         **{k: nan(terms[k]) for k in LOSS_TERMS},
+                         Iin=nan(Iin), D=nan(res.D), Ipk=nan(res.Ipk), B_pk=nan(terms["B_pk"]),
+                         valid=valid, iterations=it)
+
+
+def efficiency(topology, inputs, params=DEFAULT_LOSS_PARAMS):
+    """Tek çalışma noktası (skaler girişler) için LossBreakdown (float alanlar)."""
+    lb = efficiency_batch(topology, inputs, params)
+    if not lb.valid.all():
+        raise ValueError("Kayıp modeli bu giriş değerleri için çözülemedi.")
+    return lb.item()
+
+
+@dataclass
+class EfficiencyMap:
+    """Vin × Iout × f ızgarasında verim; eff[f, Vin, Iout]."""
+    topology: str
+    Vin: np.ndarray
+    Iout: np.ndarray
+    freq: np.ndarray
+    eff: np.ndarray
+    P_total: np.ndarray
+
+    @property
+    def size(self):
+        return self.eff.size
+
+    def slice_at(self, freq):
+        """En yakın frekans dilimi: (indeks, eff[Vin, Iout])."""
+        i = int(np.argmin(np.abs(self.freq - freq)))
+        return i, self.eff[i]
+
+
+def efficiency_map(topology, inputs, Vin, Iout, freq, params=DEFAULT_LOSS_PARAMS):
+    """Nominal girişlerde Vin, Iout ve freq eksenlerini tarayarak verim küpü (tek vektörel çağrı)."""
+    Vin, Iout, freq = (np.atleast_1d(np.asarray(a, dtype=float)) for a in (Vin, Iout, freq))
+    kw = dict(inputs, Vin=Vin[None, :, None], Iout=Iout[None, None, :], freq=freq[:, None, None])
+    lb = efficiency_batch(topology, kw, params)
+    return EfficiencyMap(topology, Vin, Iout, freq, lb.eff, lb.P_total)
+
+
+def map_axes(topology, inputs, n_vin=64, n_iout=64, n_f=33):
+    """Nominal nokta etrafında makul tarama eksenleri (Vin ±%50, Iout %5-%150, f /4..x4)."""
+    Vin, Vout, Iout, f = (float(inputs[k]) for k in ("Vin", "Vout", "Iout", "freq"))
+    lo, hi = 0.5 * Vin, 1.5 * Vin
+    if topology == "boost":
+        hi = min(hi, Vout * (1.0 - 1e-3))
+    elif topology == "buck":
+        lo = max(lo, Vout * (1.0 + 1e-3))
+    if not lo < hi:
+        lo, hi = Vin, Vin * (1.0 + 1e-3)
+    return (np.linspace(lo, hi, n_vin), np.linspace(0.05 * Iout, 1.5 * Iout, n_iout),
+            np.geomspace(f / 4.0, f * 4.0, n_f))
+
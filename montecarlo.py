@@ -0,0 +1,229 @@
+# montecarlo.py
+# Üretim toleransı / yield analizi (Monte Carlo) — boost / buck / flyback.
+# L, C, Vin, Iout (flyback'te L = Lm) nominal değerler etrafında dağılımlardan
+# örneklenir ve calc_core.*_batch ile tamamen vektörel hesaplanır. Örnekler parça
+# parça üretilir; her parça sabit kenarlı histogramlara ve toplamlara eklenip atılır,
+# böylece bellek örnek sayısından bağımsız kalır (1e7 örnek ~ birkaç saniye).
+# Parça k'nın rastgele akışı SeedSequence(seed).spawn ile türetilir: aynı seed ve
+# chunk_size her zaman aynı sonucu verir. Histogram kenarları ilk parçadan belirlenir.
+
+import inspect
+import math
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS, spec_limits
+
+DEFAULT_CHUNK = 1 << 18
+HIST_BINS = 1024
+PERCENTILES = (1, 5, 50, 95, 99)
+METRICS = ("delta_IL", "delta_Vout", "ccm_margin")
+
+
+@dataclass(frozen=True)
+class Tolerance:
+    """Nominale göre bağıl dağılım: değer = nominal * (1 + shift + e).
+
+    uniform: e ~ U(-rel, +rel); normal: e ~ N(0, rel/3) (rel = 3σ sınırı).
+    shift sistematik kaymadır (ör. elektrolitik yaşlanması için -0.1).
+    """
+    rel: float
+    dist: str = "uniform"
+    shift: float = 0.0
+
+    def sample(self, rng, n):
+        if self.dist == "uniform":
+            e = rng.uniform(-self.rel, self.rel, n)
+        elif self.dist == "normal":
+            e = rng.normal(0.0, self.rel / 3.0, n)
+        else:
+            raise ValueError(f"Bilinmeyen dağılım: {self.dist}")
+        return 1.0 + self.shift + e
+
+
+# endüktörler ±%20, elektrolitikler ±%20 ve -%10 yaşlanma, giriş ±%5 (3σ), yük ±%10
+DEFAULT_TOLERANCES = {"L": Tolerance(0.2), "C": Tolerance(0.2, shift=-0.1),
+                      "Vin": Tolerance(0.05, "normal"), "Iout": Tolerance(0.1)}
+
+
+def _param_name(topology, name):
+    return "Lm" if topology == "flyback" and name == "L" else name
+
+
+@dataclass
+class MetricStats:
+    name: str
+    n: int                 # sonlu örnek sayısı
+    mean: float
+    std: float
+    min: float
+    max: float
+    percentiles: dict      # {q: değer}, histogramdan (hata <= bir bin genişliği)
+    edges: np.ndarray
+    counts: np.ndarray
+    under: int = 0         # kenarların dışında kalanlar
+    over: int = 0
+
+
+class _Accumulator:
+    """Tek metrik için akan (streaming) histogram + moment toplayıcı."""
+
+    def __init__(self, name, pilot, bins=HIST_BINS):
+        self.name = name
+        v = pilot[np.isfinite(pilot)]
+        if len(v):
+            lo, hi = np.quantile(v, [0.0005, 0.9995])
+            span = (hi - lo) or abs(hi) * 0.01 or 1.0
+            lo, hi = lo - 0.25 * span, hi + 0.25 * span
+        else:
+            lo, hi = 0.0, 1.0
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.n = self.under = self.over = 0
+        self.s1 = self.s2 = 0.0
+        self.vmin, self.vmax = math.inf, -math.inf
+        self._shift = float(np.median(v)) if len(v) else 0.0  # sayısal kararlılık için merkez
+
+    def add(self, values):
+        v = values[np.isfinite(values)]
+        if not len(v):
+            return
+        self.n += len(v)
+        d = v - self._shift
+        self.s1 += float(d.sum())
+        self.s2 += float(np.dot(d, d))
+        self.vmin = min(self.vmin, float(v.min()))
+        self.vmax = max(self.vmax, float(v.max()))
+        self.under += int(np.count_nonzero(v < self.edges[0]))
+        self.over += int(np.count_nonzero(v > self.edges[-1]))
+        self.counts += np.histogram(v, bins=self.edges)[0]
+
+    def percentile(self, q):
+        if self.n == 0:
+            return math.nan
+        target = q / 100.0 * self.n
+        if target <= self.under:
+            return self.vmin
+        cum = self.under + np.cumsum(self.counts)
+        i = int(np.searchsorted(cum, target))
+        if i >= len(self.counts):
+            return self.vmax
+        prev = cum[i - 1] if i else self.under
+        frac = (target - prev) / self.counts[i] if self.counts[i] else 0.0
+        return float(self.edges[i] + frac * (self.edges[i + 1] - self.edges[i]))
+
+    def stats(self, percentiles=PERCENTILES):
+        if self.n:
+            mean = self._shift + self.s1 / self.n
+            var = max(0.0, self.s2 / self.n - (self.s1 / self.n) ** 2)
+        else:
+            mean = var = math.nan
+        return MetricStats(self.name, self.n, mean, math.sqrt(var), self.vmin, self.vmax,
+                           {q: self.percentile(q) for q in percentiles},
+                           self.edges, self.counts, self.under, self.over)
+
+
+@dataclass
+class MonteCarloResult:
+    topology: str
+    n: int                 # hesaplanan örnek sayısı
+    seed: int
+    limits: tuple          # (ΔI_max, ΔV_max)
+    require_ccm: bool
+    passed: int = 0
+    fail_dI: int = 0       # kısıtlar örtüşebilir; toplamı n'i aşabilir
+    fail_dV: int = 0
+    dcm: int = 0
+    invalid: int = 0
+    metrics: dict = field(default_factory=dict)   # {ad: MetricStats}
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def yield_(self):
+        return self.passed / self.n if self.n else math.nan
+
+    def yield_ci(self, z=1.96):
+        """Yield için Wilson güven aralığı (alt, üst)."""
+        if not self.n:
+            return math.nan, math.nan
+        p, n = self.yield_, self.n
+        den = 1 + z * z / n
+        mid = (p + z * z / (2 * n)) / den
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / den
+        return mid - half, mid + half
+
+    @property
+    def throughput(self):
+        return self.n / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _chunk_inputs(topology, nominal, tolerances, rng, n):
+    kw = dict(nominal)
+    for name, tol in tolerances.items():
+        p = _param_name(topology, name)
+        kw[p] = nominal[p] * tol.sample(rng, n)
+    return kw
+
+
+def run_monte_carlo(topology, nominal, tolerances=None, n=100_000, seed=0,
+                    chunk_size=DEFAULT_CHUNK, require_ccm=False, bins=HIST_BINS,
+                    progress=None, cancel_event=None):
+    """nominal: *_batch argümanları (skaler; fazlası yok sayılır, ör. f_clk).
+
+    tolerances: {"L"|"C"|"Vin"|"Iout"|...: Tolerance}; None = DEFAULT_TOLERANCES.
+    Yield: geçerli, ΔIL <= ΔI_max ve ΔVout <= ΔV_max (require_ccm ise CCM de) örnek oranı.
+    """
+    if topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    func = BATCH_FUNCS[topology]
+    params = inspect.signature(func).parameters
+    nominal = {k: float(v) for k, v in nominal.items() if k in params and v is not None}
+    tolerances = DEFAULT_TOLERANCES if tolerances is None else tolerances
+    for name in tolerances:
+        if _param_name(topology, name) not in nominal:
+            raise ValueError(f"{topology} için bilinmeyen parametre: {name}")
+    n = int(n)
+    if n <= 0:
+        raise ValueError("Örnek sayısı pozitif olmalı")
+    dI_max, dV_max = spec_limits(topology, nominal)
+    result = MonteCarloResult(topology, 0, seed, (dI_max, dV_max), require_ccm)
+
+    bounds = [(s, min(s + chunk_size, n)) for s in range(0, n, chunk_size)]
+    streams = np.random.SeedSequence(seed).spawn(len(bounds))
+    acc = None
+    t0 = time.perf_counter()
+    for (s, e), ss in zip(bounds, streams):
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+            break
+        rng = np.random.default_rng(ss)
+        res = func(**_chunk_inputs(topology, nominal, tolerances, rng, e - s))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = {"delta_IL": res.delta_IL, "delta_Vout": res.delta_Vout,
+                      "ccm_margin": res.IL_min / res.IL_avg}
+        if acc is None:
+            acc = {k: _Accumulator(k, v, bins) for k, v in values.items()}
+        for k, v in values.items():
+            acc[k].add(v)
+
+        ok_dI = res.delta_IL <= dI_max
+        ok_dV = res.delta_Vout <= dV_max
+        if topology == "flyback" and np.isnan(nominal.get("C", np.nan)):
+            ok_dV = np.ones_like(ok_dI)  # C verilmedi: ΔV kısıtı uygulanamaz
+        ok = res.valid & ok_dI & ok_dV
+        if require_ccm:
+            ok &= res.ccm
+        result.passed += int(np.count_nonzero(ok))
+        result.fail_dI += int(np.count_nonzero(res.valid & ~ok_dI))
+        result.fail_dV += int(np.count_nonzero(res.valid & ~ok_dV))
+        result.dcm += int(np.count_nonzero(res.valid & ~res.ccm))
+        result.invalid += int(np.count_nonzero(~res.valid))
+        result.n += e - s
+        if progress:
+            progress(result.n, n)
+    result.elapsed = time.perf_counter() - t0
+    result.metrics = {k: a.stats() for k, a in (acc or {}).items()}
+    return result
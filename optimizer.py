@@ -0,0 +1,363 @@
+# optimizer.py
+# Otomatik tasarım: f, L (flyback'te Lm), C ve Ns/Np seçimi (boost / buck / flyback).
+# Tasarım Vin ve Iout aralığının köşelerinde (Vin min/orta/maks × Iout min/maks) en
+# kötü duruma göre değerlendirilir: ΔIL <= ΔI_max, D <= D_max, B̂ <= B_max ve geçerli çalışma.
+# Kayıp C'ye bağlı olmadığından C aranmaz; ΔV kısıtını sağlayan en küçük değer
+# analitik bulunur ve E12 serisine yukarı yuvarlanır. Frekanslar sadece timer'ın
+# PSC/ARR ile gerçekleyebildiği değerlerden seçilir (timer_solver.solve_batch; PSC
+# veya ARR sabitse f_clk / ((PSC+1)(ARR+1)) ailesi).
+#
+# Arama iki aşamalıdır: kaba vektörel ızgara (f × L(E6) × Ns/Np tek NumPy çağrısı),
+# sonra Pareto cephesindeki tohumlar etrafında ince yerel ızgaralar (f komşuluğu,
+# L(E24), Ns/Np) paralel çalışır. Sonuç kayıp / hacim / maliyet Pareto cephesidir,
+# seçilen amaca göre sıralanır.
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS, spec_limits
+from losses import DEFAULT_LOSS_PARAMS, LossParams, efficiency_batch
+from timer_solver import solve_batch
+
+E6 = np.array([1.0, 1.5, 2.2, 3.3, 4.7, 6.8])
+E12 = np.array([1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2])
+E24 = np.array([1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0,
+                3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1])
+OBJECTIVES = ("loss", "volume", "cost")
+COARSE_F = 16
+COARSE_NSNP = 12
+REFINE_SEEDS = 8
+REFINE_F = 11
+REFINE_NSNP = 9
+
+
+@dataclass(frozen=True)
+class SizeCostModel:
+    """Kaba boyut / maliyet modeli; katalog verisiyle ayarlanabilir.
+
+    Bobin / trafo hacmi depolanan enerjinin 3/4 kuvvetiyle (alan-çarpım kuralı),
+    kondansatör hacmi C·V_nominal ile ölçeklenir. Maliyet ayrıca kayıp başına
+    soğutma maliyeti içerir.
+    """
+    K_L: float = 30.0          # mm³ / µJ^0.75
+    K_C: float = 0.065         # mm³ / (µF·V)
+    V_derating: float = 1.25   # kondansatör gerilim değeri = 1.25 * Vout
+    cost_L: float = 0.004      # birim / µJ^0.75
+    cost_C: float = 2e-5       # birim / (µF·V)
+    cost_W: float = 0.5        # birim / W (soğutucu)
+
+
+DEFAULT_SIZE_MODEL = SizeCostModel()
+
+
+@dataclass(frozen=True)
+class DesignSpec:
+    """Optimizasyon girdileri. Tolerans alanları calc_core ile aynı birimlerdedir:
+    boost / flyback için ripI_pct / ripV_pct (oran), buck için ripI_val (A) / ripV_val (V).
+    """
+    topology: str
+    Vin: tuple                  # (min, maks)
+    Vout: float
+    Iout: tuple                 # (min, maks)
+    ripI: float
+    ripV: float
+    f_range: tuple = (5e3, 200e3)
+    L_range: tuple = (1e-6, 10e-3)
+    nsnp_range: tuple = (0.2, 5.0)
+    f_clk: float = 72e6
+    psc: int = None             # sabit PSC (None = serbest)
+    arr: int = None             # sabit ARR (None = serbest)
+    D_max: float = 0.9
+    B_max: float = 0.3          # T, çekirdek doyma sınırı (B̂ = ΔB/2)
+    loss_params: LossParams = DEFAULT_LOSS_PARAMS
+    size_model: SizeCostModel = DEFAULT_SIZE_MODEL
+
+    def operating_points(self):
+        """Köşe çalışma noktaları: Vin (min, orta, maks) × Iout (min, maks)."""
+        vin = np.unique([self.Vin[0], 0.5 * (self.Vin[0] + self.Vin[1]), self.Vin[1]])
+        iout = np.unique([self.Iout[0], self.Iout[1]])
+        v, i = np.meshgrid(vin, iout, indexing="ij")
+        return v.ravel(), i.ravel()
+
+
+@dataclass(frozen=True)
+class Design:
+    topology: str
+    freq: float        # gerçek PWM frekansı (PSC/ARR ile)
+    psc: int
+    arr: int
+    L: float           # flyback'te Lm
+    C: float
+    nsnp: float        # boost / buck için NaN
+    loss: float        # W, köşelerdeki en kötü toplam kayıp
+    eff: float         # tam yükte, orta Vin'de
+    volume: float      # mm³ (bobin/trafo + kondansatör)
+    cost: float
+    Ipk: float         # A, köşelerdeki en büyük tepe akım
+    D_worst: float
+    stage: str = "kaba"
+
+    def objective(self, name):
+        return getattr(self, name)
+
+    def calc_inputs(self):
+        """GUI giriş alanlarına yüklenecek değerler (calc_core argüman adlarıyla)."""
+        d = {"freq": self.freq, "C": self.C}
+        if self.topology == "flyback":
+            d.update(Lm=self.L, nsnp=self.nsnp)
+        else:
+            d["L"] = self.L
+        return d
+
+
+@dataclass
+class OptimizeResult:
+    spec: DesignSpec
+    objective: str
+    front: list = field(default_factory=list)   # Pareto cephesi, amaca göre artan
+    evaluated: int = 0                          # değerlendirilen tasarım sayısı
+    feasible: int = 0
+    elapsed: float = 0.0
+    coarse_elapsed: float = 0.0
+
+    @property
+    def best(self):
+        return self.front[0] if self.front else None
+
+
+# ---------- Yardımcılar ----------
+def series_values(lo, hi, series=E12):
+    """[lo, hi] aralığındaki standart seri değerleri."""
+    decades = range(math.floor(math.log10(lo)) - 1, math.ceil(math.log10(hi)) + 1)
+    vals = np.concatenate([series * 10.0 ** d for d in decades])
+    return vals[(vals >= lo * (1 - 1e-9)) & (vals <= hi * (1 + 1e-9))]
+
+
+def round_up_series(x, series=E12):
+    """Her değeri serideki bir sonraki (>=) standart değere yuvarla (NaN/inf korunur)."""
+    x = np.asarray(x, dtype=float)
+    ok = np.isfinite(x) & (x > 0)
+    xs = np.where(ok, x, 1.0)
+    dec = np.floor(np.log10(xs))
+    mant = xs / 10.0 ** dec
+    i = np.searchsorted(series, mant * (1 - 1e-9))
+    up = i >= len(series)
+    val = np.where(up, 10.0 ** (dec + 1), series[np.minimum(i, len(series) - 1)] * 10.0 ** dec)
+    return np.where(ok, val, x)
+
+
+def realizable_frequencies(spec, lo=None, hi=None, n=COARSE_F):
+    """[lo, hi] içinde timer'ın gerçekleyebildiği ~n frekans: (f, psc, arr) dizileri."""
+    lo = spec.f_range[0] if lo is None else lo
+    hi = spec.f_range[1] if hi is None else hi
+    if spec.psc is not None or spec.arr is not None:
+        # bir sayaç sabit: diğerinin tüm değerleri f_clk / ((PSC+1)(ARR+1)) ailesini verir
+        fixed1 = int(spec.psc if spec.psc is not None else spec.arr) + 1
+        free1 = np.arange(1, (1 << 16) + 1, dtype=np.int64)
+        f = spec.f_clk / (fixed1 * free1)
+        sel = np.flatnonzero((f >= lo) & (f <= hi))
+        if len(sel) > n:
+            sel = sel[np.unique(np.round(np.geomspace(1, len(sel), n)).astype(int) - 1)]
+        free = free1[sel] - 1
+        psc = np.full(len(sel), fixed1 - 1) if spec.psc is not None else free
+        arr = free if spec.psc is not None else np.full(len(sel), fixed1 - 1)
+        return f[sel], psc, arr
+    targets = np.geomspace(lo, hi, n) if hi > lo else np.array([lo])
+    psc, arr, f_act, _ = solve_batch(spec.f_clk, targets)
+    ok = psc >= 0
+    f_act, idx = np.unique(f_act[ok], return_index=True)
+    return f_act, psc[ok][idx], arr[ok][idx]
+
+
+def _nsnp_axis(spec, lo=None, hi=None, n=COARSE_NSNP):
+    if spec.topology != "flyback":
+        return np.array([np.nan])
+    lo = spec.nsnp_range[0] if lo is None else lo
+    hi = spec.nsnp_range[1] if hi is None else hi
+    return np.geomspace(lo, hi, n) if hi > lo else np.array([lo])
+
+
+# ---------- Değerlendirme ----------
+def evaluate(spec, freq, L, nsnp=None):
+    """Aday tasarımlar (1-B diziler) için {alan: dizi}; feasible maskesi dahil."""
+    topo = spec.topology
+    freq, L = np.asarray(freq, float), np.asarray(L, float)
+    vin, iout = spec.operating_points()
+    rip = ("ripI_val", "ripV_val") if topo == "buck" else ("ripI_pct", "ripV_pct")
+    kw = {"Vin": vin[None, :], "Vout": spec.Vout, "freq": freq[:, None], "Iout": iout[None, :],
+          rip[0]: spec.ripI, rip[1]: spec.ripV, "C": 1.0}  # C = 1 F: ΔVout·C çarpanı
+    kw["Lm" if topo == "flyback" else "L"] = L[:, None]
+    if topo == "flyback":
+        kw["nsnp"] = np.asarray(nsnp, float)[:, None]
+    lb = efficiency_batch(topo, kw, spec.loss_params)
+    eff = np.nan_to_num(lb.eff, nan=1.0)
+    res = BATCH_FUNCS[topo](**kw, eff=eff)
+    dI_max, dV_max = spec_limits(topo, dict(kw, eff=eff))
+    ok_op = (lb.valid & res.valid & (res.delta_IL <= dI_max) & (res.D <= spec.D_max)
+             & (lb.B_pk <= spec.B_max))
+    feasible = ok_op.all(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        C_req = np.max(res.delta_Vout / dV_max, axis=1)
+    C = round_up_series(C_req)
+    Ipk = np.max(res.Ipk, axis=1)
+    loss = np.max(lb.P_total, axis=1)
+    m = spec.size_model
+    E_uJ = 0.5 * L * Ipk * Ipk * 1e6
+    CV = C * 1e6 * m.V_derating * spec.Vout
+    volume = m.K_L * E_uJ ** 0.75 + m.K_C * CV
+    cost = m.cost_L * E_uJ ** 0.75 + m.cost_C * CV + m.cost_W * loss
+    feasible &= np.isfinite(C) & np.isfinite(loss) & np.isfinite(Ipk)
+    # verim raporu: tam yük (maks Iout), orta Vin
+    mid = np.flatnonzero((iout == iout.max()) & (vin == np.median(np.unique(vin))))
+    nominal = int(mid[0]) if len(mid) else len(vin) - 1
+    return {"freq": freq, "L": L, "C": C, "nsnp": np.broadcast_to(np.asarray(
+                nsnp if nsnp is not None else np.nan, float), freq.shape).copy(),
+            "loss": loss, "eff": lb.eff[:, nominal], "volume": volume, "cost": cost,
+            "Ipk": Ipk, "D_worst": np.max(res.D, axis=1), "feasible": feasible}
+
+
+def _grid(spec, f_set, L_vals, nsnp_vals):
+    """f × L × Ns/Np çapraz çarpımını değerlendir; uygun tasarımlar (dict of arrays)."""
+    f, psc, arr = f_set
+    fi, li, ni = (a.ravel() for a in np.meshgrid(np.arange(len(f)), np.arange(len(L_vals)),
+                                                  np.arange(len(nsnp_vals)), indexing="ij"))
+    ev = evaluate(spec, f[fi], L_vals[li], nsnp_vals[ni] if spec.topology == "flyback" else None)
+    ev["psc"], ev["arr"] = psc[fi], arr[fi]
+    keep = ev.pop("feasible")
+    return {k: v[keep] for k, v in ev.items()}, len(fi)
+
+
+def _concat(parts):
+    parts = [p for p in parts if p and len(p["freq"])]
+    if not parts:
+        return None
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def pareto_front(values):
+    """Minimizasyon için baskın olunmayan satırların indeksleri; values (n, k)."""
+    values = np.asarray(values, dtype=float)
+    order = np.lexsort(values.T[::-1])
+    keep = []
+    for i in order:
+        v = values[i]
+        if keep:
+            kept = values[keep]
+            if np.any(np.all(kept <= v, axis=1) & np.any(kept < v, axis=1)) or \
+                    np.any(np.all(kept == v, axis=1)):
+                continue
+        keep.append(i)
+    return np.array(keep, dtype=np.int64)
+
+
+def _refine(spec, seed, span):
+    """Tohum (f, L, nsnp) etrafında ince ızgara. span: kaba adım oranları (f, L, nsnp)."""
+    f0, L0, n0 = seed
+    f_set = realizable_frequencies(spec, max(f0 / span[0], spec.f_range[0]),
+                                   min(f0 * span[0], spec.f_range[1]), REFINE_F)
+    L_vals = series_values(max(L0 / span[1], spec.L_range[0]), min(L0 * span[1], spec.L_range[1]), E24)
+    if not len(L_vals):
+        L_vals = np.array([L0])
+    nsnp_vals = (_nsnp_axis(spec, max(n0 / span[2], spec.nsnp_range[0]),
+                            min(n0 * span[2], spec.nsnp_range[1]), REFINE_NSNP)
+                 if spec.topology == "flyback" else np.array([np.nan]))
+    return _grid(spec, f_set, L_vals, nsnp_vals)
+
+
+def _designs(spec, ev, idx, stage):
+    return [Design(spec.topology, float(ev["freq"][i]), int(ev["psc"][i]), int(ev["arr"][i]),
+                   float(ev["L"][i]), float(ev["C"][i]), float(ev["nsnp"][i]), float(ev["loss"][i]),
+                   float(ev["eff"][i]), float(ev["volume"][i]), float(ev["cost"][i]),
+                   float(ev["Ipk"][i]), float(ev["D_worst"][i]), stage[i])
+            for i in idx]
+
+
+def optimize(spec, objective="loss", top_n=20, workers=None, use_processes=True,
+             seeds=REFINE_SEEDS, progress=None, cancel_event=None):
+    """Kaba ızgara + paralel yerel iyileştirme; kayıp / hacim / maliyet Pareto cephesi.
+
+    objective: "loss" | "volume" | "cost" (cephenin sıralama anahtarı).
+    workers: None = os.cpu_count(); use_processes=False ise thread havuzu kullanılır
+    (ör. GUI'den: ana modül alt süreçlerde yeniden çalıştırılamaz).
+    progress: progress(done, total) aşama sayacı (1 kaba + tohum sayısı).
+    """
+    if spec.topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {spec.topology}")
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Bilinmeyen amaç: {objective}")
+    if spec.Vin[0] > spec.Vin[1] or spec.Iout[0] > spec.Iout[1] or spec.f_range[0] > spec.f_range[1]:
+        raise ValueError("Aralık alt sınırı üst sınırdan büyük olamaz")
+    result = OptimizeResult(spec, objective)
+    t0 = time.perf_counter()
+
+    f_set = realizable_frequencies(spec)
+    if not len(f_set[0]):
+        raise ValueError("Bu f_clk / PSC / ARR ile aralıkta gerçeklenebilir frekans yok")
+    L_vals = series_values(*spec.L_range, E6)
+    nsnp_vals = _nsnp_axis(spec)
+    coarse, n = _grid(spec, f_set, L_vals, nsnp_vals)
+    coarse["stage"] = np.full(len(coarse["freq"]), "kaba", dtype=object)
+    result.evaluated += n
+    result.coarse_elapsed = time.perf_counter() - t0
+    total = 1 + seeds
+    if progress:
+        progress(1, total)
+
+    refined = []
+    if len(coarse["freq"]) and seeds:
+        obj = np.column_stack([coarse[k] for k in OBJECTIVES])
+        front = pareto_front(obj)
+        # tohumlar: seçilen amaca göre en iyi cephe noktaları + her amacın en iyisi
+        ranked = front[np.argsort(coarse[objective][front], kind="stable")]
+        picks = list(dict.fromkeys([int(np.argmin(coarse[k])) for k in OBJECTIVES] + list(ranked)))[:seeds]
+        span = (float(np.exp(np.log(spec.f_range[1] / spec.f_range[0]) / max(COARSE_F - 1, 1))),
+                1.5, float(np.exp(np.log(spec.nsnp_range[1] / spec.nsnp_range[0]) / max(COARSE_NSNP - 1, 1))))
+        tasks = [(spec, (coarse["freq"][i], coarse["L"][i], coarse["nsnp"][i]), span) for i in picks]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        total = 1 + len(tasks)
+        if workers <= 1:
+            outs = []
+            for k, t in enumerate(tasks):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                outs.append(_refine(*t))
+                if progress:
+                    progress(2 + k, total)
+        else:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with pool(max_workers=workers) as ex:
+                futs = [ex.submit(_refine, *t) for t in tasks]
+                outs = []
+                for k, fut in enumerate(futs):
+                    if cancel_event is not None and cancel_event.is_set():
+                        for f in futs:
+                            f.cancel()
+                        break
+                    outs.append(fut.result())
+                    if progress:
+                        progress(2 + k, total)
+        for ev, n in outs:
+            ev["stage"] = np.full(len(ev["freq"]), "ince", dtype=object)
+            refined.append(ev)
+            result.evaluated += n
+
+    allev = _concat([coarse] + refined)
+    if allev is not None:
+        result.feasible = len(allev["freq"])
+        # aynı tasarım hem kaba hem ince aşamada bulunabilir: tekrarları at
+        key = np.column_stack([allev["freq"], allev["L"], np.nan_to_num(allev["nsnp"])])
+        _, first = np.unique(key, axis=0, return_index=True)
+        first = np.sort(first)
+        allev = {k: v[first] for k, v in allev.items()}
+        obj = np.column_stack([allev[k] for k in OBJECTIVES])
+        front = pareto_front(obj)
+        front = front[np.lexsort((allev["volume"][front], allev[objective][front]))][:top_n]
+        result.front = _designs(spec, allev, front, allev["stage"])
+    result.elapsed = time.perf_counter() - t0
+    return result
+
@@ -0,0 +1,231 @@
+# plotting.py
+# Kalıcı Line2D artist'li iki eksenli dalga formu grafiği.
+# Figür bir kez kurulur; her hesapta sadece set_data yapılır. Eksen sınırları
+# değişmiyorsa arka plan geri yüklenip çizgiler blit edilir (tam yeniden çizim yok).
+# Sınırlar taşarsa %20 pay ile genişletilip bir kez tam çizim yapılır; böylece
+# slider sürüklerken art arda gelen küçük değişiklikler blit ile kalır.
+# tight_layout sadece ilk çizimde ve pencere yeniden boyutlanınca çalışır.
+# PyramidPlot: uzun izler (binlerce periyot, yakalamalar) için min/maks zarfını dolgu
+# (PolyCollection) olarak çizen, yakınlaştırınca görünür aralığı piramitten yeniden
+# alan grafik; ham örneklere inince aynı kanal Line2D ile çizilir.
+# Tk'ya bağlı değildir; Agg canvas ile de (ör. benchmark) kullanılabilir.
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from instrument import stage
+
+FONT_BASE = 13
+_PAD = 0.2        # sınır taşınca eklenen pay (aralığın oranı)
+_MIN_FILL = 0.3   # veri aralığı eksen aralığının bundan küçükse yeniden ölçekle
+
+
+def _padded(lo, hi):
+    span = hi - lo
+    if not np.isfinite(span):
+        return None
+    if span <= 0:
+        span = abs(hi) * 0.01 or 1.0
+    return lo - _PAD * span, hi + _PAD * span
+
+
+def _needs_rescale(lim, lo, hi):
+    a, b = lim
+    if lo < a or hi > b:
+        return True
+    return (hi - lo) < _MIN_FILL * (b - a)
+
+
+class WaveformPlot:
+    """Üstte akım (1-2 çizgi), altta gerilim çizen kalıcı grafik."""
+
+    def __init__(self, fig, canvas, title_i, title_v, color_v, xlabel="Zaman (µs)",
+                 font_base=FONT_BASE):
+        self.fig, self.canvas = fig, canvas
+        self.font_base = font_base
+        with stage("plot.setup"):
+            fig.clf()
+            self.ax1 = fig.add_subplot(211)
+            self.ax2 = fig.add_subplot(212)
+        self.lines_i = [self.ax1.plot([], [], animated=True)[0],
+                        self.ax1.plot([], [], animated=True)[0]]
+        self.line_v = self.ax2.plot([], [], color=color_v, animated=True)[0]
+        self.ax1.set_ylabel("A", fontsize=font_base); self.ax1.grid(True)
+        self.ax2.set_ylabel("V", fontsize=font_base); self.ax2.grid(True)
+        self._labels = None
+        self._set_labels(title_i, title_v, xlabel)
+        self._bg = None
+        self._layout_dirty = True
+        self.full_draws = 0
+        self.blits = 0
+        canvas.mpl_connect("draw_event", self._on_draw)
+        canvas.mpl_connect("resize_event", self._on_resize)
+
+    # --- olaylar ---
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_lines()
+
+    def _on_resize(self, event):
+        # resize sonrası canvas zaten draw_idle çağırır; yerleşimi burada güncelle
+        self.fig.tight_layout()
+        self._layout_dirty = False
+
+    def _draw_lines(self):
+        for ln in self.lines_i:
+            self.ax1.draw_artist(ln)
+        self.ax2.draw_artist(self.line_v)
+
+    def _set_labels(self, title_i, title_v, xlabel):
+        labels = (title_i, title_v, xlabel)
+        if labels == self._labels:
+            return False
+        self.ax1.set_title(title_i, fontsize=self.font_base + 1)
+        self.ax2.set_title(title_v, fontsize=self.font_base + 1)
+        self.ax2.set_xlabel(xlabel, fontsize=self.font_base)
+        self._labels = labels
+        return True
+
+    def _rescale(self):
+        """Gerekirse eksen sınırlarını güncelle; değiştiyse True."""
+        changed = False
+        x = self.line_v.get_xdata()
+        if len(x):
+            xlim = (float(x[0]), float(x[-1]))
+            if xlim[1] > xlim[0] and self.ax2.get_xlim() != xlim:
+                self.ax1.set_xlim(xlim); self.ax2.set_xlim(xlim)
+                changed = True
+        ys = [ln.get_ydata() for ln in self.lines_i if ln.get_visible() and len(ln.get_ydata())]
+        for ax, data in ((self.ax1, ys), (self.ax2, [self.line_v.get_ydata()])):
+            data = [d for d in data if len(d)]
+            if not data:
+                continue
+            lo = min(float(np.nanmin(d)) for d in data)
+            hi = max(float(np.nanmax(d)) for d in data)
+            if _needs_rescale(ax.get_ylim(), lo, hi):
+                lim = _padded(lo, hi)
+                if lim is not None:
+                    ax.set_ylim(lim)
+                    changed = True
+        return changed
+
+    # --- dış arayüz ---
+    def update(self, x, ys_i, y_v, title_i=None, title_v=None, xlabel=None):
+        """Çizgileri güncelle. ys_i: 1 veya 2 akım dizisi (ör. tepe/vadi zarfı)."""
+        for k, ln in enumerate(self.lines_i):
+            if k < len(ys_i):
+                ln.set_data(x, ys_i[k]); ln.set_visible(True)
+            else:
+                ln.set_data([], []); ln.set_visible(False)
+        self.line_v.set_data(x, y_v)
+        relabel = self._set_labels(title_i or self._labels[0], title_v or self._labels[1],
+                                   xlabel or self._labels[2])
+        rescaled = self._rescale()
+        if self._bg is None or relabel or rescaled or self._layout_dirty:
+            if self._layout_dirty or relabel:
+                with stage("plot.tight_layout"):
+                    self.fig.tight_layout()
+                self._layout_dirty = False
+            with stage("plot.draw"):
+                self.canvas.draw()  # draw_event arka planı yakalar ve çizgileri çizer
+            self.full_draws += 1
+        else:
+            with stage("plot.blit"):
+                self.canvas.restore_region(self._bg)
+                self._draw_lines()
+                self.canvas.blit(self.fig.bbox)
+            self.blits += 1
+
+
+class PyramidPlot:
+    """Uzun izler için yakınlaştırmaya duyarlı grafik (waveview.MinMaxPyramid üzerinden).
+
+    Tam çözünürlüklü veri ekrana hiç verilmez: her eksen piksel genişliği kadar
+    (min, maks) kutusu tek bir dolu çokgen (üst kenar maks, alt kenar min) olarak çizilir.
+    Piksel başına dikey zig-zag çizgiye göre çok daha ucuzdur; görünür aralık ham
+    örneklere inince (kutu başına tek örnek) kanal yine Line2D ile çizilir. Yakınlaştırma / kaydırma (araç çubuğu) xlim_changed ile
+    görünür aralığın zarfını yeniden alır; pencere boyutu değişince kutu sayısı güncellenir.
+    panels: [(başlık, birim, [(kanal, etiket, renk), ...]), ...] — eksenler x'i paylaşır.
+    x_scale: zamanın gösterim ölçeği (ör. 1e3 → ms).
+    """
+
+    def __init__(self, fig, canvas, pyramid, panels, xlabel="Zaman (ms)", x_scale=1e3,
+                 font_base=FONT_BASE):
+        self.fig, self.canvas, self.pyr = fig, canvas, pyramid
+        self.x_scale = x_scale
+        self.refreshes = 0
+        self.last_level = None
+        with stage("plot.setup"):
+            fig.clf()
+            self.axes = []
+            for k, (title, unit, _) in enumerate(panels):
+                ax = fig.add_subplot(len(panels), 1, k + 1, sharex=self.axes[0] if self.axes else None)
+                ax.set_title(title, fontsize=font_base + 1)
+                ax.set_ylabel(unit, fontsize=font_base)
+                ax.grid(True)
+                self.axes.append(ax)
+        self.axes[-1].set_xlabel(xlabel, fontsize=font_base)
+        self.lines = []   # (ax, kanal, Line2D ham veri için, PolyCollection zarf için)
+        for ax, (_, _, chans) in zip(self.axes, panels):
+            for ch, label, color in chans:
+                (ln,) = ax.plot([], [], color=color, lw=0.8, label=label)
+                # kenar çizgisi ince (< 1 piksel) zarfların kaybolmamasını sağlar
+                band = PolyCollection([], facecolors=color, edgecolors=color, linewidths=0.8,
+                                      antialiaseds=False, zorder=2)
+                ax.add_collection(band, autolim=False)
+                self.lines.append((ax, ch, ln, band))
+            if len(chans) > 1:
+                ax.legend(loc="upper right", fontsize=font_base - 3)
+            lims = [pyramid.limits(ch) for ch, _, _ in chans]
+            lim = _padded(min(a for a, _ in lims), max(b for _, b in lims))
+            if lim is not None:
+                ax.set_ylim(lim)
+        t0, t1 = pyramid.span
+        self._xlim = None
+        self.axes[0].set_xlim(t0 * x_scale, t1 * x_scale)
+        # CallbackRegistry bağlı metotları zayıf referansla tutar: nesne figürle yaşasın
+        fig._pyramid_plot = self
+        self.axes[0].callbacks.connect("xlim_changed", self._on_xlim)
+        canvas.mpl_connect("resize_event", self._on_resize)
+        self.refresh()
+        fig.tight_layout()
+
+    def _pixels(self, ax):
+        return max(16, int(ax.bbox.width))
+
+    def _on_xlim(self, ax):
+        self.refresh()
+
+    def _on_resize(self, event):
+        self._xlim = None
+        self.refresh()
+
+    def refresh(self):
+        """Görünür aralık için zarfları al ve çizgilere yaz (çizimi çağıran yapar)."""
+        xlim = self.axes[0].get_xlim()
+        key = (xlim, self._pixels(self.axes[0]))
+        if key == self._xlim:
+            return False
+        self._xlim = key
+        with stage("plot.envelope"):
+            env = self.pyr.envelope(xlim[0] / self.x_scale, xlim[1] / self.x_scale, key[1])
+            x = env.x * self.x_scale
+            for ax, ch, ln, band in self.lines:
+                if env.raw:
+                    ln.set_data(x, env.lo[ch])
+                    band.set_verts([])
+                else:
+                    ln.set_data([], [])
+                    band.set_verts([np.concatenate((np.column_stack((x, env.hi[ch])),
+                                                    np.column_stack((x[::-1], env.lo[ch][::-1]))))])
+        self.last_level = env.level
+        self.refreshes += 1
+        return True
+
+    def view(self, t0=None, t1=None):
+        """Görünür aralığı (s) ayarla ve çiz; None = tüm iz."""
+        a, b = self.pyr.span
+        self.axes[0].set_xlim((a if t0 is None else t0) * self.x_scale,
+                              (b if t1 is None else t1) * self.x_scale)
+        with stage("plot.draw"):
+            self.canvas.draw()
@@ -0,0 +1,366 @@
+# smallsignal.py
+# Küçük sinyal frekans cevabı (boost / buck / flyback), tamamen vektörel.
+# Model: CCM ortalanmış kanonik devre (Erickson). Her topoloji için düşük frekans kazancı
+# Gvd0, eşdeğer endüktans Le (çıkışa indirgenmiş), sağ yarı düzlem sıfırı ωz ve bobin
+# DCR'si ile kondansatör ESR'si sönüm olarak:
+#     Gvd(s) = Gvd0 · (1 - s/ωz) · Zp / (Z_Le + Zp),   Z_Le = (DCR + sL)·k,  Zp = Z_C ∥ R
+#     Zout(s) = Z_Le ∥ Z_C ∥ R                          (d̂ = 0, kontrol açık)
+#   buck    : Gvd0 = Vin,          k = 1,             ωz = ∞
+#   boost   : Gvd0 = Vout/D',      k = 1/D'²,         ωz = D'²R / L
+#   flyback : Gvd0 = Vout/(D·D'),  k = n²/D'²,        ωz = D'²R / (D·n²·Lm),  n = Ns/Np
+# Flyback'te n sarım oranı kuralından bağımsız olarak D'den türetilir (losses.py ile aynı).
+# DCM'de indirgenmiş mertebeli ortalanmış model (bobin durumu yok, tek kutup):
+#     Zout = Rp ∥ Z_C,  Gvd = Gd0 · Zout / Rp,  Rp = 1 / (ωp·C),  M = Vout/Vin, K = 2L/(R·Ts)
+#   buck    : Gd0 = 2V/D·(1-M)/(2-M),   ωp = (2-M) / ((1-M)·RC),   D = M·√(K/(1-M))
+#   boost   : Gd0 = 2V/D·(M-1)/(2M-1),  ωp = (2M-1) / ((M-1)·RC),  D = √(K·M·(M-1))
+#   flyback : Gd0 = V/D,                ωp = 2 / (RC),             D = M·√(2Lm·f/R)
+# Anahtarlama frekansı civarındaki yüksek frekans kutbu ve DCM RHP sıfırı ihmal edilir.
+#
+# Çalışma noktası ekseni (Vin × Iout ızgarası vb.) önde, frekans ekseni sondadır:
+# girişler yayınlanır, sonuçlar shape + (nf,) boyutundadır. Kompanzatör (Tip II / III)
+# parametreleri de dizi olabilir; tasarım aracı k-faktör yöntemiyle aday ağları üretir ve
+# hepsini tüm köşe çalışma noktalarında tek çağrıda değerlendirir.
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS
+from losses import _batch_kwargs
+
+N_FREQ = 400
+F_MIN_FRAC = 1e-4   # frekans ızgarası: f_sw·1e-4 ... f_sw/2 (ortalanmış model sınırı)
+PM_LEVELS = (0, 15, 30, 45, 60, 75, 90)
+FC_MAX_FRAC = 0.2   # kesim frekansı en fazla f_sw/5
+RHPZ_FRAC = 1 / 3   # ve en düşük RHP sıfırının 1/3'ü
+MAX_BOOST = {"II": 89.0, "III": 179.0}
+
+
+def freq_grid(f_sw, n=N_FREQ, f_min=None, f_max=None):
+    """Log aralıklı frekans ızgarası (Hz)."""
+    f_min = f_sw * F_MIN_FRAC if f_min is None else f_min
+    f_max = f_sw / 2.0 if f_max is None else f_max
+    return np.logspace(np.log10(f_min), np.log10(f_max), n)
+
+
+@dataclass
+class PlantResponse:
+    """Güç katının küçük sinyal cevabı; Gvd / Zout shape + (nf,), diğerleri shape."""
+    f: np.ndarray
+    Gvd: np.ndarray      # kontrol → çıkış (V / birim görev oranı)
+    Zout: np.ndarray     # çıkış empedansı (Ω)
+    Gvd0: np.ndarray
+    D: np.ndarray
+    R: np.ndarray        # yük direnci Vout/Iout
+    f0: np.ndarray       # CCM: LC rezonansı, DCM: baskın kutup (Hz)
+    Q: np.ndarray        # DCM'de NaN
+    f_rhpz: np.ndarray   # sağ yarı düzlem sıfırı (Hz), buck / DCM'de inf
+    Vout: np.ndarray
+    ccm: np.ndarray
+    valid: np.ndarray
+
+
+def _canonical(topology, D, Vin, Vout, L, R):
+    """(Gvd0, k, ωz): CCM kanonik modelin topolojiye bağlı katsayıları."""
+    Dp = 1.0 - D
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if topology == "buck":
+            return Vin, np.ones_like(D), np.full_like(D, np.inf)
+        if topology == "boost":
+            return Vout / Dp, 1.0 / (Dp * Dp), Dp * Dp * R / L
+        if topology == "flyback":
+            n = Vout * Dp / (Vin * D)              # Ns/Np
+            k = n * n / (Dp * Dp)
+            return Vout / (D * Dp), k, Dp * Dp * R / (D * n * n * L)
+    raise ValueError(f"Bilinmeyen topoloji: {topology}")
+
+
+def _dcm(topology, Vin, Vout, L, R, C, freq):
+    """(Gd0, ωp, D): DCM indirgenmiş modelin katsayıları ve gerçek görev oranı."""
+    M = Vout / Vin
+    K = 2.0 * L * freq / R
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if topology == "buck":
+            D = M * np.sqrt(K / (1.0 - M))
+            return 2.0 * Vout / D * (1.0 - M) / (2.0 - M), (2.0 - M) / ((1.0 - M) * R * C), D
+        if topology == "boost":
+            D = np.sqrt(K * M * (M - 1.0))
+            return 2.0 * Vout / D * (M - 1.0) / (2.0 * M - 1.0), (2.0 * M - 1.0) / ((M - 1.0) * R * C), D
+        D = M * np.sqrt(K)
+        return Vout / D, 2.0 / (R * C), D
+
+
+def plant_response(topology, inputs, f, DCR=0.0, ESR=0.0):
+    """Kontrol → çıkış ve çıkış empedansı. inputs: calc_core.*_batch girişleri (dizi olabilir,
+    eff dahil); f: 1-B frekans dizisi (Hz). DCR / ESR: sönüm (Ω, yayınlanabilir).
+    CCM / DCM noktaları aynı dizide kendi modelleriyle çözülür."""
+    if topology not in BATCH_FUNCS:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    kw = _batch_kwargs(topology, inputs)
+    if "eff" in inputs:
+        kw["eff"] = inputs["eff"]
+    res = BATCH_FUNCS[topology](**kw)
+    b = dict(zip(kw, np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in kw.values()))))
+    Vin, Vout, Iout, C, freq = b["Vin"], b["Vout"], b["Iout"], b["C"], b["freq"]
+    L = b["Lm"] if topology == "flyback" else b["L"]
+    ccm = np.asarray(res.ccm)
+    valid = np.asarray(res.valid) & (Iout > 0) & (C > 0) & (L > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = Vout / Iout
+        x = lambda a: np.asarray(a)[..., None]
+        s = 2j * np.pi * np.asarray(f, dtype=float)
+        DCR, ESR = np.asarray(DCR, dtype=float), np.asarray(ESR, dtype=float)
+        Z_C = x(ESR) + 1.0 / (s * x(C))
+        # CCM
+        D_ccm = np.asarray(res.D, dtype=float)
+        Gvd0, k, wz = _canonical(topology, D_ccm, Vin, Vout, L, R)
+        Z_Le = (x(DCR) + s * x(L)) * x(k)
+        Zp = 1.0 / (1.0 / Z_C + 1.0 / x(R))
+        Gvd = x(Gvd0) * (1.0 - s / x(wz)) * Zp / (Z_Le + Zp)
+        Zout = 1.0 / (1.0 / Z_Le + 1.0 / Zp)
+        Le = L * k
+        f0 = 1.0 / (2 * np.pi * np.sqrt(Le * C))
+        Q = R * np.sqrt(C / Le)
+        # DCM
+        Gd0, wp, D_dcm = _dcm(topology, Vin, Vout, L, R, C, freq)
+        Rp = 1.0 / (wp * C)
+        Zout_d = 1.0 / (1.0 / x(Rp) + 1.0 / Z_C)
+        Gvd_d = x(Gd0) * Zout_d / x(Rp)
+    c = ccm[..., None]
+    bad = ~valid[..., None]
+    return PlantResponse(f=np.asarray(f, dtype=float),
+                         Gvd=np.where(bad, np.nan, np.where(c, Gvd, Gvd_d)),
+                         Zout=np.where(bad, np.nan, np.where(c, Zout, Zout_d)),
+                         Gvd0=np.where(ccm, Gvd0, Gd0), D=np.where(ccm, D_ccm, D_dcm), R=R,
+                         f0=np.where(ccm, f0, wp / (2 * np.pi)), Q=np.where(ccm, Q, np.nan),
+                         f_rhpz=np.where(ccm, wz / (2 * np.pi), np.inf), Vout=Vout,
+                         ccm=ccm & valid, valid=valid)
+
+
+# --- kontrol döngüsü ---
+@dataclass(frozen=True)
+class LoopParams:
+    """PWM modülatörü ve geri besleme: T = Gvd · Gc · H / Vm · e^(-s·gecikme)."""
+    Vm: float = 1.0             # V, rampa genliği (dijitalde ARR'ye karşı gelen tam ölçek)
+    Vref: float = 2.5           # V; H verilmezse H = Vref / Vout
+    H: float = None             # geri besleme bölücü kazancı
+    delay_cycles: float = 0.0   # anahtarlama periyodu cinsinden gecikme (dijital: ~1.5)
+
+
+DEFAULT_LOOP = LoopParams()
+
+
+def loop_factor(loop, Vout, f, f_sw):
+    """H / Vm · gecikme; shape Vout.shape + (nf,)."""
+    H = loop.Vref / np.asarray(Vout, dtype=float) if loop.H is None else np.asarray(loop.H, float)
+    s = 2j * np.pi * np.asarray(f, dtype=float)
+    delay = np.exp(-s * loop.delay_cycles / np.asarray(f_sw, dtype=float)[..., None])
+    return (H / loop.Vm)[..., None] * delay
+
+
+@dataclass(frozen=True)
+class Compensator:
+    """Gc(s) = Kc/s · (1 + s/ωz1)(1 + s/ωz2) / ((1 + s/ωp1)(1 + s/ωp2)).
+    Frekanslar Hz; kullanılmayan sıfır / kutup inf. Alanlar aynı boyutlu dizi olabilir."""
+    kind: str
+    Kc: np.ndarray
+    fz1: np.ndarray
+    fp1: np.ndarray
+    fz2: np.ndarray = np.inf
+    fp2: np.ndarray = np.inf
+
+    def response(self, f):
+        s = 2j * np.pi * np.asarray(f, dtype=float)
+        x = lambda a: np.asarray(a, dtype=float)[..., None]
+        w = lambda fx: 2 * np.pi * x(fx)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (x(self.Kc) / s * (1 + s / w(self.fz1)) * (1 + s / w(self.fz2))
+                    / ((1 + s / w(self.fp1)) * (1 + s / w(self.fp2))))
+
+    def item(self, index):
+        """index'teki tek ağ (float alanlar)."""
+        pick = lambda a: float(np.broadcast_to(np.asarray(a, dtype=float), np.shape(self.Kc))[index])
+        return replace(self, **{k: pick(getattr(self, k)) for k in ("Kc", "fz1", "fp1", "fz2", "fp2")})
+
+    def describe(self):
+        z = f"fz {self.fz1:.4g} Hz" + (f", {self.fz2:.4g} Hz" if np.isfinite(self.fz2) else "")
+        p = f"fp {self.fp1:.4g} Hz" + (f", {self.fp2:.4g} Hz" if np.isfinite(self.fp2) else "")
+        return f"Tip {self.kind}: Kc {self.Kc:.4g} rad/s, {z}, {p}"
+
+
+def k_factor(kind, boost_deg):
+    """Venable k-faktörü: istenen faz artışı (°) için sıfır / kutup ayrımı. Geçersizse NaN."""
+    b = np.asarray(boost_deg, dtype=float)
+    ok = (b > 0) & (b < MAX_BOOST[kind])
+    with np.errstate(invalid="ignore"):
+        k = np.tan(np.radians(b / 2.0 + 45.0)) if kind == "II" else np.tan(np.radians(b / 4.0 + 45.0)) ** 2
+    return np.where(ok, k, np.nan)
+
+
+def kfactor_design(kind, fc, pm, P_mag, P_phase):
+    """fc'de |T| = 1 ve faz payı pm olacak Tip II / III ağ(lar)ı. P_mag / P_phase: fc'deki
+    Gvd·H/Vm·gecikme genliği ve sürekli (unwrap edilmiş) fazı (°); hepsi yayınlanır."""
+    fc, pm, P_mag, P_phase = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                                   for a in (fc, pm, P_mag, P_phase)))
+    k = k_factor(kind, pm - P_phase - 90.0)
+    if kind == "II":
+        fz1, fp1 = fc / k, fc * k
+        fz2 = fp2 = np.full_like(fc, np.inf)
+    else:
+        r = np.sqrt(k)
+        fz1 = fz2 = fc / r
+        fp1 = fp2 = fc * r
+    comp = Compensator(kind, np.ones_like(fc), fz1, fp1, fz2, fp2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        g = np.abs(comp.response(fc[..., None]))[..., 0]
+        Kc = 1.0 / (g * P_mag)
+    return replace(comp, Kc=Kc)
+
+
+def margins(f, T):
+    """Son eksen boyunca (fc Hz, faz payı °, kazanç payı dB). Kesim frekansı son (en yüksek)
+    aşağı yönlü |T| = 1 geçişidir (rezonans tepesi birden çok geçiş üretebilir); GM bundan
+    sonraki ilk -180° geçişinde ölçülür. Geçiş yoksa fc / PM NaN, -180° geçişi yoksa GM inf."""
+    f = np.asarray(f, dtype=float)
+    lf = np.log10(f)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mag = 20 * np.log10(np.abs(T))
+    ph = np.degrees(np.unwrap(np.angle(T), axis=-1))
+    pos = np.arange(len(f) - 1)
+
+    def down_cross(y, level):
+        above = y >= level
+        return above[..., :-1] & ~above[..., 1:]
+
+    def pair(y, i):
+        return (np.take_along_axis(y, i[..., None], -1)[..., 0],
+                np.take_along_axis(y, i[..., None] + 1, -1)[..., 0])
+
+    def at(y, i, t):
+        y0, y1 = pair(y, i)
+        return y0 + t * (y1 - y0)
+
+    def frac(y, i, level):
+        y0, y1 = pair(y, i)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.nan_to_num(np.clip((y0 - level) / (y0 - y1), 0.0, 1.0))
+
+    cross = down_cross(mag, 0.0)
+    has = cross.any(axis=-1)
+    i = len(f) - 2 - np.argmax(cross[..., ::-1], axis=-1)
+    t = frac(mag, i, 0.0)
+    fc = np.where(has, 10.0 ** (lf[i] + t * (lf[i + 1] - lf[i])), np.nan)
+    pm = np.where(has, 180.0 + at(ph, i, t), np.nan)
+    cross_g = down_cross(ph, -180.0) & (pos >= np.where(has, i, 0)[..., None])
+    has_g = cross_g.any(axis=-1)
+    j = np.argmax(cross_g, axis=-1)
+    gm = np.where(has_g, -at(mag, j, frac(ph, j, -180.0)), np.inf)
+    return fc, pm, gm
+
+
+def loop_gain(plant, comp, f_sw, loop=DEFAULT_LOOP):
+    """T(jω) = Gvd · Gc · H/Vm · gecikme; plant ve comp boyutları yayınlanır."""
+    return plant.Gvd * comp.response(plant.f) * loop_factor(loop, plant.Vout, plant.f, f_sw)
+
+
+# --- tasarım ---
+@dataclass
+class DesignResult:
+    """Aday ağlar (fc × pm hedefi) ve köşe noktalarındaki en kötü payları."""
+    comp: Compensator      # dizi alanlı, shape (n_fc, n_pm)
+    fc_target: np.ndarray
+    pm_target: np.ndarray
+    pm_worst: np.ndarray   # köşeler üzerinde en düşük faz payı (°)
+    gm_worst: np.ndarray   # dB
+    fc_min: np.ndarray     # köşeler üzerinde kesim frekansı aralığı (Hz)
+    fc_max: np.ndarray
+    feasible: np.ndarray
+    corners_valid: np.ndarray   # geçersiz köşeler (ör. boost'ta Vin ≥ Vout) değerlendirmeye girmez
+    best: tuple            # en iyi adayın indeksi; uygun aday yoksa None
+
+    @property
+    def best_comp(self):
+        return None if self.best is None else self.comp.item(self.best)
+
+    def ranked(self, limit=10):
+        """Uygun adaylar: yüksek kesim frekansı, sonra yüksek en kötü faz payı."""
+        idx = [tuple(int(k) for k in i) for i in np.argwhere(self.feasible)]
+        order = sorted(idx, key=lambda i: (-self.fc_target[i], -self.pm_worst[i]))
+        return order[:limit]
+
+
+def corner_points(inputs, Vin_span=0.1, Iout_fracs=(0.1, 0.5, 1.0)):
+    """Tasarım köşeleri: Vin ±span × Iout oranları (nominale göre); shape (nVin, nIout)."""
+    Vin = float(inputs["Vin"]) * np.array([1 - Vin_span, 1.0, 1 + Vin_span])
+    Iout = float(inputs["Iout"]) * np.asarray(Iout_fracs, dtype=float)
+    return dict(inputs, Vin=Vin[:, None], Iout=Iout[None, :])
+
+
+def design(topology, inputs, kind="III", fc=None, pm=(45, 50, 55, 60, 65, 70), corners=None,
+           DCR=0.0, ESR=0.0, loop=DEFAULT_LOOP, pm_min=45.0, gm_min=6.0, n=N_FREQ):
+    """Tip II / III kompanzatörünü k-faktör yöntemiyle toplu tasarla.
+
+    fc verilmezse adaylar f_sw/5 ile köşelerdeki en düşük RHP sıfırının 1/3'ünden küçük
+    olana kadar log aralıklıdır. Nominal noktada her (fc, pm) hedefi için bir ağ kurulur; tüm adaylar köşe noktalarında
+    (corners: yayınlanmış girişler, varsayılan corner_points) tek dizi işlemiyle
+    değerlendirilir (CCM ve DCM köşeleri kendi modelleriyle). Uygunluk: geçerli köşelerin
+    hepsinde PM ≥ pm_min ve GM ≥ gm_min."""
+    f_sw = float(inputs["freq"])
+    f = freq_grid(f_sw, n)
+    corners = corner_points(inputs) if corners is None else corners
+    plant = plant_response(topology, corners, f, DCR, ESR)
+    if fc is None:
+        fc_hi = min(f_sw * FC_MAX_FRAC, RHPZ_FRAC * float(np.min(plant.f_rhpz[plant.valid], initial=np.inf)))
+        fc = np.logspace(np.log10(fc_hi / 40.0), np.log10(fc_hi), 24)
+    fc, pm = np.asarray(fc, dtype=float), np.asarray(pm, dtype=float)
+    # nominal faz ince ızgarada unwrap edilir: rezonans / RHP sıfırı sonrası -180°'yi aşar
+    f_all = np.union1d(f, fc)
+    nominal = plant_response(topology, inputs, f_all, DCR, ESR)
+    P = nominal.Gvd * loop_factor(loop, nominal.Vout, f_all, f_sw)
+    i = np.searchsorted(f_all, fc)
+    P_mag, P_phase = np.abs(P)[i], np.degrees(np.unwrap(np.angle(P)))[i]
+    FC, PM = np.meshgrid(fc, pm, indexing="ij")
+    comp = kfactor_design(kind, FC, PM, P_mag[:, None], P_phase[:, None])
+    G = (plant.Gvd * loop_factor(loop, plant.Vout, f, f_sw)).reshape(-1, len(f))
+    Gc = comp.response(f).reshape(-1, 1, len(f))
+    fcs, pms, gms = margins(f, Gc * G[None])
+    shape = FC.shape
+    use = plant.valid.reshape(-1)
+    pm_worst = np.min(np.where(use, np.nan_to_num(pms, nan=-np.inf), np.inf), axis=1).reshape(shape)
+    gm_worst = np.min(np.where(use, gms, np.inf), axis=1).reshape(shape)
+    fc_min = np.min(np.where(use, np.nan_to_num(fcs, nan=np.inf), np.inf), axis=1).reshape(shape)
+    fc_max = np.max(np.where(use, np.nan_to_num(fcs, nan=-np.inf), -np.inf), axis=1).reshape(shape)
+    ok_comp = np.isfinite(comp.Kc) & np.isfinite(comp.fz1)
+    feasible = ok_comp & use.any() & (pm_worst >= pm_min) & (gm_worst >= gm_min)
+    res = DesignResult(comp=comp, fc_target=FC, pm_target=PM, pm_worst=pm_worst, gm_worst=gm_worst,
+                       fc_min=fc_min, fc_max=fc_max, feasible=feasible,
+                       corners_valid=plant.valid, best=None)
+    top = res.ranked(1)
+    res.best = top[0] if top else None
+    return res
+
+
+def pm_map(topology, inputs, comp, Vin, Iout, DCR=0.0, ESR=0.0, loop=DEFAULT_LOOP, n=N_FREQ):
+    """Vin × Iout ızgarasında (fc, PM, GM) haritası; geçersiz noktalar NaN."""
+    f_sw = float(inputs["freq"])
+    f = freq_grid(f_sw, n)
+    grid = dict(inputs, Vin=np.asarray(Vin, float)[:, None], Iout=np.asarray(Iout, float)[None, :])
+    plant = plant_response(topology, grid, f, DCR, ESR)
+    fc, pm, gm = margins(f, loop_gain(plant, comp, f_sw, loop))
+    bad = ~plant.valid
+    return np.where(bad, np.nan, fc), np.where(bad, np.nan, pm), np.where(bad, np.nan, gm)
+
+
+def network_values(comp, R1=10e3):
+    """Op-amp gerçeklemesi (R1 giriş direnci verilir). Tip II: R2-C1 seri ∥ C2;
+    Tip III'te ek olarak R1 ∥ (R3-C3). Değerler Ω / F; alanlar comp ile aynı boyutta."""
+    wz1, wp1 = 2 * np.pi * np.asarray(comp.fz1), 2 * np.pi * np.asarray(comp.fp1)
+    C_sum = 1.0 / (R1 * np.asarray(comp.Kc))
+    C2 = C_sum * wz1 / wp1
+    C1 = C_sum - C2
+    out = {"R1": R1, "R2": 1.0 / (wz1 * C1), "C1": C1, "C2": C2}
+    if comp.kind == "III":
+        wz2, wp2 = 2 * np.pi * np.asarray(comp.fz2), 2 * np.pi * np.asarray(comp.fp2)
+        C3 = (1.0 / wz2 - 1.0 / wp2) / R1
+        out.update(R3=1.0 / (wp2 * C3), C3=C3)
+    return out
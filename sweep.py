@@ -0,0 +1,302 @@
+# sweep.py
+# Çok çekirdekli tasarım uzayı taraması (boost / buck / flyback).
+# Izgara düz (flat) indeks aralıklarına bölünür; her parça bir worker sürecinde
+# calc_core.*_batch ile hesaplanır. Sonuçlar süreçler arası pickle edilmez:
+# worker'lar doğrudan memory-mapped .npy dosyasına yazar. Tüm küpü RAM'e almadan
+# özet çıkarmak için Reducer'lar (BestPerAxis, Histogram) kullanılır.
+
+import inspect
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+import multiprocessing as mp
+
+import numpy as np
+
+from calc_core import BATCH_FUNCS, BATCH_FIELDS
+
+# valid / ccm maskeleri çıktı dizisinde 0/1 olarak saklanır
+OUTPUT_FIELDS = BATCH_FIELDS + ("nsnp_req", "ccm", "valid")
+DEFAULT_CHUNK = 1 << 18
+
+
+class Sweep:
+    """Bir topoloji için eksenleri ve sabit parametreleri tanımlayan ızgara.
+
+    axes: {param_adı: 1-B değerler}; sırası ızgara boyut sırasıdır.
+    fixed: {param_adı: skaler}; taranmayan parametreler.
+    tolerances: {param_adı: çarpanlar}; ör. {"L": [0.8, 1.0, 1.2]} ek "L_tol" ekseni açar.
+    """
+
+    def __init__(self, topology, axes, fixed=None, tolerances=None):
+        if topology not in BATCH_FUNCS:
+            raise ValueError(f"Bilinmeyen topoloji: {topology}")
+        self.topology = topology
+        params = list(inspect.signature(BATCH_FUNCS[topology]).parameters)
+        self.axes = {k: np.atleast_1d(np.asarray(v, dtype=float)) for k, v in axes.items()}
+        self.fixed = dict(fixed or {})
+        for k, v in (tolerances or {}).items():
+            self.axes[f"{k}_tol"] = np.atleast_1d(np.asarray(v, dtype=float))
+        for k in list(self.axes) + list(self.fixed):
+            base = k[:-4] if k.endswith("_tol") else k
+            if base not in params:
+                raise ValueError(f"{topology} için bilinmeyen parametre: {k}")
+        self.shape = tuple(len(v) for v in self.axes.values())
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    @property
+    def axis_names(self):
+        return tuple(self.axes)
+
+    def inputs(self, start, stop):
+        """[start, stop) düz indeks aralığı için batch fonksiyonu argümanları."""
+        idx = np.unravel_index(np.arange(start, stop, dtype=np.int64), self.shape)
+        kw = dict(self.fixed)
+        tol = {}
+        for (name, vals), ix in zip(self.axes.items(), idx):
+            if name.endswith("_tol"):
+                tol[name[:-4]] = vals[ix]
+            else:
+                kw[name] = vals[ix]
+        for name, mult in tol.items():
+            kw[name] = kw[name] * mult
+        return kw
+
+    def evaluate(self, start=0, stop=None):
+        return BATCH_FUNCS[self.topology](**self.inputs(start, self.size if stop is None else stop))
+
+    def point(self, flat_index):
+        """Tek bir düz indeksin eksen değerleri."""
+        idx = np.unravel_index(int(flat_index), self.shape)
+        return {name: float(vals[i]) for (name, vals), i in zip(self.axes.items(), idx)}
+
+    def axis_index(self, axis, start, stop):
+        k = self.axis_names.index(axis)
+        stride = int(np.prod(self.shape[k + 1:], dtype=np.int64))
+        return (np.arange(start, stop, dtype=np.int64) // stride) % self.shape[k]
+
+
+def feasible_mask(res, constraints=None):
+    """valid maskesi + {alan: (alt, üst)} sınırları (None = sınırsız)."""
+    mask = res.valid.copy()
+    for name, (lo, hi) in (constraints or {}).items():
+        v = getattr(res, name)
+        if lo is not None:
+            mask &= v >= lo
+        if hi is not None:
+            mask &= v <= hi
+    return mask
+
+
+# ---------- Reducer'lar ----------
+# partial() worker'da parça başına çalışır ve küçük bir durum döndürür;
+# combine() ana süreçte durumları birleştirir; finalize() son sonucu üretir.
+class Reducer(ABC):
+    name = "reducer"
+
+    @abstractmethod
+    def partial(self, sweep, start, stop, res):
+        """Parça [start, stop) sonuçlarından küçük, pickle edilebilir bir durum."""
+
+    @abstractmethod
+    def combine(self, a, b):
+        """İki parça durumunu birleştir."""
+
+    def finalize(self, sweep, state):
+        return state
+
+
+class BestPerAxis(Reducer):
+    """Bir eksenin her değeri için en iyi uygun (feasible) nokta, ör. Vin başına min Ipk."""
+
+    def __init__(self, axis, objective, minimize=True, constraints=None, name=None):
+        self.axis = axis
+        self.objective = objective
+        self.minimize = minimize
+        self.constraints = constraints
+        self.name = name or f"best_{objective}_per_{axis}"
+
+    def partial(self, sweep, start, stop, res):
+        key = np.asarray(getattr(res, self.objective), dtype=float)
+        key = key if self.minimize else -key
+        key = np.where(feasible_mask(res, self.constraints) & np.isfinite(key), key, np.inf)
+        ax = sweep.axis_index(self.axis, start, stop)
+        order = np.lexsort((key, ax))
+        groups, first = np.unique(ax[order], return_index=True)
+        best = order[first]
+        return {int(g): (float(key[b]), start + int(b))
+                for g, b in zip(groups, best) if np.isfinite(key[b])}
+
+    def combine(self, a, b):
+        out = dict(a)
+        for g, v in b.items():
+            if g not in out or v < out[g]:
+                out[g] = v
+        return out
+
+    def finalize(self, sweep, state):
+        vals = sweep.axes[self.axis]
+        out = {}
+        for g in sorted(state):
+            key, flat = state[g]
+            out[float(vals[g])] = {"index": flat,
+                                   "objective": key if self.minimize else -key,
+                                   "params": sweep.point(flat)}
+        return out
+
+
+class Histogram(Reducer):
+    """Bir alanın sabit kenarlı histogramı (varsayılan: sadece uygun noktalar)."""
+
+    def __init__(self, field_name, bins, constraints=None, feasible_only=True, name=None):
+        self.field = field_name
+        self.bins = np.asarray(bins, dtype=float)
+        self.constraints = constraints
+        self.feasible_only = feasible_only
+        self.name = name or f"hist_{field_name}"
+
+    def partial(self, sweep, start, stop, res):
+        v = np.asarray(getattr(res, self.field), dtype=float)
+        if self.feasible_only:
+            v = v[feasible_mask(res, self.constraints)]
+        counts, _ = np.histogram(v[np.isfinite(v)], bins=self.bins)
+        return counts
+
+    def combine(self, a, b):
+        return a + b
+
+    def finalize(self, sweep, state):
+        return {"edges": self.bins, "counts": state}
+
+
+# ---------- Çalıştırıcı ----------
+@dataclass
+class SweepResult:
+    sweep: Sweep
+    fields: tuple
+    array: object = None          # (len(fields),) + sweep.shape memmap veya None
+    path: str = None
+    reductions: dict = field(default_factory=dict)
+    done: int = 0
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+    def __getitem__(self, name):
+        return self.array[self.fields.index(name)]
+
+    @property
+    def throughput(self):
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def close(self, delete=False):
+        """memmap'i bırak; delete=True ise geçici .npy dosyasını sil."""
+        if self.array is not None:
+            self.array.flush()
+            self.array = None
+        if delete and self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+_W = {}  # worker durumu (initializer ile doldurulur)
+
+
+def _init_worker(sweep, path, fields, reducers, cancel_event):
+    _W.update(sweep=sweep, fields=fields, reducers=reducers, cancel=cancel_event,
+              out=np.load(path, mmap_mode="r+") if path else None)
+
+
+def _run_chunk(start, stop):
+    if _W["cancel"] is not None and _W["cancel"].is_set():
+        return start, stop, None
+    sweep = _W["sweep"]
+    res = sweep.evaluate(start, stop)
+    out = _W["out"]
+    if out is not None:
+        flat = out.reshape(len(_W["fields"]), -1)
+        for i, name in enumerate(_W["fields"]):
+            flat[i, start:stop] = getattr(res, name)
+    return start, stop, [r.partial(sweep, start, stop, res) for r in _W["reducers"]]
+
+
+def run_sweep(sweep, fields=(), reducers=(), out_path=None, dtype=np.float32,
+              workers=None, chunk_size=DEFAULT_CHUNK, progress=None, cancel_event=None):
+    """Izgarayı parçalara bölüp süreç havuzunda hesapla.
+
+    fields: çıktı dizisine yazılacak alanlar (boş ise sadece reducer'lar çalışır).
+    out_path: .npy memmap yolu; verilmezse geçici dizinde oluşturulur.
+    progress: progress(done, total) ana süreçte parça bitince çağrılır.
+    cancel_event: set edilince bekleyen parçalar iptal edilir (threading veya mp Event).
+    workers: None = os.cpu_count(); 1 = havuz açmadan bu süreçte çalış.
+    """
+    fields = tuple(fields)
+    for name in fields:
+        if name not in OUTPUT_FIELDS or (name == "nsnp_req" and sweep.topology != "flyback"):
+            raise ValueError(f"Bilinmeyen alan: {name}")
+    reducers = list(reducers)
+    result = SweepResult(sweep, fields)
+    if fields:
+        if out_path is None:
+            fd, out_path = tempfile.mkstemp(prefix=f"sweep_{sweep.topology}_", suffix=".npy")
+            os.close(fd)
+        # sadece başlık + dosya boyutu; worker'lar kendi memmap'lerini açar
+        np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype,
+                                  shape=(len(fields),) + sweep.shape).flush()
+        result.path = out_path
+
+    bounds = [(s, min(s + chunk_size, sweep.size)) for s in range(0, sweep.size, chunk_size)]
+    states = [None] * len(reducers)
+
+    def merge(partials):
+        for i, p in enumerate(partials):
+            states[i] = p if states[i] is None else reducers[i].combine(states[i], p)
+
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    if workers == 1:
+        _init_worker(sweep, result.path, fields, reducers, cancel_event)
+        try:
+            for s, e in bounds:
+                _, _, partials = _run_chunk(s, e)
+                if partials is None:
+                    result.cancelled = True
+                    break
+                merge(partials)
+                result.done += e - s
+                if progress:
+                    progress(result.done, sweep.size)
+        finally:
+            _W.clear()
+    else:
+        # threading.Event süreçlere taşınamaz; bekleme döngüsü onu mp.Event'e aktarır
+        mp_cancel = mp.get_context().Event()
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds)) or 1,
+                                 initializer=_init_worker,
+                                 initargs=(sweep, result.path, fields, reducers, mp_cancel)) as ex:
+            pending = {ex.submit(_run_chunk, s, e) for s, e in bounds}
+            while pending:
+                finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    if fut.cancelled():
+                        continue
+                    s, e, partials = fut.result()
+                    if partials is None:
+                        continue
+                    merge(partials)
+                    result.done += e - s
+                    if progress:
+                        progress(result.done, sweep.size)
+                if cancel_event is not None and cancel_event.is_set() and not mp_cancel.is_set():
+                    mp_cancel.set()
+                    for fut in pending:
+                        fut.cancel()
+    result.elapsed = time.perf_counter() - t0
+    result.cancelled = result.cancelled or result.done < sweep.size
+
+    if fields:
+        result.array = np.load(result.path, mmap_mode="r+")
+    result.reductions = {r.name: r.finalize(sweep, st) for r, st in zip(reducers, states)
+                         if st is not None}
+    return result
@@ -0,0 +1,335 @@
+# switching_sim.py
+# Boost / Buck / Flyback için periyot-doğru (cycle-accurate) zaman domeni simülatörü.
+# Anahtar / diyot / DCM durumları parça parça doğrusal (affine) durum uzayı
+# segmentleri olarak modellenir: dx/dt = A x + b, x = [iL, vC].
+# Her segment süresi için kesin ayrık güncelleme x+ = Phi x + Gamma, genişletilmiş
+# matrisin üsteli ile bir kez hesaplanır ve önbelleğe alınır. Periyot döngüsü saf
+# Python float işlemleriyle çalışır (2x2 için NumPy çağrısından çok daha hızlı).
+# DCM'de diyotun kesime girdiği an, önceden hesaplanmış toff/2^k adımlarıyla
+# ikiye bölme (bisection) ile bulunur.
+# dense=True tüm periyotların tam çözünürlüklü dalga formunu da üretir: periyot
+# başı durumları döngüden gelir, periyot içi örnekler aynı (yük, duty) aşamasını
+# paylaşan periyotlar için birikimli alt adım matrisleriyle vektörel hesaplanır.
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+BISECT_DEPTH = 20  # DCM geçiş anı çözünürlüğü: toff / 2^20
+
+
+def expm(M):
+    """Küçük kare matris üsteli (ölçekle-kare al + Taylor). scipy gerektirmez."""
+    M = np.asarray(M, dtype=float)
+    norm = np.abs(M).sum(axis=1).max()
+    s = max(0, int(math.ceil(math.log2(norm / 0.5)))) if norm > 0.5 else 0
+    X = M / (1 << s)
+    E = np.eye(len(M))
+    term = np.eye(len(M))
+    for k in range(1, 18):
+        term = term @ X / k
+        E = E + term
+    for _ in range(s):
+        E = E @ E
+    return E
+
+
+def _affine_step(A, b, h):
+    """dx/dt = A x + b için h süresinde kesin güncelleme: (Phi, Gamma)."""
+    M = np.zeros((3, 3))
+    M[:2, :2] = A
+    M[:2, 2] = b
+    E = expm(M * h)
+    return (E[0, 0], E[0, 1], E[1, 0], E[1, 1]), (E[0, 2], E[1, 2])
+
+
+def _segments(topology, Vin, L, C, R, nsnp, rL):
+    """(A_on, b_on, A_off, b_off). Flyback'te iL primer mıknatıslama akımıdır.
+
+    Flyback sarım oranı calc_core ile aynı kuraldadır: ideal CCM'de
+    Vout = Vin·D / (nsnp·(1 − D)), yani ideal_duty = Vout / (Vout + Vin/nsnp).
+    Sekonder iletimde primere yansıyan gerilim nsnp·v, sekonder akım nsnp·iL'dir."""
+    if topology == "boost":
+        A_on = [[-rL / L, 0.0], [0.0, -1.0 / (R * C)]]
+        b_on = [Vin / L, 0.0]
+        A_off = [[-rL / L, -1.0 / L], [1.0 / C, -1.0 / (R * C)]]
+        b_off = [Vin / L, 0.0]
+    elif topology == "buck":
+        A_on = [[-rL / L, -1.0 / L], [1.0 / C, -1.0 / (R * C)]]
+        b_on = [Vin / L, 0.0]
+        A_off = A_on
+        b_off = [0.0, 0.0]
+    elif topology == "flyback":
+        n = nsnp
+        A_on = [[-rL / L, 0.0], [0.0, -1.0 / (R * C)]]
+        b_on = [Vin / L, 0.0]
+        # sekonder iletimde: primer gerilim -n·v, sekonder akım n·iL (calc_core kuralı)
+        A_off = [[-rL / L, -n / L], [n / C, -1.0 / (R * C)]]
+        b_off = [0.0, 0.0]
+    else:
+        raise ValueError(f"Bilinmeyen topoloji: {topology}")
+    return np.array(A_on), np.array(b_on), np.array(A_off), np.array(b_off)
+
+
+def ideal_duty(topology, Vin, Vout, nsnp=1.0):
+    if topology == "boost":
+        return 1.0 - Vin / Vout
+    if topology == "buck":
+        return Vout / Vin
+    return Vout / (Vout + Vin / nsnp)
+
+
+class _Stage:
+    """Tek bir (yük, duty) çifti için önceden hesaplanmış ayrık güncellemeler."""
+
+    def __init__(self, A_on, b_on, A_off, b_off, T, D, tau, substeps=0):
+        self.ton, self.toff, self.tau = D * T, (1.0 - D) * T, tau
+        self.A_off, self.b_off = A_off, b_off
+        self.on = _affine_step(A_on, b_on, self.ton)
+        self.off = _affine_step(A_off, b_off, self.toff)
+        self._bisect = None
+        self.sub = None
+        if substeps:
+            # detay çizimi için eşit alt adımlar (ON ve OFF ayrı)
+            k_on = max(1, int(round(substeps * D)))
+            k_off = max(1, substeps - k_on)
+            self.sub = (k_on, _affine_step(A_on, b_on, self.ton / k_on),
+                        k_off, _affine_step(A_off, b_off, self.toff / k_off))
+
+    def cumulative(self):
+        """Alt adım güncellemelerinin birikimli halleri: ON ve OFF için (Phi (k,2,2), Gamma (k,2))."""
+        k_on, m_on, k_off, m_off = self.sub
+        return _powers(m_on, k_on), _powers(m_off, k_off)
+
+    @property
+    def bisect(self):
+        # sadece DCM'de gerekir; CCM periyotlarında hiç hesaplanmaz
+        if self._bisect is None:
+            self._bisect = [_affine_step(self.A_off, self.b_off, self.toff / (1 << k))
+                            for k in range(1, BISECT_DEPTH + 1)]
+        return self._bisect
+
+
+def _powers(m, k):
+    """m, m∘m, ... (k adet) affine güncelleme; saf float döngüsü (k ~ yüzler)."""
+    (a, b, c, d), (g0, g1) = m
+    rows = []
+    pa, pb, pc, pd, q0, q1 = a, b, c, d, g0, g1
+    for _ in range(k):
+        rows.append((pa, pb, pc, pd, q0, q1))
+        pa, pb, pc, pd, q0, q1 = (a * pa + b * pc, a * pb + b * pd, c * pa + d * pc, c * pb + d * pd,
+                                  a * q0 + b * q1 + g0, c * q0 + d * q1 + g1)
+    arr = np.array(rows)
+    return arr[:, :4].reshape(k, 2, 2), arr[:, 4:]
+
+
+def _apply(m, i, v):
+    (a, b, c, d), (g0, g1) = m
+    return a * i + b * v + g0, c * i + d * v + g1
+
+
+def _zero_cross(stage, i, v):
+    """OFF segmentinde iL'nin sıfıra indiği ana kadar ilerle: (t*, v(t*))."""
+    t = 0.0
+    h = stage.toff
+    for m in stage.bisect:
+        h *= 0.5
+        i2, v2 = _apply(m, i, v)
+        if i2 > 0.0:
+            i, v, t = i2, v2, t + h
+    return t, v
+
+
+@dataclass
+class SimResult:
+    topology: str
+    freq: float
+    t: np.ndarray          # periyot başlangıç zamanları (s)
+    iL_start: np.ndarray   # periyot başındaki akım (CCM'de vadi)
+    iL_peak: np.ndarray    # ON sonundaki akım (tepe)
+    v_start: np.ndarray    # periyot başındaki çıkış gerilimi
+    duty: np.ndarray
+    dcm: np.ndarray        # bool, periyotta diyot akımı sıfıra indi mi
+    t_detail: np.ndarray   # son periyotların yoğun örneklenmiş dalga formu
+    iL_detail: np.ndarray
+    v_detail: np.ndarray
+    detail_cycles: int
+    t_dense: Optional[np.ndarray] = None   # dense=True: tüm periyotlar, periyot başına points_per_cycle
+    iL_dense: Optional[np.ndarray] = None
+    v_dense: Optional[np.ndarray] = None
+
+    def _last_cycle(self, arr):
+        n = len(arr) // max(1, self.detail_cycles)
+        return arr[-n:]
+
+    @property
+    def delta_IL(self):
+        """Son periyottaki akım dalgalanması (A)."""
+        lo = 0.0 if self.dcm[-1] else self.iL_start[-1]
+        return float(self.iL_peak[-1] - lo)
+
+    @property
+    def delta_Vout(self):
+        """Son periyottaki tepe-tepe çıkış dalgalanması (V), detay dalga formundan."""
+        seg = self._last_cycle(self.v_detail)
+        return float(seg.max() - seg.min()) if len(seg) else float("nan")
+
+    @property
+    def IL_avg(self):
+        """Son periyodun ortalama bobin akımı (detay dalga formundan)."""
+        seg = self._last_cycle(self.iL_detail)
+        return float(np.mean(seg)) if len(seg) else float("nan")
+
+    @property
+    def Vout_final(self):
+        return float(self.v_start[-1])
+
+    def settling_time(self, tol=0.02):
+        """Çıkışın son değerin ±tol bandına girip kaldığı an (s)."""
+        vf = self.v_start[-1]
+        out = np.abs(self.v_start - vf) > tol * abs(vf)
+        idx = np.flatnonzero(out)
+        if len(idx) == 0:
+            return 0.0
+        if idx[-1] + 1 >= len(self.t):
+            return float("nan")
+        return float(self.t[idx[-1] + 1])
+
+
+def simulate(topology, Vin, Vout, freq, L, C, Iout, cycles=2000, nsnp=1.0, rL=0.0,
+             duty=None, soft_start_cycles=0, duty_levels=None, load_steps=(),
+             x0=(0.0, 0.0), detail_cycles=4, points_per_cycle=200, dense=False):
+    """Periyot-doğru simülasyon.
+
+    duty: sabit duty (None = ideal formül, Vout hedefinden).
+    soft_start_cycles: duty bu kadar periyotta 0'dan doğrusal rampa ile yükselir.
+    duty_levels: duty nicemleme adımı sayısı (ör. ARR+1); None ise soft-start
+        varken 1024 seviye kullanılır.
+    load_steps: [(t_s, Iout_yeni), ...] yük basamakları (R = Vout / Iout).
+    detail_cycles: sonda yoğun örneklenen (points_per_cycle) periyot sayısı.
+    dense: tüm periyotları points_per_cycle ile örnekle (t_dense / iL_dense / v_dense);
+        DCM'de sıfır geçişi alt adım çözünürlüğündedir (periyot başları yine kesindir).
+    """
+    T = 1.0 / freq
+    D_final = ideal_duty(topology, Vin, Vout, nsnp) if duty is None else duty
+    if not 0.0 < D_final < 1.0:
+        raise ValueError("Duty (0, 1) aralığında olmalı; parametreleri kontrol edin.")
+    if duty_levels is None and soft_start_cycles:
+        duty_levels = 1024
+    steps = sorted(load_steps)
+    stages = {}
+
+    def stage(R, D, sub=0):
+        key = (R, D, sub)
+        if key not in stages:
+            segs = _segments(topology, Vin, L, C, R, nsnp, rL)
+            stages[key] = _Stage(*segs, T, D, R * C, sub)
+        return stages[key]
+
+    def duty_at(k):
+        d = D_final if k >= soft_start_cycles else D_final * (k + 1) / soft_start_cycles
+        if duty_levels:
+            d = max(1, round(d * duty_levels)) / duty_levels
+        return min(d, 1.0 - 1.0 / (duty_levels or 1e9))
+
+    n_main = max(0, cycles - detail_cycles)
+    ts = np.arange(cycles) * T
+    i_start = np.empty(cycles)
+    i_peak = np.empty(cycles)
+    v_start = np.empty(cycles)
+    duties = np.empty(cycles)
+    dcm = np.zeros(cycles, dtype=bool)
+    loads = np.empty(cycles)
+
+    i, v = float(x0[0]), float(x0[1])
+    R = Vout / Iout
+    si = 0
+    det_t, det_i, det_v = [], [], []
+    for k in range(cycles):
+        t0 = k * T
+        while si < len(steps) and steps[si][0] <= t0:
+            R = Vout / steps[si][1]
+            si += 1
+        D = duty_at(k)
+        detail = k >= n_main
+        st = stage(R, D, points_per_cycle if detail else 0)
+        i_start[k], v_start[k], duties[k], loads[k] = i, v, D, R
+
+        if not detail:
+            i, v = _apply(st.on, i, v)
+            i_peak[k] = i
+            i2, v2 = _apply(st.off, i, v)
+            if i2 < 0.0:
+                # DCM: akım toff içinde sıfıra iner, kalan sürede sadece C yüke boşalır
+                tz, vz = _zero_cross(st, i, v)
+                i, v = 0.0, vz * math.exp(-(st.toff - tz) / st.tau)
+                dcm[k] = True
+            else:
+                i, v = i2, v2
+            continue
+
+        # detay periyodu: eşit alt adımlarla örnekle
+        k_on, m_on, k_off, m_off = st.sub
+        h_on, h_off = st.ton / k_on, st.toff / k_off
+        det_t.append(t0); det_i.append(i); det_v.append(v)
+        for j in range(k_on):
+            i, v = _apply(m_on, i, v)
+            det_t.append(t0 + (j + 1) * h_on); det_i.append(i); det_v.append(v)
+        i_peak[k] = i
+        t1 = t0 + st.ton
+        i_end, _ = _apply(st.off, i, v)
+        dcm[k] = i_end < 0.0
+        tz, vz = _zero_cross(st, i, v) if dcm[k] else (math.inf, 0.0)
+        for j in range(k_off):
+            tj = h_off * (j + 1)
+            if tj <= tz:
+                i, v = _apply(m_off, i, v)
+            else:
+                i, v = 0.0, vz * math.exp(-(tj - tz) / st.tau)
+            det_t.append(t1 + tj); det_i.append(i); det_v.append(v)
+
+    dense_arrays = (_densify(stage, ts, i_start, v_start, loads, duties, points_per_cycle)
+                    if dense and cycles else ())
+    return SimResult(topology, freq, ts, i_start, i_peak, v_start, duties, dcm,
+                     np.array(det_t), np.array(det_i), np.array(det_v), min(detail_cycles, cycles),
+                     *dense_arrays)
+
+
+def _densify(stage, ts, i_start, v_start, loads, duties, points_per_cycle):
+    """Periyot başı durumlarından tam çözünürlüklü (t, iL, v). Aynı (R, D) aşamasındaki
+    periyotlar tek einsum ile çözülür; DCM'de akım ilk negatif alt adımda sıfırlanır ve
+    gerilim son pozitif örnekten RC ile boşalır."""
+    uniq, inv = np.unique(np.column_stack((loads, duties)), axis=0, return_inverse=True)
+    inv = inv.ravel()
+    stages = [stage(float(R), float(D), points_per_cycle) for R, D in uniq]
+    per = np.array([st.sub[0] + st.sub[2] for st in stages])
+    counts = per[inv]
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    total = int(counts.sum())
+    t, iL, v = np.empty(total), np.empty(total), np.empty(total)
+    for g, st in enumerate(stages):
+        c = np.flatnonzero(inv == g)
+        (P_on, G_on), (P_off, G_off) = st.cumulative()
+        k_on, k_off = len(P_on), len(P_off)
+        x0 = np.column_stack((i_start[c], v_start[c]))
+        on = np.einsum("jab,mb->mja", P_on, x0) + G_on
+        off = np.einsum("jab,mb->mja", P_off, on[:, -1]) + G_off
+        h_on, h_off = st.ton / k_on, st.toff / k_off
+        neg = off[..., 0] < 0.0
+        if neg.any():
+            jz = np.where(neg.any(axis=1), neg.argmax(axis=1), k_off)
+            rows = np.arange(len(c))
+            v_anchor = np.where(jz > 0, off[rows, np.maximum(jz - 1, 0), 1], on[:, -1, 1])
+            j = np.arange(k_off)
+            after = j[None, :] >= jz[:, None]
+            decay = v_anchor[:, None] * np.exp(-(j[None, :] + 1 - jz[:, None]) * h_off / st.tau)
+            off[..., 0] = np.where(after, 0.0, off[..., 0])
+            off[..., 1] = np.where(after, decay, off[..., 1])
+        offs = np.concatenate(([0.0], h_on * np.arange(1, k_on + 1), st.ton + h_off * np.arange(1, k_off)))
+        pos = first[c][:, None] + np.arange(k_on + k_off)
+        t[pos] = ts[c][:, None] + offs
+        iL[pos] = np.concatenate((x0[:, None, 0], on[..., 0], off[:, :-1, 0]), axis=1)
+        v[pos] = np.concatenate((x0[:, None, 1], on[..., 1], off[:, :-1, 1]), axis=1)
+    return t, iL, v
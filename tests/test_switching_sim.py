@@ -0,0 +1,13 @@
+# tests/test_switching_sim.py
+# Anahtarlamalı benzetimin çalışma noktası kontrolleri.
+
+import pytest
+
+from switching_sim import simulate
+
+
+@pytest.mark.parametrize("nsnp", [0.5, 1.0, 2.0])
+def test_flyback_vout_independent_of_turns_ratio(nsnp):
+    # nsnp kuralı calc_core ile aynı olmalı: oran ne olursa olsun ideal_duty hedefe götürür
+    s = simulate("flyback", 28.0, 82.0, 50e3, 100e-6, 470e-6, 1.0, cycles=20000, nsnp=nsnp)
+    assert s.Vout_final == pytest.approx(82.0, rel=0.01)
@@ -0,0 +1,231 @@
+# timer_solver.py
+# PWM timer PSC/ARR çözücü.
+# f_pwm = f_clk / ((PSC+1) * (ARR+1)). N = (PSC+1)*(ARR+1) periyot sayısıdır.
+# Her f_clk için N -> en yüksek çözünürlüklü (en büyük ARR) çarpanlara ayırma tablosu
+# bir kez kurulur ve önbelleğe alınır; hedef frekans sorguları bu tabloda indeksli
+# arama ile yapılır. Tablo dışındaki (çok düşük) frekanslar için tüm PSC değerleri
+# vektörel olarak taranır.
+
+import functools
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_N_MAX = 1 << 21  # tablo sınırı; 72 MHz için ~34 Hz'e kadar
+DEFAULT_MAX_ERR = 0.01   # Pareto listesinde izin verilen maksimum bağıl frekans hatası
+
+
+@dataclass(frozen=True)
+class TimerResult:
+    psc: int
+    arr: int
+    f_clk: float
+    f_pwm: float  # istenen PWM frekansı
+
+    @property
+    def f_actual(self):
+        """PSC/ARR ile elde edilen gerçek PWM frekansı (Hz)."""
+        return self.f_clk / ((self.psc + 1) * (self.arr + 1))
+
+    @property
+    def error(self):
+        """Bağıl frekans hatası (f_actual - f_pwm) / f_pwm."""
+        return (self.f_actual - self.f_pwm) / self.f_pwm
+
+    @property
+    def resolution_bits(self):
+        """Duty çözünürlüğü (log2(ARR+1))."""
+        return math.log2(self.arr + 1)
+
+
+# ---------- Tablo ----------
+def _build_best(n_max, psc1_max, arr1_max):
+    """best[N] = N'i bölen en büyük ARR+1 (PSC+1 <= psc1_max koşuluyla), 0 = gerçeklenemez."""
+    best = np.zeros(n_max + 1, dtype=np.int32)
+    top = min(n_max, arr1_max)
+    best[1:top + 1] = np.arange(1, top + 1, dtype=np.int32)  # PSC = 0
+    if n_max <= arr1_max:
+        return best
+    # N > arr1_max: artan d ile yazılır, böylece en son (en büyük) bölen kalır
+    for d in range(1, arr1_max + 1):
+        kmin = arr1_max // d + 1
+        kmax = min(psc1_max, n_max // d)
+        if kmin <= kmax:
+            best[d * kmin: d * kmax + 1: d] = d
+    return best
+
+
+class TimerTable:
+    """Tek bir f_clk için önceden hesaplanmış N -> (PSC, ARR) tablosu."""
+
+    def __init__(self, f_clk, psc_bits=16, arr_bits=16, n_max=DEFAULT_N_MAX):
+        self.f_clk = float(f_clk)
+        self.psc1_max = 1 << psc_bits
+        self.arr1_max = 1 << arr_bits
+        self.n_max = int(min(n_max, self.psc1_max * self.arr1_max))
+        self.best = _build_best(self.n_max, self.psc1_max, self.arr1_max)
+        self.ok = np.flatnonzero(self.best)  # gerçeklenebilir N değerleri (sıralı)
+        # float kopya: searchsorted float hedeflerle int dizide her çağrıda tüm diziyi dönüştürür
+        self._ok_f = self.ok.astype(float)
+
+    @property
+    def f_min(self):
+        return self.f_clk / self.n_max
+
+    def best_batch(self, f_pwm):
+        """Her hedef için en küçük hatalı seçenek: (psc, arr, f_actual, hata) dizileri.
+
+        Tablo aralığı dışındaki hedefler için psc/arr = -1, hata = NaN döner.
+        """
+        f = np.asarray(f_pwm, dtype=float)
+        target = self.f_clk / f
+        i = np.clip(np.searchsorted(self._ok_f, target), 1, len(self.ok) - 1)
+        lo, hi = self.ok[i - 1], self.ok[i]
+        err_lo = np.abs(self.f_clk / lo - f)
+        err_hi = np.abs(self.f_clk / hi - f)
+        # eşitlikte daha yüksek çözünürlüklü olanı seç
+        pick_hi = (err_hi < err_lo) | ((err_hi == err_lo) & (self.best[hi] > self.best[lo]))
+        n = np.where(pick_hi, hi, lo)
+        d = self.best[n].astype(np.int64)
+        psc, arr = n // d - 1, d - 1
+        f_act = self.f_clk / n
+        out = (target < 1) | (target > self.n_max)
+        psc = np.where(out, -1, psc)
+        arr = np.where(out, -1, arr)
+        return psc, arr, np.where(out, np.nan, f_act), np.where(out, np.nan, (f_act - f) / f)
+
+    def pareto(self, f_pwm, max_err=DEFAULT_MAX_ERR):
+        """Frekans hatası - ARR çözünürlüğü Pareto listesi (hata artan sırada)."""
+        f_pwm = float(f_pwm)
+        target = self.f_clk / f_pwm
+        lo = max(1, int(math.floor(target / (1.0 + max_err))))
+        hi = int(math.ceil(target / (1.0 - max_err))) if max_err < 1 else self.n_max
+        if hi > self.n_max or target < 1:
+            return None  # tablo dışı
+        c = int(min(max(math.floor(target), lo), hi))
+        # hedeften iki yöne uzaklaştıkça çözünürlük rekoru kıran N'ler aday
+        cands = []
+        for seg in (np.arange(c, lo - 1, -1), np.arange(c + 1, hi + 1)):
+            if len(seg):
+                b = self.best[seg]
+                rec = np.maximum.accumulate(b)
+                keep = (b > 0) & (b == rec) & np.r_[True, rec[1:] > rec[:-1]]
+                cands.append(seg[keep])
+        n = np.concatenate(cands).astype(np.int64)
+        d = self.best[n].astype(np.int64)
+        return _pareto_front(n // d, d, self.f_clk, f_pwm, max_err)
+
+
+def _pareto_front(p1, d, f_clk, f_pwm, max_err):
+    """(PSC+1, ARR+1) adaylarından hata artan / ARR artan Pareto listesi."""
+    err = np.abs(f_clk / (p1 * d) - f_pwm) / f_pwm
+    sel = err <= max_err
+    p1, d, err = p1[sel], d[sel], err[sel]
+    order = np.lexsort((-d, err))
+    d_sorted = d[order]
+    prev = np.maximum.accumulate(np.r_[0, d_sorted[:-1]]) if len(d_sorted) else d_sorted
+    keep = order[d_sorted > prev]
+    return [TimerResult(int(a - 1), int(b - 1), float(f_clk), float(f_pwm))
+            for a, b in zip(p1[keep], d[keep])]
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_table(f_clk, psc_bits, arr_bits, n_max):
+    return TimerTable(f_clk, psc_bits, arr_bits, n_max)
+
+
+def timer_table(f_clk, psc_bits=16, arr_bits=16, n_max=DEFAULT_N_MAX):
+    """f_clk başına memoize edilmiş TimerTable."""
+    return _cached_table(float(f_clk), int(psc_bits), int(arr_bits), int(n_max))
+
+
+# ---------- Tam tarama (referans / tablo dışı) ----------
+def scan_options(f_clk, f_pwm, psc_bits=16, arr_bits=16, max_err=DEFAULT_MAX_ERR):
+    """Tüm PSC değerlerini vektörel tara; Pareto listesi döndür.
+
+    Her PSC satırında hedefin altındaki en yakın ARR ile, hedefin üstünde hata
+    penceresine sığan tüm ARR'ler adaydır (satır içindeki Pareto kümesi budur).
+    """
+    f_clk, f_pwm = float(f_clk), float(f_pwm)
+    arr1_max = 1 << arr_bits
+    p1 = np.arange(1, (1 << psc_bits) + 1, dtype=np.int64)
+    ideal = f_clk / (p1 * f_pwm)
+    d_lo = np.minimum(np.floor(ideal), arr1_max)
+    d_start = np.maximum(np.ceil(ideal), 1)
+    if max_err < 1:
+        d_end = np.minimum(np.floor(f_clk / (p1 * f_pwm * (1.0 - max_err))), arr1_max)
+    else:
+        d_end = np.minimum(d_start, arr1_max)
+    cnt = np.maximum(d_end - d_start + 1, 0).astype(np.int64)
+    offs = np.arange(cnt.sum(), dtype=np.int64) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+    ok = (d_lo >= 1) & (d_lo <= arr1_max)
+    all_p1 = np.concatenate([p1[ok], np.repeat(p1, cnt)])
+    all_d = np.concatenate([d_lo[ok].astype(np.int64), np.repeat(d_start.astype(np.int64), cnt) + offs])
+    return _pareto_front(all_p1, all_d, f_clk, f_pwm, max_err)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_pareto(f_clk, f_pwm, psc_bits, arr_bits, max_err):
+    front = timer_table(f_clk, psc_bits, arr_bits).pareto(f_pwm, max_err)
+    if front is None:
+        front = scan_options(f_clk, f_pwm, psc_bits, arr_bits, max_err)
+    return tuple(front)
+
+
+def pareto_options(f_clk, f_pwm, psc_bits=16, arr_bits=16, max_err=DEFAULT_MAX_ERR):
+    """Hedef frekans için Pareto seçenekleri (tuple). Tablo dışıysa tam taramaya düşer."""
+    return _cached_pareto(float(f_clk), float(f_pwm), int(psc_bits), int(arr_bits), float(max_err))
+
+
+def solve_batch(f_clk, f_pwm, psc_bits=16, arr_bits=16):
+    """Binlerce hedef frekans için toplu çözüm: (psc, arr, f_actual, hata) dizileri."""
+    f = np.asarray(f_pwm, dtype=float)
+    table = timer_table(f_clk, psc_bits, arr_bits)
+    psc, arr, f_act, err = table.best_batch(f)
+    for i in np.flatnonzero(psc < 0):  # tablo dışı: tek tek tara
+        front = scan_options(f_clk, f.flat[i], psc_bits, arr_bits, 1.0)
+        if front:
+            o = front[0]
+            psc.flat[i], arr.flat[i], f_act.flat[i], err.flat[i] = o.psc, o.arr, o.f_actual, o.error
+    return psc, arr, f_act, err
+
+
+def best_timer(f_clk, f_pwm, psc_bits=16, arr_bits=16):
+    """En küçük frekans hatalı PSC/ARR (eşitlikte en yüksek ARR)."""
+    psc, arr, _, _ = solve_batch(f_clk, np.array([f_pwm], dtype=float), psc_bits, arr_bits)
+    if psc[0] < 0:
+        raise ValueError("Bu f_clk ile istenen PWM frekansı elde edilemiyor")
+    return TimerResult(int(psc[0]), int(arr[0]), float(f_clk), float(f_pwm))
+
+
+# ---------- Tekil hesap (GUI girişleri) ----------
+def calc_timer(f_clk, f_pwm, psc=None, arr=None):
+    """PSC/ARR hesapla. psc veya arr verilirse sabit tutulur; hiçbiri verilmezse
+    en küçük frekans hatalı (eşitlikte en yüksek çözünürlüklü) çift seçilir."""
+    f_clk = float(f_clk)
+    f_pwm = float(f_pwm)
+    if f_pwm <= 0:
+        raise ValueError("PWM frekansı pozitif olmalı")
+    if psc is not None and arr is None:
+        PSC_calc = int(psc)
+        ARR_calc = int(max(0, round(f_clk / ((PSC_calc + 1) * f_pwm) - 1)))
+    elif arr is not None and psc is None:
+        ARR_calc = int(arr)
+        PSC_calc = int(max(0, round(f_clk / ((ARR_calc + 1) * f_pwm) - 1)))
+    else:
+        return best_timer(f_clk, f_pwm)
+    return TimerResult(PSC_calc, ARR_calc, f_clk, f_pwm)
+
+
+def calc_timer_from_inputs(f_clk, f_pwm, psc_fix, arr_fix, psc_val_str, arr_val_str):
+    """Return integer PSC_calc, ARR_calc based on choices. Best-accuracy pair if none fixed."""
+    try:
+        f_clk = float(f_clk)
+        f_pwm = float(f_pwm)
+    except:
+        raise ValueError("f_clk veya f_pwm sayısal değil")
+    psc = float(psc_val_str) if psc_fix and not arr_fix else None
+    arr = float(arr_val_str) if arr_fix and not psc_fix else None
+    tr = calc_timer(f_clk, f_pwm, psc, arr)
+    return tr.psc, tr.arr
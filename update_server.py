@@ -0,0 +1,179 @@
+# update_server.py
+# Güncelleme akışını denemek için yerel HTTP sunucusu (GitHub raw / Releases yerine).
+# Bir dizindeki dosyaları ETag / If-None-Match (304), Range (206) ve If-Range ile sunar.
+# Test için bant genişliği sınırı (rate) ve ilk N baytta bağlantı koparma (drop_after)
+# seçenekleri vardır. --publish her yeni sürümde önceki EXE'den bir delta yaması üretir
+# ve manifest'in yama listesine ekler (1.0.1 -> 1.0.2 -> 1.0.3 zinciri).
+#
+#   python update_server.py DIZIN --port 8000 --publish 1.0.2 hesap_defteri.exe
+#   HESAP_UPDATE_URL=http://127.0.0.1:8000/ python hesap_defteri.py
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from delta import make_patch
+from updater import build_manifest, sha256_file
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def _etag(path):
+    st = os.stat(path)
+    key = f"{path}:{st.st_size}:{st.st_mtime_ns}".encode()
+    return '"' + hashlib.blake2b(key, digest_size=8).hexdigest() + '"'
+
+
+class UpdateRequestHandler(SimpleHTTPRequestHandler):
+    rate = None          # bayt/s (None = sınırsız)
+    drop_after = None    # ilk tam indirmede bu kadar bayttan sonra bağlantıyı kes
+    stats = None         # {"requests", "not_modified", "partial", "bytes"}
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        size = os.path.getsize(path)
+        etag = _etag(path)
+        self.stats["requests"] += 1
+        if self.headers.get("If-None-Match") == etag:
+            self.stats["not_modified"] += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        start, end = 0, size - 1
+        m = _RANGE.match(self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range")
+        partial = m is not None and (if_range is None or if_range == etag)
+        if partial:
+            a, b = m.groups()
+            start = int(a) if a else max(0, size - int(b or 0))
+            end = min(int(b), size - 1) if a and b else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            self.stats["partial"] += 1
+        self.send_response(206 if partial else 200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        if partial:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        self._send_body(path, start, end - start + 1)
+
+    def _send_body(self, path, start, length):
+        drop = None
+        if self.drop_after is not None and start == 0 and length > self.drop_after:
+            drop, type(self).drop_after = self.drop_after, None  # sadece bir kez
+        sent = 0
+        t0 = time.perf_counter()
+        with open(path, "rb") as f:
+            f.seek(start)
+            while sent < length:
+                n = min(64 * 1024, length - sent)
+                if drop is not None:
+                    n = min(n, drop - sent)
+                    if n <= 0:
+                        self.close_connection = True
+                        return
+                data = f.read(n)
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    return  # istemci iptal etti
+                sent += len(data)
+                self.stats["bytes"] += len(data)
+                if self.rate:
+                    lag = sent / self.rate - (time.perf_counter() - t0)
+                    if lag > 0:
+                        time.sleep(lag)
+
+
+def serve(directory, port=0, host="127.0.0.1", rate=None, drop_after=None):
+    """Sunucuyu arka plan thread'inde başlat; (server, base_url) döndür. server.shutdown() ile durur."""
+    directory = os.path.abspath(directory)
+    stats = {"requests": 0, "not_modified": 0, "partial": 0, "bytes": 0}
+    handler = type("Handler", (UpdateRequestHandler,),
+                   {"rate": rate, "drop_after": drop_after, "stats": stats})
+    server = ThreadingHTTPServer((host, port),
+                                 lambda *a, **k: handler(*a, directory=directory, **k))
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def publish(directory, version, exe_path, make_patches=True):
+    """EXE'yi dizine kopyala; version.txt ve manifest.json yaz.
+
+    Dizinde önceki bir sürüm yayınlanmışsa ondan yeni EXE'ye yama üretilir;
+    önceki manifest'in yamaları korunur.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.basename(exe_path)
+    target = os.path.join(directory, name)
+    manifest_path = os.path.join(directory, "manifest.json")
+    patches = []
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            prev = json.load(f)
+    except (OSError, ValueError):
+        prev = None
+    if prev is not None:
+        patches = list(prev.get("patches", []))
+        prev_exe = os.path.join(directory, prev["url"])
+        if make_patches and prev["version"] != str(version) and os.path.isfile(prev_exe):
+            patch_name = f"hesap_defteri_{prev['version']}_{version}.hdlt"
+            patch_path = os.path.join(directory, patch_name)
+            make_patch(prev_exe, exe_path, patch_path)
+            patches.append({"from": prev["version"], "to": str(version), "url": patch_name,
+                            "size": os.path.getsize(patch_path), "sha256": sha256_file(patch_path)})
+    if os.path.abspath(exe_path) != os.path.abspath(target):
+        shutil.copyfile(exe_path, target)
+    manifest = build_manifest(target, version, name)
+    if patches:
+        manifest["patches"] = patches
+    with open(os.path.join(directory, "version.txt"), "w", encoding="utf-8") as f:
+        f.write(f"{version}\n")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Yerel güncelleme sunucusu")
+    ap.add_argument("directory")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--rate", type=float, default=None, help="bant genişliği sınırı (bayt/s)")
+    ap.add_argument("--drop-after", type=int, default=None,
+                    help="ilk indirmede bu kadar bayttan sonra bağlantıyı kes (devam testi)")
+    ap.add_argument("--publish", nargs=2, metavar=("SURUM", "EXE"),
+                    help="EXE'yi kopyala, version.txt ve manifest.json üret")
+    args = ap.parse_args(argv)
+    if args.publish:
+        publish(args.directory, *args.publish)
+    server, url = serve(args.directory, args.port, rate=args.rate, drop_after=args.drop_after)
+    print(f"Sunuluyor: {url}  (Ctrl+C ile dur)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
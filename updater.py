@@ -0,0 +1,379 @@
+# updater.py
+# Arka plan güncelleyici çekirdeği (Tk'dan bağımsız; GUI worker thread'inden çağrılır).
+# - version.txt ve manifest.json koşullu GET ile okunur (ETag / If-None-Match);
+#   sunucu 304 dönerse önbellekteki içerik kullanılır, dosya tekrar indirilmez.
+# - EXE bir .part dosyasına uyarlanır boyutlu bloklarla indirilir. Bağlantı koparsa
+#   HTTP Range (+ If-Range) ile kalınan bayttan devam edilir; iptal edilen indirme
+#   bir sonraki denemede de devam eder.
+# - Dosya manifest'teki SHA-256 ve boyutla doğrulanmadan yerine taşınmaz.
+# - Manifest yama listesi içeriyorsa kurulu sürümden en sona en küçük toplam boyutlu
+#   yama zinciri indirilip (delta.py) yerelde uygulanır; zincir yoksa, tam EXE'den
+#   büyükse veya uygulama/doğrulama başarısızsa tam indirmeye düşülür.
+# progress(done, total) worker thread'inden çağrılır; cancel_event her blokta kontrol edilir.
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+import delta
+
+try:
+    import requests
+    from urllib3.exceptions import HTTPError as _Urllib3Error
+    _HAS_REQUESTS = True
+    _NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout,
+                       requests.exceptions.ChunkedEncodingError, _Urllib3Error, OSError)
+except Exception:
+    _HAS_REQUESTS = False
+    _NETWORK_ERRORS = (OSError,)
+
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+TARGET_CHUNK_S = 0.15  # blok başına hedef süre: ilerleme / iptal tepkisi bu aralıkta kalır
+RETRIES = 3
+
+
+class UpdateError(Exception):
+    """Güncelleme indirilemedi veya doğrulanamadı."""
+
+
+class UpdateCancelled(UpdateError):
+    """Kullanıcı indirmeyi iptal etti (.part dosyası devam için saklanır)."""
+
+
+def available():
+    return _HAS_REQUESTS
+
+
+def default_cache_dir():
+    return os.path.join(tempfile.gettempdir(), "hesap_defteri_update")
+
+
+def sha256_file(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(block), b""):
+            h.update(data)
+    return h.hexdigest()
+
+
+def build_manifest(exe_path, version, url=None):
+    """Yayınlanacak manifest.json içeriği (sürüm yayınlarken kullanılır)."""
+    return {"version": str(version), "url": url or os.path.basename(exe_path),
+            "size": os.path.getsize(exe_path), "sha256": sha256_file(exe_path)}
+
+
+@dataclass(frozen=True)
+class Patch:
+    from_version: str
+    to_version: str
+    url: str       # mutlak yama adresi
+    sha256: str    # yama dosyasının SHA-256'sı
+    size: int = None
+
+    @classmethod
+    def from_dict(cls, d, base_url):
+        size = d.get("size")
+        return cls(str(d["from"]).strip(), str(d["to"]).strip(), urljoin(base_url, d["url"]),
+                   str(d["sha256"]).lower(), int(size) if size is not None else None)
+
+
+@dataclass(frozen=True)
+class Manifest:
+    version: str
+    url: str       # mutlak EXE adresi (manifest'te göreli olabilir)
+    sha256: str
+    size: int = None
+    patches: tuple = ()
+
+    @classmethod
+    def from_dict(cls, d, base_url, default_url=None):
+        try:
+            url = urljoin(base_url, d["url"]) if d.get("url") else default_url
+            if not url:
+                raise KeyError("url")
+            size = d.get("size")
+            patches = tuple(Patch.from_dict(p, base_url) for p in d.get("patches", ()))
+            return cls(str(d["version"]).strip(), url, str(d["sha256"]).lower(),
+                       int(size) if size is not None else None, patches)
+        except (KeyError, TypeError, ValueError) as e:
+            raise UpdateError(f"Manifest geçersiz: {e}") from e
+
+
+def patch_chain(manifest, from_version):
+    """from_version -> manifest.version en küçük toplam boyutlu yama listesi; yoksa None."""
+    if from_version == manifest.version:
+        return []
+    # küçük graf: basit Dijkstra (boyutu bilinmeyen yama 1 bayt sayılır)
+    best = {from_version: (0, [])}
+    todo = [from_version]
+    while todo:
+        v = min(todo, key=lambda x: best[x][0])
+        todo.remove(v)
+        cost, path = best[v]
+        for p in manifest.patches:
+            if p.from_version != v:
+                continue
+            c = cost + (p.size or 1)
+            if p.to_version not in best or c < best[p.to_version][0]:
+                best[p.to_version] = (c, path + [p])
+                todo.append(p.to_version)
+    return best[manifest.version][1] if manifest.version in best else None
+
+
+def _next_chunk(chunk, n, dt):
+    """Blok boyutunu süreye göre ikiye katla / yarıya indir."""
+    if n < chunk:
+        return chunk  # kısa okuma (dosya sonu / yavaş paket); karar verme
+    if dt < TARGET_CHUNK_S / 2:
+        return min(chunk * 2, MAX_CHUNK)
+    if dt > TARGET_CHUNK_S * 2:
+        return max(chunk // 2, MIN_CHUNK)
+    return chunk
+
+
+def _range_start(content_range):
+    """'bytes 100-199/200' -> 100; çözülemezse None."""
+    try:
+        unit, rng = content_range.split(" ", 1)
+        return int(rng.split("-", 1)[0]) if unit == "bytes" else None
+    except (AttributeError, ValueError):
+        return None
+
+
+def _remove(*paths):
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+class UpdateClient:
+    """Sürüm kontrolü + doğrulanmış, devam ettirilebilir EXE indirme.
+
+    ETag'ler ve koşullu GET gövdeleri cache_dir/state.json'da saklanır.
+    session verilmezse requests.Session açılır (keep-alive).
+    """
+
+    def __init__(self, version_url, manifest_url, exe_url=None, cache_dir=None,
+                 session=None, timeout=10, retries=RETRIES, backoff=0.5):
+        if session is None:
+            if not _HAS_REQUESTS:
+                raise UpdateError("requests modülü yüklü değil; güncelleme yapılamıyor.")
+            session = requests.Session()
+        self.version_url = version_url
+        self.manifest_url = manifest_url
+        self.exe_url = exe_url
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.session = session
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.not_modified = 0  # 304 ile atlanan istek sayısı
+        self.last_method = None
+        self.fallback_reason = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._state_path = os.path.join(self.cache_dir, "state.json")
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                self._state = json.load(f)
+        except (OSError, ValueError):
+            self._state = {}
+
+    # --- koşullu GET ---
+    def _save_state(self):
+        tmp = self._state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._state, f)
+        os.replace(tmp, self._state_path)
+
+    def get_text(self, url):
+        """url içeriği; ETag eşleşirse (304) önbellekteki gövde döner."""
+        with self._lock:
+            entry = self._state.get(url) or {}
+        headers = {"If-None-Match": entry["etag"]} if entry.get("etag") and "body" in entry else {}
+        r = self.session.get(url, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and "body" in entry:
+            self.not_modified += 1
+            return entry["body"]
+        r.raise_for_status()
+        body = r.text
+        with self._lock:
+            self._state[url] = {"etag": r.headers.get("ETag"), "body": body}
+            self._save_state()
+        return body
+
+    def latest_version(self):
+        return self.get_text(self.version_url).strip()
+
+    def check(self, local_version):
+        """Uzak sürüm yerelden farklıysa onu, değilse None döndür."""
+        remote = self.latest_version()
+        return remote if remote and remote != local_version else None
+
+    def manifest(self):
+        try:
+            data = json.loads(self.get_text(self.manifest_url))
+        except ValueError as e:
+            raise UpdateError(f"Manifest okunamadı: {e}") from e
+        return Manifest.from_dict(data, self.manifest_url, self.exe_url)
+
+    # --- indirme ---
+    def _final_path(self, version, dest_dir=None):
+        dest_dir = dest_dir or self.cache_dir
+        os.makedirs(dest_dir, exist_ok=True)
+        return os.path.join(dest_dir, f"hesap_defteri_v{version}.exe")
+
+    def update(self, manifest, local_version, base_path=None, dest_dir=None,
+               progress=None, cancel_event=None):
+        """Yeni sürümü yama zinciriyle (mümkünse) veya tam indirerek kur; yolunu döndür.
+
+        base_path: kurulu sürümün EXE'si (donmuş uygulamada sys.executable).
+        self.last_method "delta" / "full" olur; yamadan düşüldüyse nedeni
+        self.fallback_reason'dadır.
+        """
+        self.fallback_reason = None
+        chain = patch_chain(manifest, local_version) if base_path and os.path.isfile(base_path) else None
+        if not chain:
+            self.fallback_reason = "yama zinciri yok"
+        elif manifest.size is not None and sum(p.size or 0 for p in chain) >= manifest.size:
+            self.fallback_reason = "yamalar tam dosyadan büyük"
+        else:
+            self.last_method = "delta"
+            try:
+                return self._apply_chain(chain, manifest, base_path, dest_dir, progress, cancel_event)
+            except UpdateCancelled:
+                raise
+            except UpdateError as e:
+                self.fallback_reason = str(e)
+        self.last_method = "full"
+        return self.download(manifest, dest_dir, progress, cancel_event)
+
+    def _apply_chain(self, chain, manifest, base_path, dest_dir, progress, cancel_event):
+        final = self._final_path(manifest.version, dest_dir)
+        if os.path.exists(final) and sha256_file(final) == manifest.sha256:
+            return final
+        total = sum(p.size or 0 for p in chain) or None
+        offset = [0]
+
+        def step_progress(done, _total):
+            if progress:
+                progress(offset[0] + done, total)
+
+        base, tmp_files = base_path, []
+        try:
+            for k, p in enumerate(chain):
+                patch_path = os.path.join(self.cache_dir, f"patch_{p.from_version}_{p.to_version}.hdlt")
+                self._download_file(p.url, p.sha256, p.size, patch_path, step_progress, cancel_event)
+                offset[0] += p.size or os.path.getsize(patch_path)
+                with open(patch_path, "rb") as f:
+                    data = f.read()
+                info = delta.patch_info(data)
+                if k == 0 and sha256_file(base) != info["old_sha256"]:
+                    raise UpdateError("Kurulu dosya yamanın beklediği sürümle uyuşmuyor")
+                out = final if k == len(chain) - 1 else final + f".{p.to_version}.tmp"
+                if out == final and info["new_sha256"] != manifest.sha256:
+                    raise UpdateError("Yama zinciri manifest'teki sürümü üretmiyor")
+                delta.apply_patch(base, data, out)
+                os.remove(patch_path)
+                if base != base_path:
+                    os.remove(base)
+                base = out
+                if out != final:
+                    tmp_files.append(out)
+        except delta.DeltaError as e:
+            raise UpdateError(f"Yama uygulanamadı: {e}") from e
+        finally:
+            _remove(*(f for f in tmp_files if f != base))
+        return final
+
+    def download(self, manifest, dest_dir=None, progress=None, cancel_event=None):
+        """Tam EXE'yi indir, SHA-256 ile doğrula ve son yolunu döndür."""
+        final = self._final_path(manifest.version, dest_dir)
+        return self._download_file(manifest.url, manifest.sha256, manifest.size, final,
+                                   progress, cancel_event)
+
+    def _download_file(self, url, sha256, size, final, progress, cancel_event):
+        """url'yi final'e indir; SHA-256 tutmazsa sil ve UpdateError fırlat.
+
+        Ağ hatalarında retries kez, kalınan yerden (Range) tekrar denenir.
+        """
+        if os.path.exists(final) and sha256_file(final) == sha256:
+            if progress:
+                progress(os.path.getsize(final), os.path.getsize(final))
+            return final
+        part = os.path.join(os.path.dirname(final), f"hesap_defteri_{sha256[:16]}.part")
+        for attempt in range(self.retries + 1):
+            try:
+                self._fetch(url, size, part, progress, cancel_event)
+                break
+            except UpdateError:
+                raise
+            except _NETWORK_ERRORS as e:
+                if attempt == self.retries:
+                    raise UpdateError(f"Güncelleme indirilemedi: {e}") from e
+                if cancel_event is not None and cancel_event.wait(self.backoff * 2 ** attempt):
+                    raise UpdateCancelled("İndirme iptal edildi")
+                if cancel_event is None:
+                    time.sleep(self.backoff * 2 ** attempt)
+        if sha256_file(part) != sha256:
+            _remove(part, part + ".etag")
+            raise UpdateError("İndirilen dosyanın SHA-256 değeri manifest ile uyuşmuyor; dosya silindi.")
+        os.replace(part, final)
+        _remove(part + ".etag")
+        return final
+
+    def _fetch(self, url, size, part, progress, cancel_event):
+        have = os.path.getsize(part) if os.path.exists(part) else 0
+        if size is not None and have > size:
+            _remove(part, part + ".etag")
+            have = 0
+        if size is not None and have == size:
+            return  # önceki denemede tamamlanmış; doğrulama çağırana kalır
+        headers = {}
+        if have:
+            headers["Range"] = f"bytes={have}-"
+            try:
+                with open(part + ".etag", encoding="utf-8") as f:
+                    headers["If-Range"] = f.read().strip()
+            except OSError:
+                pass
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            if r.status_code == 416:
+                return  # sunucu aralığı reddetti: .part tam olabilir, hash karar verir
+            r.raise_for_status()
+            if r.status_code == 206 and _range_start(r.headers.get("Content-Range")) == have:
+                mode = "ab"
+            else:
+                mode, have = "wb", 0  # Range yok sayıldı veya dosya değişti (If-Range)
+            etag = r.headers.get("ETag")
+            if etag and mode == "wb":
+                with open(part + ".etag", "w", encoding="utf-8") as f:
+                    f.write(etag)
+            length = r.headers.get("Content-Length")
+            total = size or (have + int(length) if length else None)
+            if progress:
+                progress(have, total)
+            chunk = MIN_CHUNK
+            with open(part, mode) as f:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise UpdateCancelled("İndirme iptal edildi")
+                    t0 = time.perf_counter()
+                    data = r.raw.read(chunk, decode_content=True)
+                    if not data:
+                        break
+                    f.write(data)
+                    have += len(data)
+                    if progress:
+                        progress(have, total)
+                    chunk = _next_chunk(chunk, len(data), time.perf_counter() - t0)
+        if size is not None and have < size:
+            raise ConnectionError(f"Bağlantı erken kapandı ({have}/{size} bayt)")
@@ -0,0 +1,131 @@
+# waveview.py
+# Uzun dalga formları için çok çözünürlüklü min/maks piramidi (NumPy, GUI'siz).
+# Seviye k'de her blok 4^k ham örneğin min ve maks'ını tutar (kanal başına ek bellek
+# ~2/3 N). envelope(t0, t1, n) görünür aralık için piksel başına en fazla bir (min, maks)
+# çifti döndürür: aralıktaki örnek sayısına göre n'den az olmayan en kaba seviye seçilir
+# ve bloklar reduceat ile n kutuya indirilir. Maliyet iz uzunluğundan bağımsızdır
+# (~n·4 öğe); aralıkta 2n'den az örnek kalınca ham veri döner.
+# polyline() çifti dikey çizgilerle birleşik tek çizgiye çevirir: her pikselde min-maks
+# arası dolu çizilir, ince tepe / vadiler (anahtarlama dalgalanması) kaybolmaz.
+#
+# Zaman ekseni artan olmalıdır; kutular örnek sayısına göre eşit bölünür (eşit aralıklı
+# olmayan yakalamalarda x konumları yine gerçek zamanlardır).
+
+from dataclasses import dataclass
+
+import numpy as np
+
+FACTOR = 4          # seviye başına blok büyüme oranı
+MIN_BLOCKS = 512    # en kaba seviyenin blok sayısı bundan az olmaz
+
+
+@dataclass
+class Envelope:
+    """Görünür aralığın özeti; lo / hi shape (kanal, kutu). raw ise lo == hi (ham örnek)."""
+    x: np.ndarray
+    lo: np.ndarray
+    hi: np.ndarray
+    level: int      # 0 = ham veri
+    raw: bool
+
+    def polyline(self, channel):
+        """(x, y): min/maks çiftlerini tek Line2D için birleştir."""
+        if self.raw:
+            return self.x, self.lo[channel]
+        return np.repeat(self.x, 2), np.column_stack((self.lo[channel], self.hi[channel])).ravel()
+
+
+def _pad(a, block):
+    """Son eksende blok katına kenar değerle tamamla."""
+    extra = (-a.shape[-1]) % block
+    if extra:
+        a = np.concatenate([a, np.repeat(a[..., -1:], extra, axis=-1)], axis=-1)
+    return a
+
+
+class MinMaxPyramid:
+    """Ortak zaman ekseni paylaşan kanallar için min/maks piramidi."""
+
+    def __init__(self, t, *ys, factor=FACTOR, min_blocks=MIN_BLOCKS):
+        self.t = np.ascontiguousarray(t, dtype=float)
+        self.y = np.vstack([np.asarray(y, dtype=float) for y in ys])
+        if self.y.shape[1] != len(self.t):
+            raise ValueError("Zaman ve kanal uzunlukları eşit olmalı.")
+        if len(self.t) > 1 and np.any(np.diff(self.t) < 0):
+            raise ValueError("Zaman ekseni artan olmalı.")
+        self.factor = factor
+        self.levels = [(self.y, self.y)]   # seviye 0: ham
+        lo = hi = self.y
+        while lo.shape[1] > min_blocks * factor:
+            lo = _pad(lo, factor).reshape(len(lo), -1, factor).min(axis=2)
+            hi = _pad(hi, factor).reshape(len(hi), -1, factor).max(axis=2)
+            self.levels.append((lo, hi))
+
+    def __len__(self):
+        return len(self.t)
+
+    @property
+    def channels(self):
+        return len(self.y)
+
+    @property
+    def nbytes(self):
+        return self.t.nbytes + sum(lo.nbytes + hi.nbytes for lo, hi in self.levels[1:]) + self.y.nbytes
+
+    @property
+    def span(self):
+        return float(self.t[0]), float(self.t[-1])
+
+    def limits(self, channel):
+        """Kanalın tüm iz boyunca (min, maks) değeri (en kaba seviyeden)."""
+        lo, hi = self.levels[-1]
+        return float(np.nanmin(lo[channel])), float(np.nanmax(hi[channel]))
+
+    def envelope(self, t0, t1, n):
+        """[t0, t1] aralığı için en fazla n kutuluk Envelope (kenarlarda bir örnek taşma)."""
+        n = max(1, int(n))
+        N = len(self.t)
+        i0 = max(0, int(np.searchsorted(self.t, t0, "left")) - 1)
+        i1 = min(N, int(np.searchsorted(self.t, t1, "right")) + 1)
+        count = i1 - i0
+        if count <= 2 * n:
+            y = self.y[:, i0:i1]
+            return Envelope(self.t[i0:i1], y, y, 0, True)
+        k = min(len(self.levels) - 1, int(np.log(count / n) / np.log(self.factor)))
+        lo, hi = self.levels[k]
+        block = self.factor ** k
+        b0, b1 = i0 // block, min(lo.shape[1], -(-i1 // block))
+        edges = np.unique(np.linspace(b0, b1, min(n, b1 - b0) + 1).astype(np.int64))[:-1]
+        x = self.t[np.minimum(edges * block, N - 1)]
+        rel = edges - b0
+        return Envelope(x, np.minimum.reduceat(lo[:, b0:b1], rel, axis=1),
+                        np.maximum.reduceat(hi[:, b0:b1], rel, axis=1), k, False)
+
+
+def load_capture(path):
+    """Osiloskop / simülasyon yakalaması: (t, [kanallar], [adlar]).
+
+    .npz: "t" ve diğer diziler kanal; .npy: sütunlar (ilk sütun t); .csv / .txt: ilk
+    sütun zaman, diğerleri kanal, isteğe bağlı başlık satırı (virgül / noktalı virgül /
+    sekme ayraç)."""
+    ext = path.rsplit(".", 1)[-1].lower()
+    if ext == "npz":
+        with np.load(path) as z:
+            names = [k for k in z.files if k != "t"]
+            return np.asarray(z["t"], dtype=float), [np.asarray(z[k], dtype=float) for k in names], names
+    if ext == "npy":
+        a = np.load(path)
+        return a[:, 0].astype(float), [a[:, j].astype(float) for j in range(1, a.shape[1])], \
+            [f"k{j}" for j in range(1, a.shape[1])]
+    with open(path, encoding="utf-8", errors="replace") as f:
+        head = f.readline()
+    delim = max((",", ";", "\t"), key=head.count)
+    delim = delim if head.count(delim) else None
+    cells = [c.strip() for c in (head.split(delim) if delim else head.split())]
+    try:
+        [float(c) for c in cells]
+        skip, names = 0, [f"k{j}" for j in range(1, len(cells))]
+    except ValueError:
+        skip, names = 1, cells[1:]
+    a = np.loadtxt(path, delimiter=delim, skiprows=skip, ndmin=2)
+    return a[:, 0], [a[:, j] for j in range(1, a.shape[1])], names